@@ -1,21 +1,58 @@
+import numpy as np
 import pandas as pd
 
+# name -> vectorized expression computing that column from a whole logs/averages frame.
+# add_all_adv fills every registered stat, so new derived stats only need a function here.
+DERIVED_STATS = {}
+
+
+def derived_stat(name):
+    def register(fn):
+        DERIVED_STATS[name] = fn
+        return fn
+    return register
+
+
+def round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    # np.round scales by 10**ndigits before rounding, which can land a value on the
+    # other side of a .5 tie than Python's round(); redo those few values exactly
+    out = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    out[near_tie] = [round(v, ndigits) for v in values[near_tie].tolist()]
+    return out
+
+
+def _values(df: pd.DataFrame, col: str) -> np.ndarray:
+    return df[col].to_numpy(dtype=float)
+
+
+@derived_stat("TS_PCT")
+def ts_pct(df: pd.DataFrame) -> np.ndarray:
+    shots = _values(df, "FGA") + 0.44 * _values(df, "FTA")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ts = round_like_python(_values(df, "PTS") / (2 * shots), 2)
+    return np.where(shots > 0, ts, 0)
+
+
+@derived_stat("AST/TOV")
+def ast_to_tov(df: pd.DataFrame) -> np.ndarray:
+    tov = _values(df, "TOV")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = _values(df, "AST") / tov
+    return np.where(tov > 0, ratio, 0)
+
 
 def add_all_adv(df):
-    df = add_ts(df)
-    df = add_ast_to_tov(df)
+    for name, fn in DERIVED_STATS.items():
+        df[name] = fn(df)
     return df
 
 def add_ts(df):
-    df["TS_PCT"] = df.apply(
-        lambda row: round(row["PTS"] / (2 * (row["FGA"] + 0.44 * row["FTA"])), 2)
-                         if (row["FGA"] + 0.44 * row["FTA"]) > 0 else 0, axis=1)
+    df["TS_PCT"] = ts_pct(df)
     return df
 
 
 def add_ast_to_tov(df):
-    df["AST/TOV"] = df.apply(lambda row: row["AST"] / row["TOV"]
-                             if row ["TOV"] > 0 else 0,
-                             axis=1
-                             )
-    return df
\ No newline at end of file
+    df["AST/TOV"] = ast_to_tov(df)
+    return df
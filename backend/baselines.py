@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from backend.config import STATS_TO_AVERAGE, BASELINES, BASELINE_WINDOW, BASELINE_EWM_SPAN
+
+# What each game is compared against:
+#   season  full-season means from the averages CSVs (includes the game itself)
+#   prior   mean of the entity's earlier games in the same season; within one season this
+#           equals running_averages.RunningAverages.averages_before() (see its docstring)
+#   last_n  mean of the entity's previous BASELINE_WINDOW games
+#   ewm     exponentially weighted mean of previous games (span BASELINE_EWM_SPAN)
+#   zscore  full-history mean, scored in standard deviations (backend/moments.py)
+# (BASELINES lives in config.py so server.py can validate ?baseline= without pandas)
+
+
+def _group_order(logs: pd.DataFrame, group_cols: list):
+    # row positions sorted by group then date, plus each sorted row's group start position
+    frame = pd.DataFrame({col: logs[col].to_numpy() for col in group_cols})
+    frame["_date"] = pd.to_datetime(logs["GAME_DATE"]).to_numpy()
+    frame["_game"] = logs["GAME_ID"].astype(str).to_numpy()
+    order = frame.sort_values(group_cols + ["_date", "_game"], kind="stable").index.to_numpy()
+
+    new_group = np.zeros(len(order), dtype=bool)
+    new_group[:1] = True
+    for col in group_cols:
+        keys = frame[col].to_numpy()[order]
+        new_group[1:] |= keys[1:] != keys[:-1]
+    starts = np.flatnonzero(new_group)
+    first = starts[np.cumsum(new_group) - 1]
+    return order, first
+
+
+def prior_game_baselines(logs: pd.DataFrame, key: str, kind: str, stats=STATS_TO_AVERAGE,
+                         window=BASELINE_WINDOW, span=BASELINE_EWM_SPAN) -> pd.DataFrame:
+    """Per-row averages of `stats` over the entity's games before that row, in one pass.
+
+    `key` is PLAYER_ID or TEAM_NAME. Rows are sorted by (key, GAME_DATE)
+    once; prior/last_n are differences of one cumulative-sum table and ewm
+    is pandas' grouped ewm over the shifted values. NaN where the entity
+    has no earlier game. Returned in the row order of `logs`, rounded to 2
+    like the season averages.
+    """
+    stats = [stat for stat in stats if stat in logs.columns]
+    group_cols = [key] + (["SEASON_YEAR"] if kind == "prior" and "SEASON_YEAR" in logs.columns else [])
+    order, first = _group_order(logs, group_cols)
+    values = logs[stats].to_numpy(dtype=float)[order]
+
+    if kind == "ewm":
+        group = pd.Series(first)
+        shifted = pd.DataFrame(values).groupby(group).shift(1)
+        means = shifted.groupby(group).ewm(span=span, ignore_na=True).mean()
+        means = means.reset_index(level=0, drop=True).sort_index().to_numpy()
+    elif kind in ("prior", "last_n"):
+        present = ~np.isnan(values)
+        # row i of these holds the sums/counts of sorted rows [0, i)
+        sums = np.vstack([np.zeros(len(stats)), np.cumsum(np.where(present, values, 0), axis=0)])
+        counts = np.vstack([np.zeros(len(stats)), np.cumsum(present, axis=0)])
+
+        rows = np.arange(len(order))
+        start = first if kind == "prior" else np.maximum(first, rows - window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = counts[rows] - counts[start]
+            means = np.where(n > 0, (sums[rows] - sums[start]) / n, np.nan)
+    else:
+        raise ValueError(f"Unknown baseline {kind!r}, expected one of {BASELINES}")
+
+    out = np.empty_like(means)
+    out[order] = means
+    return pd.DataFrame(out, columns=stats, index=logs.index).round(2)
@@ -0,0 +1,168 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Benchmarks the hot paths on synthetic leagues of several sizes:
+#   python -m backend.benchmarks.run --seasons 1 5 20 --out bench.json
+# The report also carries the cold-start numbers of backend/benchmarks/startup.py.
+# Each size gets its own temporary working directory (DATA_DIR and OUT_DIR are
+# relative paths), so the repo's data/ and backend/output/ are never touched.
+# The JSON report is meant to be diffed between releases.
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def measure(fn, repeat: int) -> dict:
+    # wall-clock seconds of `repeat` calls, stdout swallowed
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+    }
+
+
+def per_call(result: dict, calls: int) -> dict:
+    # a measure() of `calls` calls at once, scaled to one call
+    return {key: value if key == "repeat" else value / calls for key, value in result.items()}
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def bench_scale(seasons: int, repeat: int, games: int) -> dict:
+    # imported here so they resolve DATA_DIR/OUT_DIR against the synthetic working directory
+    import backend.dataset as dataset_module
+    from backend.utils import load_csv
+    from backend.advanced_stats import add_all_adv
+    from backend.scoring import compute_scores, compute_score_matrix, compute_team_diff_scores, rank_scores
+    from backend.compute_outliers import build_outliers, compute_outliers
+    from backend.compute_averages import compute_league_differentials
+    from backend.config import N_BARS
+    from backend.benchmarks.synthetic import write_data_dir
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        write_data_dir(workdir, seasons)
+        Path(workdir, "backend", "output").mkdir(parents=True)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            team_logs = load_csv("team_game_logs.csv")
+            player_logs = load_csv("player_game_logs.csv")
+            results["load_csv"] = measure(lambda: (load_csv("team_game_logs.csv"),
+                                                   load_csv("player_game_logs.csv")), repeat)
+            results["add_all_adv"] = measure(lambda: add_all_adv(player_logs.copy()), repeat)
+            results["compute_league_differentials"] = measure(lambda: compute_league_differentials(team_logs), repeat)
+            results["dataset_build"] = measure(dataset_module.Dataset, repeat)
+
+            data = dataset_module.Dataset()
+            dataset_module._default.current = data  # routes below use the same snapshot
+            game_ids = list(data.team_game_index)[:games]
+            sample = game_ids[0]
+            players = data.players_in_game(sample)
+            player_avg_rows = data.player_avg.loc[players["PLAYER_ID"]]
+            team1, team2 = data.teams_in_game(sample).iloc[0], data.teams_in_game(sample).iloc[1]
+            warm = build_outliers(sample, data)  # warm up lazy indexes
+
+            def row_by_row():
+                for i in range(len(players)):
+                    compute_scores(players.iloc[i], player_avg_rows.iloc[i])
+
+            results["compute_scores_game"] = measure(row_by_row, repeat)
+            results["compute_score_matrix_season"] = measure(
+                lambda: compute_score_matrix(data.player_logs, data.player_avg.reindex(data.player_logs["PLAYER_ID"])),
+                repeat)
+            results["compute_team_diff_scores"] = measure(
+                lambda: compute_team_diff_scores(team1, team2, data.league_diffs), repeat)
+
+            scores = {f"{i}": {"score": float(s)} for i, s in enumerate(np.random.default_rng(0).normal(size=400))}
+            results["rank_scores"] = measure(lambda: rank_scores(scores, N_BARS), repeat)
+            results["build_outliers_per_game"] = per_call(
+                measure(lambda: [build_outliers(g, data) for g in game_ids], repeat), len(game_ids))
+            results["compute_outliers_per_game"] = per_call(
+                measure(lambda: [compute_outliers(g, data) for g in game_ids], repeat), len(game_ids))
+
+            from server import app
+            client = app.test_client()
+            team_abbr = warm["teams"][0]
+            routes = {
+                "route_games": "/api/games",
+                "route_team_games": f"/api/games/{team_abbr}",
+                "route_outliers_warm": f"/api/outliers/{sample}",
+                "route_leaderboard": "/api/leaderboard?type=player&n=10",
+                "route_player_history": f"/api/players/{int(players['PLAYER_ID'].iloc[0])}/outliers",
+                "route_similar": f"/api/similar/{sample}",
+            }
+            for name, url in routes.items():
+                client.get(url)  # first call fills caches; the steady state is what gets measured
+                results[name] = measure(lambda: client.get(url).data, repeat)
+        finally:
+            os.chdir(cwd)
+            dataset_module._default.current = None
+
+    return {
+        "seasons": seasons,
+        "team_rows": len(team_logs),
+        "player_rows": len(player_logs),
+        "games_sampled": len(game_ids),
+        "benchmarks": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the outlier pipeline on synthetic leagues.")
+    parser.add_argument("--seasons", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--games", type=int, default=20, help="games sampled for per-game benchmarks")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    from backend.benchmarks.startup import bench_startup
+    report = {"meta": _meta(), "startup": bench_startup(args.repeat), "results": []}
+    for seasons in args.seasons:
+        start = time.perf_counter()
+        report["results"].append(bench_scale(seasons, args.repeat, args.games))
+        print(f"✅ {seasons} season(s) benchmarked in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Cold-start cost of the serving and watcher processes, each sample in a fresh
+# interpreter:
+#   python -m backend.benchmarks.startup --repeat 5
+# import_* time the module import alone; first_request adds the first
+# /api/games call, which loads the data modules and builds the Dataset from a
+# one-season synthetic league.
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "nba_api"]
+
+PROBES = {
+    "import_server": "import server",
+    "import_watcher": "import backend.live.game_watcher",
+    "first_request": "import server; assert server.app.test_client().get('/api/games').status_code == 200",
+}
+
+_TIMER = """
+import json, sys, time
+start = time.perf_counter()
+{probe}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _run(probe: str, cwd) -> dict:
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT), "LOG_LEVEL": "WARNING"}
+    out = subprocess.run([sys.executable, "-c", _TIMER.format(probe=probe, heavy=HEAVY_MODULES)],
+                         cwd=cwd, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def bench_startup(repeat: int = 5) -> dict:
+    from backend.benchmarks.synthetic import write_data_dir
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        write_data_dir(workdir, seasons=1)
+        os.symlink(REPO_ROOT / "frontend", Path(workdir, "frontend"))
+        for name, probe in PROBES.items():
+            samples = [_run(probe, workdir) for _ in range(repeat)]
+            times = [s["seconds"] for s in samples]
+            results[name] = {
+                "repeat": repeat,
+                "min": min(times),
+                "median": statistics.median(times),
+                "heavy_modules_loaded": samples[-1]["loaded"],
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import and first-request times.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(bench_startup(args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from backend.compute_averages import compute_team_averages, compute_player_averages, compute_league_differentials
+
+# Synthetic multi-season game logs shaped like fetch_game_data.py's CSVs, for benchmarks:
+#   python -m backend.benchmarks.synthetic --seasons 5 --out /tmp/nba5
+# writes data/*.csv (logs + averages) under --out. Every team plays 82 games a season,
+# ten of its fifteen players appear in each game, and team lines are the sums of them.
+
+TEAMS = 30
+ROSTER = 15
+PLAYERS_PER_GAME = 10
+GAMES_PER_TEAM = 82
+LAST_SEASON = 2024  # the newest generated season is 2024-25
+
+# per-player mean of each counting stat is drawn uniformly from this range
+COUNT_RANGES = {
+    "FGA": (1, 16), "FTA": (0, 4.5), "OREB": (0, 2), "DREB": (0.5, 6), "AST": (0, 5.5),
+    "TOV": (0, 2.6), "STL": (0, 1.6), "BLK": (0, 1), "BLKA": (0, 1), "PF": (0.5, 3.5), "PFD": (0, 3.5),
+}
+# FG_PCT is the make rate on twos; FG3_RATE the share of attempts that are threes
+SHOOTING_RANGES = {"FG_PCT": (0.42, 0.62), "FG3_RATE": (0.1, 0.75), "FG3_PCT": (0.28, 0.42), "FT_PCT": (0.6, 0.92)}
+
+
+def _schedule(seasons: int, rng) -> pd.DataFrame:
+    # 82 rounds per season in which every team plays once (15 games per round)
+    games = []
+    for s in range(seasons):
+        start = LAST_SEASON - seasons + 1 + s
+        opening = np.datetime64(f"{start}-10-22")
+        number = 0
+        for round_no in range(GAMES_PER_TEAM):
+            order = rng.permutation(TEAMS)
+            date = opening + np.timedelta64(2 * round_no, "D")
+            for home, away in order.reshape(-1, 2):
+                number += 1
+                games.append((f"{start}-{(start + 1) % 100:02d}", f"002{start % 100:02d}{number:05d}", date, home, away))
+    return pd.DataFrame(games, columns=["SEASON_YEAR", "GAME_ID", "GAME_DATE", "HOME", "AWAY"])
+
+
+def _pct(made: np.ndarray, attempted: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(attempted > 0, np.round(made / attempted, 3), np.nan)
+
+
+def synthetic_logs(seasons: int = 1, seed: int = 0):
+    """(team_game_logs, player_game_logs) for `seasons` full seasons of a 30-team league."""
+    rng = np.random.default_rng(seed)
+    games = _schedule(seasons, rng)
+    n_games = len(games)
+
+    abbrs = [f"T{i:02d}" for i in range(TEAMS)]
+    names = [f"Synthetic {abbr}" for abbr in abbrs]
+    team_ids = 1610612700 + np.arange(TEAMS)
+    n_players = TEAMS * ROSTER
+    player_ids = 1630000 + np.arange(n_players)
+
+    # team-game rows: home side first, then away, game by game
+    team = np.column_stack([games["HOME"], games["AWAY"]]).ravel()
+    opponent = np.column_stack([games["AWAY"], games["HOME"]]).ravel()
+    game_row = np.repeat(np.arange(n_games), 2)
+    is_home = np.tile([True, False], n_games)
+
+    # player-game rows: ten random roster slots per team-game
+    slots = rng.permuted(np.tile(np.arange(ROSTER), (len(team), 1)), axis=1)[:, :PLAYERS_PER_GAME]
+    player = (team[:, None] * ROSTER + slots).ravel()
+    team_row = np.repeat(np.arange(len(team)), PLAYERS_PER_GAME)
+
+    means = {stat: rng.uniform(lo, hi, n_players) for stat, (lo, hi) in COUNT_RANGES.items()}
+    rates = {stat: rng.uniform(lo, hi, n_players) for stat, (lo, hi) in SHOOTING_RANGES.items()}
+    n = len(player)
+
+    box = {stat: rng.poisson(means[stat][player]) for stat in COUNT_RANGES}
+    box["FG3A"] = rng.binomial(box["FGA"], rates["FG3_RATE"][player])
+    box["FG3M"] = rng.binomial(box["FG3A"], rates["FG3_PCT"][player])
+    box["FGM"] = box["FG3M"] + rng.binomial(box["FGA"] - box["FG3A"], rates["FG_PCT"][player])
+    box["FTM"] = rng.binomial(box["FTA"], rates["FT_PCT"][player])
+    box["PTS"] = 2 * box["FGM"] + box["FG3M"] + box["FTM"]
+    box["REB"] = box["OREB"] + box["DREB"]
+
+    team_box = {stat: np.bincount(team_row, weights=values, minlength=len(team)).astype(int)
+                for stat, values in box.items()}
+    team_box["TOV"] += rng.poisson(1, len(team))  # team turnovers
+    margin = team_box["PTS"] - team_box["PTS"].reshape(-1, 2)[:, ::-1].ravel()
+    winning_free_throw = np.repeat(margin[::2] == 0, 2) & is_home  # no ties in the NBA
+    for stat in ("FTA", "FTM", "PTS"):
+        team_box[stat] += winning_free_throw
+    margin = team_box["PTS"] - team_box["PTS"].reshape(-1, 2)[:, ::-1].ravel()
+
+    abbr = np.array(abbrs)
+    matchup = np.where(is_home, np.char.add(np.char.add(abbr[team], " vs. "), abbr[opponent]),
+                       np.char.add(np.char.add(abbr[team], " @ "), abbr[opponent]))
+    dates = pd.to_datetime(games["GAME_DATE"]).dt.strftime("%Y-%m-%dT00:00:00").to_numpy()
+
+    def shooting(values):
+        return {
+            "FG_PCT": _pct(values["FGM"], values["FGA"]),
+            "FG3_PCT": _pct(values["FG3M"], values["FG3A"]),
+            "FT_PCT": _pct(values["FTM"], values["FTA"]),
+        }
+
+    team_logs = pd.DataFrame({
+        "SEASON_YEAR": games["SEASON_YEAR"].to_numpy()[game_row],
+        "TEAM_ID": team_ids[team],
+        "TEAM_ABBREVIATION": abbr[team],
+        "TEAM_NAME": np.array(names)[team],
+        "GAME_ID": games["GAME_ID"].to_numpy()[game_row],
+        "GAME_DATE": dates[game_row],
+        "MATCHUP": matchup,
+        "WL": np.where(margin > 0, "W", "L"),
+        "MIN": 240.0,
+        **team_box,
+        **shooting(team_box),
+        "PLUS_MINUS": margin.astype(float),
+    })
+
+    player_logs = pd.DataFrame({
+        "SEASON_YEAR": team_logs["SEASON_YEAR"].to_numpy()[team_row],
+        "PLAYER_ID": player_ids[player],
+        "PLAYER_NAME": np.char.add("Player ", player_ids[player].astype(str)),
+        "TEAM_ID": team_ids[team][team_row],
+        "TEAM_ABBREVIATION": abbr[team][team_row],
+        "TEAM_NAME": np.array(names)[team][team_row],
+        "GAME_ID": team_logs["GAME_ID"].to_numpy()[team_row],
+        "GAME_DATE": team_logs["GAME_DATE"].to_numpy()[team_row],
+        "MATCHUP": matchup[team_row],
+        "WL": team_logs["WL"].to_numpy()[team_row],
+        "MIN": np.round(rng.uniform(8, 40, n), 2),
+        **box,
+        **shooting(box),
+        "PLUS_MINUS": rng.integers(-20, 21, n).astype(float),
+    })
+
+    # newest games first, like the API returns them
+    team_logs = team_logs.iloc[::-1].reset_index(drop=True)
+    player_logs = player_logs.iloc[::-1].reset_index(drop=True)
+    return team_logs, player_logs
+
+
+def write_data_dir(out_dir, seasons: int = 1, seed: int = 0) -> Path:
+    """Writes <out_dir>/data/*.csv (logs, averages, differentials) and returns that directory."""
+    data_dir = Path(out_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    team_logs, player_logs = synthetic_logs(seasons, seed)
+
+    team_logs.to_csv(data_dir / "team_game_logs.csv", index=False)
+    player_logs.to_csv(data_dir / "player_game_logs.csv", index=False)
+    compute_team_averages(team_logs).to_csv(data_dir / "team_averages.csv", index=True)
+    compute_player_averages(player_logs).to_csv(data_dir / "player_averages.csv", index=True)
+    compute_league_differentials(team_logs).to_csv(data_dir / "league_differentials.csv", index=False)
+    return data_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic multi-season game logs.")
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="directory to create data/ in")
+    args = parser.parse_args()
+    data_dir = write_data_dir(args.out, args.seasons, args.seed)
+    print(f"✅ Wrote {args.seasons} synthetic season(s) to {data_dir}")
+
+
+if __name__ == "__main__":
+    main()
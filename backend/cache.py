@@ -0,0 +1,85 @@
+import json
+from backend.config import OUT_DIR, RESULT_CACHE_SIZE
+from backend.dataset import Dataset, dataset_for_game, season_from_game_id
+from backend.compute_outliers import build_outliers, compute_outliers
+from backend.outlier_store import get_stored_result
+from backend.locked_cache import LockedLRU
+from backend.metrics import CACHE_LOOKUPS
+
+# (game_id, fingerprint, baseline) -> result JSON text
+_hot = LockedLRU(maxsize=RESULT_CACHE_SIZE)
+
+
+def read_saved_result(game_id: str, fingerprint: str):
+    # backend/output/<game_id>.json written by compute_outliers, if built from the same inputs
+    try:
+        with open(OUT_DIR / f"{game_id}.json") as f:
+            saved = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if saved.pop("fingerprint", None) != fingerprint:
+        return None
+    return saved
+
+
+def get_outliers_json(game_id: str, data: Dataset = None, baseline: str = "season") -> str:
+    """compute_outliers result as JSON text, served from the cheapest valid tier.
+
+    Memory LRU -> precomputed parquet store -> saved JSON file -> recompute.
+    Every tier is keyed on the Dataset fingerprint, so new data files or a
+    change to STAT_RULES / N_BARS makes older entries miss. Results for the
+    rolling baselines are only kept in the LRU.
+    """
+    data = data or dataset_for_game(game_id)
+    game_id = str(game_id)
+    key = (game_id, data.fingerprint, baseline)
+
+    text = _hot.get(key)
+    if text is not None:
+        CACHE_LOOKUPS.inc(tier="memory")
+        return text
+
+    if baseline != "season":
+        tier = "compute"
+        text = json.dumps(build_outliers(game_id, data, baseline))
+    else:
+        tier = "store"
+        text = get_stored_result(game_id, data.fingerprint)
+        if text is None:
+            tier = "file"
+            result = read_saved_result(game_id, data.fingerprint)
+            if result is None:
+                tier = "compute"
+                result = compute_outliers(game_id, data)
+            text = json.dumps(result)
+    CACHE_LOOKUPS.inc(tier=tier)
+
+    _hot[key] = text
+    return text
+
+
+def iter_outliers_ndjson(game_ids):
+    """One JSON line per game, yielded as each finishes.
+
+    Each season in the batch is served from a single Dataset snapshot, so a
+    reload mid-stream can't mix results from two generations. Unknown games
+    and failures become {"game_id", "error"} lines instead of ending the stream.
+    """
+    snapshots = {}  # season -> Dataset
+    for game_id in game_ids:
+        game_id = str(game_id).zfill(10)
+        try:
+            try:
+                season = season_from_game_id(game_id)
+            except ValueError:
+                season = None  # malformed ID, looked up (and not found) in the newest season
+            if season not in snapshots:
+                snapshots[season] = dataset_for_game(game_id)
+            data = snapshots[season]
+            if game_id not in data.team_game_index:
+                line = json.dumps({"game_id": game_id, "error": "Unknown game"})
+            else:
+                line = get_outliers_json(game_id, data)
+        except Exception as e:
+            line = json.dumps({"game_id": game_id, "error": str(e)})
+        yield line + "\n"
@@ -1,67 +1,67 @@
 import pandas as pd
-from config import TEAM_DIFF_STATS_TO_TRACK
+from backend.config import DATA_DIR, TEAM_DIFF_STATS_TO_TRACK, STATS_TO_AVERAGE
 
 #establish columns to average
-stats_to_average = [
-    'MIN','FGM','FGA','FG_PCT','FG3M','FG3A','FG3_PCT',
-    'FTM','FTA','FT_PCT','OREB','DREB','REB','AST','TOV',
-    'STL','BLK','BLKA','PF','PFD','PTS'
-]
+stats_to_average = STATS_TO_AVERAGE
 
 #compute TEAM season averages
 
-team_df= pd.read_csv("data/team_game_logs.csv") #store team game log CSV in dataframe
-team_grouped = team_df.groupby('TEAM_NAME') #group data by team name
-team_averages = team_grouped[stats_to_average].mean() #average selected stats
-team_averages = team_averages.round(2)
-team_averages.to_csv('data/team_averages.csv', index=True)
+def compute_team_averages(team_df: pd.DataFrame) -> pd.DataFrame:
+    team_grouped = team_df.groupby('TEAM_NAME') #group data by team name
+    team_averages = team_grouped[stats_to_average].mean() #average selected stats
+    return team_averages.round(2)
 
 #compute PLAYER season averages
 
-player_df= pd.read_csv('data/player_game_logs.csv')
-player_grouped = player_df.groupby('PLAYER_ID')
-player_averages= player_grouped[stats_to_average].mean()
-player_averages = player_averages.round(2)
+def compute_player_averages(player_df: pd.DataFrame) -> pd.DataFrame:
+    player_grouped = player_df.groupby('PLAYER_ID')
+    player_averages= player_grouped[stats_to_average].mean()
+    player_averages = player_averages.round(2)
 
-player_names = player_df.groupby('PLAYER_ID')['PLAYER_NAME'].first()
-player_averages.insert(0, 'PLAYER_NAME', player_names)
-
-player_averages.to_csv('data/player_averages.csv', index=True)
+    player_names = player_grouped['PLAYER_NAME'].first()
+    player_averages.insert(0, 'PLAYER_NAME', player_names)
+    return player_averages
 
 
 #compute TEAM DIFF AVGs
 
+def paired_game_diffs(team_logs: pd.DataFrame, stats=TEAM_DIFF_STATS_TO_TRACK) -> pd.DataFrame:
+    # |team1 - team2| per stat for every game with exactly two team rows, indexed by GAME_ID
+    stats = [stat for stat in stats if stat in team_logs.columns]
+    game_ids = team_logs["GAME_ID"].astype(str).str.zfill(10)
+
+    complete = (game_ids.groupby(game_ids).transform("size") == 2).to_numpy()  # Skip incomplete games
+    logs = team_logs.loc[complete, stats].set_axis(game_ids[complete])
+    position = logs.groupby(level=0).cumcount().to_numpy()
+
+    team1 = logs[position == 0]
+    team2 = logs[position == 1].reindex(team1.index)
+    return (team1 - team2).abs()
+
+
 def compute_league_differentials(team_logs: pd.DataFrame) -> pd.DataFrame:
-    team_logs["GAME_ID"] = team_logs["GAME_ID"].astype(str).str.zfill(10)
-    game_groups = team_logs.groupby("GAME_ID")
-    
-    diffs = {stat: [] for stat in TEAM_DIFF_STATS_TO_TRACK}
-    
-    for _, group in game_groups:
-        if len(group) != 2:
-            continue  # Skip incomplete games
-
-        team1, team2 = group.iloc[0], group.iloc[1]
-        for stat in TEAM_DIFF_STATS_TO_TRACK:
-            val1, val2 = team1.get(stat), team2.get(stat)
-            if pd.isna(val1) or pd.isna(val2):
-                continue
-            diffs[stat].append(abs(val1 - val2))
-
-    avg_diffs = {
-        "STAT": [],
-        "AVG_DIFF": []
-    }
-
-    for stat, values in diffs.items():
-        if values:
-            avg_diffs["STAT"].append(stat)
-            avg_diffs["AVG_DIFF"].append(round(sum(values) / len(values), 4))
-
-    return pd.DataFrame(avg_diffs)
-
-# Generate and save league_differentials.csv
-league_diffs_df = compute_league_differentials(team_df)
-league_diffs_df.to_csv("data/league_differentials.csv", index=False)
-print("✅ Saved league_differentials.csv")
+    diffs = paired_game_diffs(team_logs)
+    counts = diffs.count()
+    avg_diffs = (diffs.sum() / counts)[counts > 0].round(4)
+
+    return pd.DataFrame({
+        "STAT": avg_diffs.index,
+        "AVG_DIFF": avg_diffs.to_numpy(),
+    })
+
+
+def main():
+    team_df= pd.read_csv(DATA_DIR / "team_game_logs.csv") #store team game log CSV in dataframe
+    compute_team_averages(team_df).to_csv(DATA_DIR / 'team_averages.csv', index=True)
+
+    player_df= pd.read_csv(DATA_DIR / 'player_game_logs.csv')
+    compute_player_averages(player_df).to_csv(DATA_DIR / 'player_averages.csv', index=True)
+
+    # Generate and save league_differentials.csv
+    league_diffs_df = compute_league_differentials(team_df)
+    league_diffs_df.to_csv(DATA_DIR / "league_differentials.csv", index=False)
+    print("✅ Saved league_differentials.csv")
+
 
+if __name__ == "__main__":
+    main()
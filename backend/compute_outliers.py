@@ -1,28 +1,84 @@
+import logging
 import sys
 import pandas as pd
-from backend.advanced_stats import add_all_adv
 from pathlib import Path
-from backend.config import OUT_DIR, N_BARS
-from backend.utils import load_csv, save_json
-from backend.scoring import compute_scores, rank_scores, compute_team_diff_scores
+from backend.config import OUT_DIR, N_BARS, STAT_RULES
+from backend.dataset import Dataset, dataset_for_game
+from backend.utils import save_json
+from backend.scoring import scored_entries, rank_scores, compute_team_diff_scores
+from backend.metrics import timed
+
+log = logging.getLogger(__name__)
+
+
+def _entry(stat, info):
+    return {
+        "type": info["type"],
+        "name": info["id"],
+        "stat": stat,
+        "score": round(info["score"], 3),
+        "actual": info["actual"],
+        "avg": round(info["avg"], 3),
+        **({"player_id": info["player_id"]} if "player_id" in info else {}),
+        **({"team_abbr": info["team_abbr"]} if "team_abbr" in info else {}),
+    }
+
 
+def team_score_items(teams: pd.DataFrame, avg_rows: pd.DataFrame, matrix: pd.DataFrame) -> dict:
+    # "<team name> - <stat>" -> score info for every team stat compute_scores would keep
+    team_scores = {}
+    team_names = teams["TEAM_NAME"].tolist()
+    team_abbrs = teams["TEAM_ABBREVIATION"].tolist()
+
+    for i, stat, score, actual, avg in scored_entries(teams, avg_rows, matrix):
+        tname = team_names[i]
+        key = f"{tname} - {stat}"
+        team_scores[key] = {
+            "type": "team",
+            "id": tname,
+            "score": score,
+            "actual": actual,
+            "avg": avg,
+            "team_abbr": team_abbrs[i]
+        }
+    return team_scores
 
-def compute_outliers(game_id: str):
-    team_logs   = load_csv("team_game_logs.csv")
-    player_logs = load_csv("player_game_logs.csv")
-    team_avg    = load_csv("team_averages.csv").set_index("TEAM_NAME")
-    player_avg  = load_csv("player_averages.csv").set_index("PLAYER_ID")
-    league_diffs = load_csv("league_differentials.csv").set_index("STAT")
 
+def player_score_items(players: pd.DataFrame, avg_rows: pd.DataFrame, matrix: pd.DataFrame) -> dict:
+    # "<player name> - <stat>" -> score info for every player stat compute_scores would keep
+    player_scores = {}
+    player_names = players["PLAYER_NAME"].tolist()
+    player_ids = players["PLAYER_ID"].tolist()
+    player_teams = players["TEAM_NAME"].tolist()
+
+    for i, stat, score, actual, avg in scored_entries(players, avg_rows, matrix):
+        name = player_names[i]
+        key = f"{name} - {stat}"
+        player_scores[key] = {
+            "type": "player",
+            "id": name,
+            "team": player_teams[i],
+            "score": score,
+            "actual": actual,
+            "avg": avg,
+            "player_id": player_ids[i],
+        }
+    return player_scores
 
 
-    #Advanced Stats
-    player_logs = add_all_adv(player_logs)
-    player_avg = add_all_adv(player_avg)
+def outlier_payload(pos, neg) -> dict:
+    # rank_scores output -> the {"positive", "negative"} lists the frontend draws
+    return {
+        "positive": [_entry(stat, info) for stat, info in pos],
+        "negative": [_entry(stat, info) for stat, info in neg],
+    }
 
 
-    team_logs["GAME_ID"] = team_logs["GAME_ID"].astype(str).str.zfill(10)
-    teams_in_game = team_logs[team_logs["GAME_ID"] == str(game_id)]
+def build_outliers(game_id: str, data: Dataset = None, baseline: str = "season", rules=None):
+    with timed("data_load"):
+        data = data or dataset_for_game(game_id)
+        league_diffs = data.league_diffs
+        teams_in_game = data.teams_in_game(game_id)
 
     game_out = {"game_id": game_id, "teams": teams_in_game["TEAM_ABBREVIATION"].tolist(), "outliers": []}
 
@@ -51,96 +107,49 @@ def compute_outliers(game_id: str):
 
 
     #TEAM STAT OUTLIERS
-    team_scores={}
-
-    for _, team_row in teams_in_game.iterrows():
-        tname = team_row["TEAM_NAME"]
-        team_avg_row = team_avg.loc[tname]
-        t_scores = compute_scores(team_row, team_avg_row)
-        team_abbr = team_row["TEAM_ABBREVIATION"]
-
-    
-
-        for stat,score in t_scores.items():
-            key = f"{tname} - {stat}"
-            team_scores[key] = {
-                "type": "team",
-                "id": tname,
-                "score": score,
-                "actual": team_row[stat],
-                "avg": team_avg_row[stat],
-                "team_abbr": team_abbr
-            }
-    
+    with timed("team_scoring"):
+        team_scores = team_score_items(
+            teams_in_game,
+            data.team_avgs_in_game(game_id, baseline),
+            data.team_scores_in_game(game_id, baseline, rules),
+        )
 
-    #PLAYER STAT OUTLIERS
-    player_logs["GAME_ID"] = player_logs["GAME_ID"].astype(str).str.zfill(10)
-    players_in_game = player_logs[player_logs["GAME_ID"] == str(game_id)]
-    player_scores = {}
 
-    for _, player_row in players_in_game.iterrows():
-        name = player_row["PLAYER_NAME"]
-        pid = player_row["PLAYER_ID"]
-        player_team = player_row["TEAM_NAME"]
-        player_avg_row = player_avg.loc[pid]
-        p_scores = compute_scores(player_row,player_avg_row)
-
-        for stat, score in p_scores.items():
-            key = f"{name} - {stat}"
-            player_scores[key] = {
-                "type": "player",
-                "id": name,
-                "team": player_team,
-                "score": score,
-                "actual": player_row[stat],
-                "avg": player_avg_row[stat],
-                "player_id": pid,
-            }
+    #PLAYER STAT OUTLIERS
+    with timed("player_scoring"):
+        players_in_game = data.players_in_game(game_id)
+        player_scores = player_score_items(
+            players_in_game,
+            data.player_avgs_in_game(game_id, baseline),
+            data.player_scores_in_game(game_id, baseline, rules),
+        )
 
 
     # TEAM DIFF SCORES
 
     diff_scores = {}
     if len(teams_in_game) == 2:
-        team1, team2 = teams_in_game.iloc[0], teams_in_game.iloc[1]
-        diff_scores = compute_team_diff_scores(team1, team2, league_diffs)
+        with timed("diff_scoring"):
+            team1, team2 = teams_in_game.iloc[0], teams_in_game.iloc[1]
+            diff_scores = compute_team_diff_scores(team1, team2, league_diffs, rules or STAT_RULES)
 
     # COMBINE & RANK
-    merged = {**team_scores, **player_scores, **diff_scores}
-    pos, neg = rank_scores(merged, N_BARS)
-
-    payload = {
-                "positive": [
-            {
-                "type": info["type"],
-                "name": info["id"],
-                "stat": stat,
-                "score": round(info["score"], 3),
-                "actual": info["actual"],
-                "avg": round(info["avg"], 3),
-                **({"player_id": info["player_id"]} if "player_id" in info else {}),
-                **({"team_abbr": info["team_abbr"]} if "team_abbr" in info else {}),
-            } for stat, info in pos
-        ],
-        "negative": [
-            {
-                "type": info["type"],
-                "name": info["id"],
-                "stat": stat,
-                "score": round(info["score"], 3),
-                "actual": info["actual"],
-                "avg": round(info["avg"], 3),
-                **({"player_id": info["player_id"]} if "player_id" in info else {}),
-                **({"team_abbr": info["team_abbr"]} if "team_abbr" in info else {}),
-            } for stat, info in neg
-        ]
-    }
+    with timed("ranking"):
+        merged = {**team_scores, **player_scores, **diff_scores}
+        pos, neg = rank_scores(merged, N_BARS)
+        payload = outlier_payload(pos, neg)
 
-    print(payload)
     game_out["outliers"].append(payload)
+    return game_out
+
 
+def compute_outliers(game_id: str, data: Dataset = None):
+    data = data or dataset_for_game(game_id)
+    game_out = build_outliers(game_id, data)
+    log.debug("computed outliers", extra={"game_id": game_id, "outliers": game_out["outliers"][0]})
 
-    save_json(game_out, OUT_DIR / f"{game_id}.json")
-    print("✅ saved", OUT_DIR / f"{game_id}.json")
+    with timed("json_save"):
+        save_json({**game_out, "fingerprint": data.fingerprint}, OUT_DIR / f"{game_id}.json")
+    log.info("saved outliers", extra={"game_id": game_id, "path": str(OUT_DIR / f"{game_id}.json")})
 
     return game_out
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 STATS_TO_TRACK = [
@@ -7,6 +8,22 @@ STATS_TO_TRACK = [
     'TS_PCT'
 ]
 
+# season averages written by compute_averages.py / running_averages.py
+STATS_TO_AVERAGE = [
+    'MIN','FGM','FGA','FG_PCT','FG3M','FG3A','FG3_PCT',
+    'FTM','FTA','FT_PCT','OREB','DREB','REB','AST','TOV',
+    'STL','BLK','BLKA','PF','PFD','PTS'
+]
+
+# rolling baselines of backend/baselines.py
+BASELINES = ["season", "prior", "last_n", "ewm", "zscore"]
+BASELINE_WINDOW = 10     # games in the last_n baseline
+BASELINE_EWM_SPAN = 10   # span of the ewm baseline
+ZSCORE_THRESHOLD = 2.0   # standard deviations from the mean before a stat counts (zscore baseline)
+
+# stats whose team-vs-team gap is averaged into league_differentials.csv
+TEAM_DIFF_STATS_TO_TRACK = ['AST','OREB','DREB','FG_PCT','FG3_PCT','FG3M']
+
 
 STAT_RULES = {
     "PTS": {
@@ -120,5 +137,18 @@ STAT_RULES = {
 
 N_BARS   = 5
 DATA_DIR = Path("data")
-OUT_DIR  = Path("backend/output")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+OUT_DIR  = Path("backend/output")  # created by the first write, not at import
+# memory-mapped dataset generations shared by all server workers (backend/shared_dataset.py)
+SHARED_DIR = DATA_DIR / "shared"
+# per-season copies of every table, data/seasons/<SEASON_YEAR>/ (backend/partition.py)
+SEASONS_DIR = DATA_DIR / "seasons"
+MAX_LOADED_SEASONS = 3  # season Datasets kept in memory at once
+USE_SHARED_DATASET = os.environ.get("USE_SHARED_DATASET") == "1"
+RESULT_CACHE_SIZE = 256  # hot games kept in memory by backend/cache.py
+MAX_BATCH_GAMES = 500  # games per /api/outliers/batch request
+MAX_LEADERBOARD_SIZE = 100  # entries per /api/leaderboard side
+MAX_SIMILAR_GAMES = 50  # matches per /api/similar request
+OUTLIER_STORE = OUT_DIR / "outliers.parquet"  # precomputed season outliers (backend/outlier_store.py)
+# lets a request with "X-Profile: 1" get a cProfile report instead of its response
+ENABLE_PROFILING = os.environ.get("ENABLE_PROFILING") == "1"
+PROFILE_TOP_N = 30  # functions listed in that report
@@ -0,0 +1,405 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from backend.config import (DATA_DIR, SHARED_DIR, SEASONS_DIR, MAX_LOADED_SEASONS, USE_SHARED_DATASET,
+                            STAT_RULES, STATS_TO_TRACK, N_BARS)
+from backend.utils import load_table
+from backend.ingest import table_columns
+from backend.advanced_stats import add_all_adv
+from backend.baselines import prior_game_baselines
+from backend.scoring import ScoreComponents, apply_rules, score_components, zscore_matrix
+from backend.moments import MomentTable, MOMENT_KEYS, load_moments
+from backend.listings import build_game_listing, build_team_listings
+from backend.metrics import timed
+
+log = logging.getLogger(__name__)
+
+DATA_TABLES = [
+    "team_game_logs",
+    "player_game_logs",
+    "team_averages",
+    "player_averages",
+    "league_differentials",
+]
+# each table may come from its CSV or the parquet copy written by backend/ingest.py
+DATA_FILES = [f"{table}{ext}" for table in DATA_TABLES for ext in (".csv", ".parquet")]
+
+RELOAD_CHECK_INTERVAL = 5  # seconds between mtime/size checks of DATA_DIR
+
+
+def data_signature(data_dir=DATA_DIR):
+    # (name, mtime, size) per input file -- changes whenever a file is rewritten
+    sig = []
+    for name in DATA_FILES:
+        path = data_dir / name
+        try:
+            st = path.stat()
+            sig.append((name, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append((name, None, None))
+    return tuple(sig)
+
+
+def generation_signature(shared_dir=SHARED_DIR):
+    # the CURRENT pointer of the shared dataset is rewritten on every generation swap
+    try:
+        with open(shared_dir / "CURRENT") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def season_from_game_id(game_id) -> str:
+    # "0022401044" -> "2024-25": digits 4-5 of a GAME_ID are the season's start year
+    year = int(str(game_id).zfill(10)[3:5])
+    year += 1900 if year >= 46 else 2000
+    return f"{year}-{(year + 1) % 100:02d}"
+
+
+def list_seasons(seasons_dir=SEASONS_DIR) -> list:
+    # partitions written by backend/partition.py, oldest first
+    if not seasons_dir.is_dir():
+        return []
+    return sorted(p.name for p in seasons_dir.iterdir()
+                  if (p / "team_game_logs.csv").exists() or (p / "team_game_logs.parquet").exists())
+
+
+def result_fingerprint(signature) -> str:
+    # identifies the inputs an outlier result was built from: data files + scoring config
+    config = {"rules": STAT_RULES, "stats": STATS_TO_TRACK, "n_bars": N_BARS}
+    blob = json.dumps([signature, config], sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def normalize_game_ids(logs: pd.DataFrame) -> pd.DataFrame:
+    # CSV logs carry GAME_ID as an int; the parquet copies are already padded strings
+    if not pd.api.types.is_string_dtype(logs["GAME_ID"]):
+        logs["GAME_ID"] = logs["GAME_ID"].astype(str).str.zfill(10)
+    return logs
+
+
+def sort_by_game(logs: pd.DataFrame) -> pd.DataFrame:
+    # stable sort keeps the file's row order inside each game
+    return logs.sort_values("GAME_ID", kind="stable")
+
+
+def build_game_index(logs: pd.DataFrame) -> dict:
+    # logs must be sorted by GAME_ID: GAME_ID -> slice of contiguous row positions
+    ids = logs["GAME_ID"].to_numpy()
+    if len(ids) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    stops = np.r_[starts[1:], len(ids)]
+    return {ids[start]: slice(start, stop) for start, stop in zip(starts, stops)}
+
+
+def build_team_index(logs: pd.DataFrame, file_order: np.ndarray) -> dict:
+    # TEAM_ABBREVIATION -> row positions of that team's games, in file order
+    index = {}
+    for abbr, positions in logs.groupby("TEAM_ABBREVIATION", observed=True).indices.items():
+        index[abbr] = positions[np.argsort(file_order[positions], kind="stable")]
+    return index
+
+
+def build_key_index(keys: np.ndarray) -> dict:
+    # key -> row positions holding it, in row order
+    return pd.Series(keys).groupby(keys).indices
+
+
+class Dataset:
+    """Read-only, preprocessed copy of everything compute_outliers needs.
+
+    Built once per change of the files under DATA_DIR (or one season's
+    partition of it) and shared by every request in the process. Callers
+    must not mutate the DataFrames.
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self.signature = data_signature(data_dir)
+        self.fingerprint = result_fingerprint(self.signature)
+
+        with timed("load_tables"):
+            team_logs   = load_table("team_game_logs", table_columns("team_game_logs"), data_dir)
+            player_logs = load_table("player_game_logs", table_columns("player_game_logs"), data_dir)
+            team_avg    = load_table("team_averages", table_columns("team_averages"), data_dir).set_index("TEAM_NAME")
+            player_avg  = load_table("player_averages", table_columns("player_averages"), data_dir).set_index("PLAYER_ID")
+            league_diffs = load_table("league_differentials", data_dir=data_dir).set_index("STAT")
+
+        team_logs = normalize_game_ids(team_logs)
+        player_logs = normalize_game_ids(player_logs)
+
+        #Advanced Stats
+        with timed("advanced_stats"):
+            player_logs = add_all_adv(player_logs)
+            player_avg = add_all_adv(player_avg)
+
+        team_logs = sort_by_game(team_logs)
+        player_logs = sort_by_game(player_logs)
+        team_file_order = team_logs.index.to_numpy()
+        team_logs = team_logs.reset_index(drop=True)
+        player_logs = player_logs.reset_index(drop=True)
+
+        self.team_logs = team_logs
+        self.player_logs = player_logs
+        self.team_avg = team_avg
+        self.player_avg = player_avg
+        self.league_diffs = league_diffs
+        self.loaded_at = time.time()
+        self.last_modified = max((mtime or 0) for _, mtime, _ in self.signature) / 1e9
+
+        self.team_file_order = team_file_order
+        self.source_signature = self.signature
+
+        self.player_game_index = build_game_index(player_logs)
+        self.player_index = build_key_index(player_logs["PLAYER_ID"].to_numpy())
+        self._index_team_logs()
+
+        # season-wide score matrices, row-aligned with team_logs / player_logs
+        self._derived = {}
+        with timed("score_matrices"):
+            self.team_score_matrix = apply_rules(self.components("team"))
+            self.player_score_matrix = apply_rules(self.components("player"))
+
+    def _index_team_logs(self):
+        self.team_game_index = build_game_index(self.team_logs)
+        self.team_index = build_team_index(self.team_logs, self.team_file_order)
+
+        # /api/games listings, /api/games keeps the file's order
+        file_ordered = self.team_logs.iloc[np.argsort(self.team_file_order, kind="stable")]
+        self.game_listing = build_game_listing(file_ordered)
+        self.team_listings = build_team_listings(self.team_logs, self.team_index)
+
+    def teams_in_game(self, game_id) -> pd.DataFrame:
+        rows = self.team_game_index.get(str(game_id), slice(0, 0))
+        return self.team_logs.iloc[rows]
+
+    def players_in_game(self, game_id) -> pd.DataFrame:
+        rows = self.player_game_index.get(str(game_id), slice(0, 0))
+        return self.player_logs.iloc[rows]
+
+    def player_rows(self, positions) -> pd.DataFrame:
+        return self.player_logs.iloc[positions]
+
+    def baseline_avgs(self, entity_type: str, baseline: str) -> pd.DataFrame:
+        """Per-row averages under `baseline` (see backend/baselines.py), row-aligned with the logs."""
+        key = ("avgs", entity_type, baseline)
+        if key not in self._derived:
+            if entity_type == "player":
+                logs, avg, by = self.player_logs, self.player_avg, "PLAYER_ID"
+            else:
+                logs, avg, by = self.team_logs, self.team_avg, "TEAM_NAME"
+            if baseline == "season":
+                avgs = avg.reindex(logs[by])
+            elif baseline == "zscore":
+                avgs = self.moment_frames(entity_type)[0].reindex(logs[by])
+            else:
+                avgs = prior_game_baselines(logs, by, baseline)
+                if entity_type == "player":
+                    avgs = add_all_adv(avgs)
+            self._derived[key] = avgs
+        return self._derived[key]
+
+    def moments(self, entity_type: str) -> MomentTable:
+        # count/mean/variance per player or team, from data_dir's saved table when it's current
+        key = ("moments", entity_type)
+        if key not in self._derived:
+            name = f"{entity_type}_game_logs"
+            logs = self.player_logs if entity_type == "player" else self.team_logs
+            self._derived[key] = load_moments(name, logs, self.data_dir, self.signature)
+        return self._derived[key]
+
+    def moment_frames(self, entity_type: str):
+        key = ("moment_frames", entity_type)
+        if key not in self._derived:
+            self._derived[key] = self.moments(entity_type).frames(MOMENT_KEYS[f"{entity_type}_game_logs"])
+        return self._derived[key]
+
+    def zscore_matrix(self, entity_type: str, rules=None) -> pd.DataFrame:
+        key = ("matrix", entity_type, "zscore")
+        if rules is None and key in self._derived:
+            return self._derived[key]
+        logs = self.player_logs if entity_type == "player" else self.team_logs
+        means, stds = self.moment_frames(entity_type)
+        by = logs[MOMENT_KEYS[f"{entity_type}_game_logs"]]
+        matrix = zscore_matrix(logs, means.reindex(by), stds.reindex(by), STAT_RULES if rules is None else rules)
+        if rules is None:
+            self._derived[key] = matrix
+        return matrix
+
+    def components(self, entity_type: str, baseline: str = "season") -> ScoreComponents:
+        # rules-independent scoring inputs for every log row, built on first use and kept
+        key = ("components", entity_type, baseline)
+        if key not in self._derived:
+            logs = self.player_logs if entity_type == "player" else self.team_logs
+            self._derived[key] = score_components(logs, self.baseline_avgs(entity_type, baseline))
+        return self._derived[key]
+
+    def score_matrix(self, entity_type: str, baseline: str = "season", rules=None) -> pd.DataFrame:
+        """Season score matrix under a baseline and, for what-if runs, another STAT_RULES."""
+        if baseline == "zscore":
+            return self.zscore_matrix(entity_type, rules)
+        if rules is not None:
+            return apply_rules(self.components(entity_type, baseline), rules)
+        if baseline == "season":
+            return self.player_score_matrix if entity_type == "player" else self.team_score_matrix
+        key = ("matrix", entity_type, baseline)
+        if key not in self._derived:
+            self._derived[key] = apply_rules(self.components(entity_type, baseline))
+        return self._derived[key]
+
+    def team_avgs_in_game(self, game_id, baseline="season") -> pd.DataFrame:
+        if baseline == "season":
+            return self.team_avg.loc[self.teams_in_game(game_id)["TEAM_NAME"]]
+        rows = self.team_game_index.get(str(game_id), slice(0, 0))
+        return self.baseline_avgs("team", baseline).iloc[rows]
+
+    def player_avgs_in_game(self, game_id, baseline="season") -> pd.DataFrame:
+        if baseline == "season":
+            return self.player_avg.loc[self.players_in_game(game_id)["PLAYER_ID"]]
+        rows = self.player_game_index.get(str(game_id), slice(0, 0))
+        return self.baseline_avgs("player", baseline).iloc[rows]
+
+    def team_scores_in_game(self, game_id, baseline="season", rules=None) -> pd.DataFrame:
+        rows = self.team_game_index.get(str(game_id), slice(0, 0))
+        if rules is not None and baseline != "zscore":
+            return apply_rules(self.components("team", baseline).take(rows), rules)
+        return self.score_matrix("team", baseline, rules).iloc[rows]
+
+    def player_scores_in_game(self, game_id, baseline="season", rules=None) -> pd.DataFrame:
+        rows = self.player_game_index.get(str(game_id), slice(0, 0))
+        if rules is not None and baseline != "zscore":
+            return apply_rules(self.components("player", baseline).take(rows), rules)
+        return self.score_matrix("player", baseline, rules).iloc[rows]
+
+    def player_games(self, player_id) -> pd.DataFrame:
+        rows = self.player_index.get(player_id, [])
+        return self.player_rows(rows)
+
+    def team_games(self, team_abbr) -> pd.DataFrame:
+        rows = self.team_index.get(team_abbr, [])
+        return self.team_logs.iloc[rows]
+
+
+class DatasetSlot:
+    """One lazily loaded Dataset, swapped for a fresh copy when its inputs change.
+
+    Every RELOAD_CHECK_INTERVAL seconds get() compares the inputs' signature
+    with the loaded copy's; on a change the new Dataset is built in a
+    background thread and swapped in with a single reference assignment,
+    so requests keep being served from the old copy meanwhile.
+    """
+
+    def __init__(self, load, signature, name=str(DATA_DIR)):
+        self.load = load
+        self.signature = signature
+        self.name = name
+        self.current = None
+        self.lock = threading.Lock()
+        self.reloading = False
+        self.last_check = 0.0
+
+    def _reload_in_background(self):
+        try:
+            fresh = self.load()
+            self.current = fresh  # single reference swap, readers keep their old copy
+            log.info("reloaded dataset", extra={"data_dir": self.name, "fingerprint": fresh.fingerprint})
+        except Exception:
+            log.exception("failed to reload dataset", extra={"data_dir": self.name})
+        finally:
+            self.reloading = False
+
+    def get(self) -> Dataset:
+        if self.current is None:
+            with self.lock:
+                if self.current is None:
+                    self.current = self.load()
+                    self.last_check = time.monotonic()
+            return self.current
+
+        now = time.monotonic()
+        if now - self.last_check >= RELOAD_CHECK_INTERVAL:
+            self.last_check = now
+            if not self.reloading and self.signature() != self.current.source_signature:
+                with self.lock:
+                    if not self.reloading:
+                        self.reloading = True
+                        threading.Thread(target=self._reload_in_background, daemon=True).start()
+
+        return self.current
+
+
+def _load_dataset() -> Dataset:
+    if USE_SHARED_DATASET:
+        # imported here: backend.shared_dataset subclasses Dataset
+        from backend.shared_dataset import attach_current_generation
+        return attach_current_generation()
+    return Dataset()
+
+
+def _source_signature():
+    if USE_SHARED_DATASET:
+        return generation_signature()
+    return data_signature()
+
+
+_default = DatasetSlot(_load_dataset, _source_signature)
+_season_slots = OrderedDict()  # season -> DatasetSlot, least recently used first
+_seasons_lock = threading.Lock()
+_seasons_listing = (0.0, [])   # (monotonic time listed, seasons)
+
+
+def available_seasons() -> list:
+    """Seasons with a partition under SEASONS_DIR, oldest first; [] when the layout is flat."""
+    global _seasons_listing
+    if USE_SHARED_DATASET:
+        return []  # the shared generations are built from the flat tables
+    listed_at, seasons = _seasons_listing
+    if time.monotonic() - listed_at >= RELOAD_CHECK_INTERVAL:
+        seasons = list_seasons()
+        _seasons_listing = (time.monotonic(), seasons)
+    return seasons
+
+
+def _season_slot(season: str) -> DatasetSlot:
+    with _seasons_lock:
+        slot = _season_slots.get(season)
+        if slot is None:
+            data_dir = SEASONS_DIR / season
+            slot = DatasetSlot(lambda: Dataset(data_dir), lambda: data_signature(data_dir), str(data_dir))
+            _season_slots[season] = slot
+            while len(_season_slots) > MAX_LOADED_SEASONS:
+                _season_slots.popitem(last=False)  # in-flight requests keep their reference
+        else:
+            _season_slots.move_to_end(season)
+        return slot
+
+
+def get_dataset(season: str = None) -> Dataset:
+    """The Dataset for `season` ("2024-25"), the newest season when omitted.
+
+    Without season partitions every request is served from the flat
+    DATA_DIR tables and `season` is ignored. Raises KeyError for a season
+    that has no partition.
+    """
+    seasons = available_seasons()
+    if not seasons:
+        return _default.get()
+    season = season or seasons[-1]
+    if season not in seasons:
+        raise KeyError(f"No data for season {season}")
+    return _season_slot(season).get()
+
+
+def dataset_for_game(game_id) -> Dataset:
+    # the partition a game belongs to; unknown seasons and malformed IDs fall back to the newest
+    try:
+        season = season_from_game_id(game_id)
+    except ValueError:
+        season = None
+    return get_dataset(season if season in available_seasons() else None)
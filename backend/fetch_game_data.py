@@ -1,16 +1,231 @@
-from nba_api.stats.endpoints import teamgamelogs, playergamelogs
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.config import DATA_DIR
 
-#set season year
-SEASON = '2024-25'
+# Incremental team/player game log fetcher for any number of seasons:
+#   python -m backend.fetch_game_data --seasons 2023-24 2024-25 --season-types "Regular Season" Playoffs
+# Only games on or after the newest GAME_DATE already stored for each season and
+# season type are requested; rows are merged by (GAME_ID, TEAM_ID / PLAYER_ID) and
+# each CSV is replaced atomically. Raw responses are cached under HTTP_CACHE_DIR,
+# so reruns cost nothing. NBA_STATS_URL points the fetcher at a stand-in server.
 
-# Fetch team game logs
-team_logs = teamgamelogs.TeamGameLogs(season_nullable=SEASON, season_type_nullable='Regular Season') #create API object
-team_df = team_logs.get_data_frames()[0]    #API object -> pandas dataframe
-team_df.to_csv('data/team_game_logs.csv', index=False)  #saves df to CSV file 
+STATS_BASE_URL = os.environ.get("NBA_STATS_URL", "https://stats.nba.com/stats")
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+FETCH_WORKERS = 4
+MIN_REQUEST_INTERVAL = 0.6  # seconds between requests, shared by all workers
+MAX_RETRIES = 5             # on connection errors, 429 and 5xx, with exponential backoff
+REQUEST_TIMEOUT = 30        # seconds
+OPEN_SEASON_CACHE_TTL = 3600  # seconds a cached response for an unfinished season stays fresh
+EXPIRING_SUFFIX = ".expiring.json"  # cache files written with a max_age, pruned once it has passed
 
-# Fetch player game logs
-player_logs = playergamelogs.PlayerGameLogs(season_nullable=SEASON, season_type_nullable='Regular Season')
-player_df = player_logs.get_data_frames()[0]
-player_df.to_csv('data/player_game_logs.csv', index=False)
+SEASONS = ["2024-25"]
+SEASON_TYPES = {  # season type -> third digit of its GAME_IDs
+    "Pre Season": "1",
+    "Regular Season": "2",
+    "Playoffs": "4",
+    "PlayIn": "5",
+}
+ENDPOINTS = {"team_game_logs": "teamgamelogs", "player_game_logs": "playergamelogs"}
+LOG_KEYS = {"team_game_logs": "TEAM_ID", "player_game_logs": "PLAYER_ID"}
 
-print("Raw game logs saved.")
+# what nba_api sends; stats.nba.com drops requests without browser-like headers
+STATS_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:72.0) Gecko/20100101 Firefox/72.0",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.5",
+    "x-nba-stats-origin": "stats",
+    "x-nba-stats-token": "true",
+    "Referer": "https://stats.nba.com/",
+}
+# every parameter the gamelogs endpoints take, blank unless set
+GAME_LOG_PARAMS = [
+    "DateFrom", "DateTo", "GameSegment", "LastNGames", "LeagueID", "Location", "MeasureType", "Month",
+    "OpponentTeamID", "Outcome", "PORound", "PerMode", "Period", "PlayerID", "Season", "SeasonSegment",
+    "SeasonType", "ShotClockRange", "TeamID", "VsConference", "VsDivision",
+]
+
+
+class RateLimiter:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        # reserves the next slot, then sleeps outside the lock until it comes up
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + self.interval
+        time.sleep(max(0.0, start - now))
+
+
+class StatsClient:
+    """Pooled, rate-limited and retrying GETs against the stats API, cached on disk."""
+
+    def __init__(self, base_url=STATS_BASE_URL, cache_dir=HTTP_CACHE_DIR, workers=FETCH_WORKERS,
+                 min_interval=MIN_REQUEST_INTERVAL, retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.limiter = RateLimiter(min_interval)
+        self.session = requests.Session()
+        self.session.headers.update(STATS_HEADERS)
+        retry = Retry(total=retries, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=["GET"])
+        self.session.mount(self.base_url, HTTPAdapter(pool_maxsize=workers, max_retries=retry))
+        self.requests_sent = 0
+
+    def cache_path(self, endpoint: str, params: dict, expiring=False):
+        # responses that can go stale are named apart, so pruning never touches permanent ones
+        key = hashlib.sha1(json.dumps([self.base_url, endpoint, sorted(params.items())]).encode()).hexdigest()
+        return self.cache_dir / f"{endpoint}-{key[:16]}{EXPIRING_SUFFIX if expiring else '.json'}"
+
+    def prune_expired(self, max_age: float) -> int:
+        # open-season requests carry the newest stored DateFrom, so every update leaves a
+        # differently keyed response behind; drop the ones past max_age
+        cutoff = time.time() - max_age
+        pruned = 0
+        for path in self.cache_dir.glob(f"*{EXPIRING_SUFFIX}"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    pruned += 1
+            except FileNotFoundError:
+                pass  # pruned by another worker meanwhile
+        return pruned
+
+    def get(self, endpoint: str, params: dict, max_age=None) -> dict:
+        # max_age=None keeps a cached response forever (finished seasons never change)
+        path = self.cache_path(endpoint, params, expiring=max_age is not None)
+        if path.exists() and (max_age is None or time.time() - path.stat().st_mtime < max_age):
+            with open(path) as f:
+                return json.load(f)
+
+        self.limiter.wait()
+        response = self.session.get(f"{self.base_url}/{endpoint}", params=sorted(params.items()),
+                                    timeout=self.timeout)
+        self.requests_sent += 1
+        response.raise_for_status()
+        payload = response.json()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+        if max_age is not None:
+            self.prune_expired(max_age)
+        return payload
+
+
+def result_frame(payload: dict) -> pd.DataFrame:
+    # first result set of a stats API response as a DataFrame
+    result = payload["resultSets"][0]
+    return pd.DataFrame(result["rowSet"], columns=result["headers"])
+
+
+def season_finished(season: str, today=None) -> bool:
+    # "2023-24" is over once July 2024 starts
+    end_year = int(season[:4]) + 1
+    return (today or date.today()) >= date(end_year, 7, 1)
+
+
+def normalize_logs(logs: pd.DataFrame) -> pd.DataFrame:
+    logs = logs.copy()
+    logs["GAME_ID"] = logs["GAME_ID"].astype(str).str.zfill(10)
+    return logs
+
+
+def latest_game_dates(logs: pd.DataFrame) -> dict:
+    # (SEASON_YEAR, GAME_ID season-type digit) -> newest "YYYY-MM-DD" stored
+    if logs.empty:
+        return {}
+    logs = normalize_logs(logs)
+    dates = logs["GAME_DATE"].astype(str).str[:10]
+    return dates.groupby([logs["SEASON_YEAR"], logs["GAME_ID"].str[2]]).max().to_dict()
+
+
+def fetch_logs(client: StatsClient, table: str, season: str, season_type: str, date_from=None) -> pd.DataFrame:
+    params = dict.fromkeys(GAME_LOG_PARAMS, "")
+    params.update({"LeagueID": "00", "Season": season, "SeasonType": season_type})
+    if date_from:
+        params["DateFrom"] = pd.Timestamp(date_from).strftime("%m/%d/%Y")
+    max_age = None if season_finished(season) else OPEN_SEASON_CACHE_TTL
+    return result_frame(client.get(ENDPOINTS[table], params, max_age))
+
+
+def merge_logs(old: pd.DataFrame, new: pd.DataFrame, key: str) -> pd.DataFrame:
+    # fetched rows replace stored ones for the same (GAME_ID, key); newest games first
+    merged = pd.concat([normalize_logs(df) for df in (old, new) if not df.empty], ignore_index=True)
+    merged = merged.drop_duplicates(["GAME_ID", key], keep="last")
+    return merged.sort_values(["GAME_DATE", "GAME_ID"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def write_csv_atomic(df: pd.DataFrame, path):
+    tmp = f"{path}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def update_game_logs(seasons=SEASONS, season_types=("Regular Season",), client=None,
+                     data_dir=DATA_DIR, workers=FETCH_WORKERS) -> dict:
+    """Fetches what's missing for every season/type and rewrites the CSVs; returns new rows per table."""
+    client = client or StatsClient(workers=workers)
+    stored = {}
+    for table in ENDPOINTS:
+        path = data_dir / f"{table}.csv"
+        stored[table] = pd.read_csv(path, dtype={"GAME_ID": str}) if path.exists() else pd.DataFrame()
+
+    jobs = []
+    for table in ENDPOINTS:
+        latest = latest_game_dates(stored[table])
+        for season in seasons:
+            for season_type in season_types:
+                jobs.append((table, season, season_type, latest.get((season, SEASON_TYPES[season_type]))))
+
+    # all fetches finish before anything is written, so a failure leaves the CSVs untouched
+    with ThreadPoolExecutor(workers) as pool:
+        frames = list(pool.map(lambda job: (job[0], fetch_logs(client, *job)), jobs))
+
+    added = {}
+    for table in ENDPOINTS:
+        fetched = [frame for name, frame in frames if name == table and not frame.empty]
+        if not fetched:
+            added[table] = 0
+            continue
+        old = stored[table]
+        merged = merge_logs(old, pd.concat(fetched, ignore_index=True), LOG_KEYS[table])
+        added[table] = len(merged) - len(old)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        write_csv_atomic(merged, data_dir / f"{table}.csv")
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch new team and player game logs from the NBA stats API.")
+    parser.add_argument("--seasons", nargs="+", default=SEASONS, help="e.g. 2023-24 2024-25")
+    parser.add_argument("--season-types", nargs="+", default=["Regular Season"], choices=list(SEASON_TYPES))
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    client = StatsClient(workers=args.workers)
+    added = update_game_logs(args.seasons, args.season_types, client, workers=args.workers)
+    print(f"✅ Raw game logs saved: {added['team_game_logs']} new team rows, "
+          f"{added['player_game_logs']} new player rows, {client.requests_sent} API requests "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
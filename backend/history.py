@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from backend.config import STATS_TO_TRACK
+from backend.dataset import Dataset, get_dataset
+
+# Both histories list games oldest first (GAME_DATE, then GAME_ID), so the
+# last entry is the latest game whatever order the index keeps rows in.
+
+
+def _chronological(logs: pd.DataFrame, rows) -> np.ndarray:
+    # `rows` reordered by (GAME_DATE, GAME_ID) of `logs`, which must be aligned with them
+    order = np.lexsort((logs["GAME_ID"].astype(str).to_numpy(), pd.to_datetime(logs["GAME_DATE"]).to_numpy()))
+    return np.asarray(rows)[order]
+
+
+def _game_series(logs: pd.DataFrame, scores: np.ndarray) -> list:
+    # one entry per game; only stats that cleared STAT_RULES (nonzero score) are listed
+    actual = {stat: logs[stat].tolist() for stat in STATS_TO_TRACK if stat in logs.columns}
+    game_ids = logs["GAME_ID"].tolist()
+    dates = logs["GAME_DATE"].astype(str).str[:10].tolist()
+    matchups = logs["MATCHUP"].tolist()
+
+    games = []
+    for i, row in enumerate(scores):
+        outliers = {
+            stat: {"score": round(float(score), 3), "actual": actual[stat][i]}
+            for stat, score in zip(STATS_TO_TRACK, row)
+            if not np.isnan(score) and score != 0
+        }
+        game_scores = [entry["score"] for entry in outliers.values()]
+        games.append({
+            "game_id": game_ids[i],
+            "date": dates[i],
+            "matchup": matchups[i],
+            "max": max(game_scores, default=0),
+            "min": min(game_scores, default=0),
+            "outliers": outliers,
+        })
+    return games
+
+
+def _averages(avg_row: pd.Series) -> dict:
+    return {stat: round(float(avg_row[stat]), 3) for stat in STATS_TO_TRACK
+            if stat in avg_row.index and not pd.isna(avg_row[stat])}
+
+
+def build_player_history(player_id: int, data: Dataset = None):
+    """Every game of one player with the stats that scored as outliers, or None if unknown.
+
+    Scores come from the Dataset's season score matrix, so this is a row
+    lookup rather than a compute_outliers call per game.
+    """
+    data = data or get_dataset()
+    rows = data.player_index.get(player_id)
+    if rows is None:
+        return None
+    rows = _chronological(data.player_rows(rows), rows)
+    logs = data.player_rows(rows)
+    avg_row = data.player_avg.loc[player_id]
+    scores = data.player_score_matrix.to_numpy()[rows]
+
+    return {
+        "type": "player",
+        "player_id": int(player_id),
+        "name": logs["PLAYER_NAME"].iloc[-1],
+        "team": logs["TEAM_NAME"].iloc[-1],
+        "avg": _averages(avg_row),
+        "games": _game_series(logs, scores),
+    }
+
+
+def build_team_history(team_abbr: str, data: Dataset = None):
+    """Every game of one team with the stats that scored as outliers, or None if unknown."""
+    data = data or get_dataset()
+    rows = data.team_index.get(team_abbr)
+    if rows is None:
+        return None
+    rows = _chronological(data.team_logs.iloc[rows], rows)
+    logs = data.team_logs.iloc[rows]
+    team_name = logs["TEAM_NAME"].iloc[-1]
+    avg_row = data.team_avg.loc[team_name]
+    scores = data.team_score_matrix.to_numpy()[rows]
+
+    return {
+        "type": "team",
+        "team_abbr": team_abbr,
+        "name": team_name,
+        "avg": _averages(avg_row),
+        "games": _game_series(logs, scores),
+    }
@@ -0,0 +1,94 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from backend.config import DATA_DIR, STATS_TO_AVERAGE
+
+# Run after fetch_game_data.py and compute_averages.py:
+#   python -m backend.ingest
+# Writes a typed, column-projected parquet copy next to every CSV in DATA_DIR.
+# load_table() prefers these copies whenever they are at least as new as the CSV.
+
+CATEGORY = pa.dictionary(pa.int16(), pa.string())
+
+# counting stats are stored as int16 when the source column is integral;
+# fractional stats (percentages, MIN, averages) stay float64 so published
+# values and scores are unchanged
+COUNT_STATS = [
+    'FGM','FGA','FG3M','FG3A','FTM','FTA','OREB','DREB','REB',
+    'AST','TOV','STL','BLK','BLKA','PF','PFD','PTS'
+]
+
+LOG_STATS = STATS_TO_AVERAGE + ['PLUS_MINUS']
+
+# table -> [(column, arrow type or None to decide from the data)], in output order
+TABLE_SCHEMAS = {
+    "team_game_logs": [
+        ("SEASON_YEAR", CATEGORY), ("TEAM_ID", pa.int64()), ("TEAM_ABBREVIATION", CATEGORY),
+        ("TEAM_NAME", CATEGORY), ("GAME_ID", pa.string()), ("GAME_DATE", CATEGORY),
+        ("MATCHUP", CATEGORY), ("WL", CATEGORY),
+    ] + [(stat, None) for stat in LOG_STATS],
+    "player_game_logs": [
+        ("SEASON_YEAR", CATEGORY), ("PLAYER_ID", pa.int64()), ("PLAYER_NAME", CATEGORY),
+        ("TEAM_ID", pa.int64()), ("TEAM_ABBREVIATION", CATEGORY), ("TEAM_NAME", CATEGORY),
+        ("GAME_ID", pa.string()), ("GAME_DATE", CATEGORY), ("MATCHUP", CATEGORY),
+        ("WL", CATEGORY),
+    ] + [(stat, None) for stat in LOG_STATS],
+    "team_averages": [("TEAM_NAME", CATEGORY)] + [(stat, pa.float64()) for stat in STATS_TO_AVERAGE],
+    "player_averages": [("PLAYER_ID", pa.int64()), ("PLAYER_NAME", CATEGORY)]
+                       + [(stat, pa.float64()) for stat in STATS_TO_AVERAGE],
+    "league_differentials": [("STAT", pa.string()), ("AVG_DIFF", pa.float64())],
+}
+
+
+def table_columns(name: str) -> list:
+    return [column for column, _ in TABLE_SCHEMAS[name]]
+
+
+def _stat_type(column: str, values: pd.Series) -> pa.DataType:
+    if column in COUNT_STATS and pd.api.types.is_integer_dtype(values):
+        if values.empty or (values.min() >= -2**15 and values.max() < 2**15):
+            return pa.int16()
+    return pa.float64()
+
+
+def to_arrow(name: str, df: pd.DataFrame) -> pa.Table:
+    fields, arrays = [], []
+    for column, arrow_type in TABLE_SCHEMAS[name]:
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if column == "GAME_ID":
+            values = values.astype(str).str.zfill(10)  # padded once here, never again at load
+        if arrow_type is None:
+            arrow_type = _stat_type(column, values)
+        if pa.types.is_dictionary(arrow_type):
+            array = pa.array(values.astype(str).where(values.notna(), None)).dictionary_encode()
+            array = array.cast(arrow_type)
+        else:
+            array = pa.array(values, type=arrow_type, from_pandas=True)
+        fields.append(pa.field(column, arrow_type))
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def ingest_table(name: str, data_dir=DATA_DIR) -> pa.Table:
+    table = to_arrow(name, pd.read_csv(data_dir / f"{name}.csv"))
+    path = data_dir / f"{name}.parquet"
+    tmp = f"{path}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    return table
+
+
+def main():
+    for name in TABLE_SCHEMAS:
+        if not (DATA_DIR / f"{name}.csv").exists():
+            print(f"[ERROR] Missing {name}.csv, skipped")
+            continue
+        table = ingest_table(name)
+        print(f"✅ Wrote {name}.parquet ({table.num_rows} rows, {table.num_columns} columns)")
+
+
+if __name__ == "__main__":
+    main()
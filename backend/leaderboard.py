@@ -0,0 +1,85 @@
+import numpy as np
+from backend.config import N_BARS, STATS_TO_TRACK
+from backend.dataset import Dataset, get_dataset
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    # positions of the k largest positive values of a flat array, largest first;
+    # argpartition is O(n), only the k winners get sorted
+    values = np.where(np.isnan(values), -np.inf, values)
+    k = min(k, values.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    best = np.argpartition(values, values.size - k)[values.size - k:]
+    best = best[np.argsort(-values[best], kind="stable")]
+    return best[values[best] > 0]
+
+
+def rows_in_range(data: Dataset, game_index: dict, date_from=None, date_to=None) -> np.ndarray:
+    # row positions of every game between the two YYYY-MM-DD dates, in GAME_ID order
+    if not (date_from or date_to):
+        return np.arange(max((rows.stop for rows in game_index.values()), default=0))
+    games, _ = data.game_listing.select(date_from, date_to)
+    slices = [game_index[g["game_id"]] for g in games if g["game_id"] in game_index]
+    if not slices:
+        return np.empty(0, dtype=np.intp)
+    return np.sort(np.concatenate([np.arange(rows.start, rows.stop) for rows in slices]))
+
+
+def build_leaderboard(entity_type="player", stat=None, date_from=None, date_to=None,
+                      n=N_BARS, data: Dataset = None, rules=None) -> dict:
+    """Biggest positive and negative single-game scores across a date range.
+
+    Reads the season score matrices the Dataset already holds, so a whole
+    season costs one argpartition per direction instead of an /api/outliers
+    call per game. `stat` limits the board to one of STATS_TO_TRACK;
+    `rules` re-scores the season under another STAT_RULES first.
+    """
+    data = data or get_dataset()
+    if entity_type == "player":
+        game_index, avg = data.player_game_index, data.player_avg
+    else:
+        game_index, avg = data.team_game_index, data.team_avg
+    matrix = data.score_matrix(entity_type, rules=rules)
+
+    stats = [stat] if stat else STATS_TO_TRACK
+    columns = [matrix.columns.get_loc(s) for s in stats]
+    rows = rows_in_range(data, game_index, date_from, date_to)
+    values = matrix.to_numpy()[rows][:, columns]
+
+    flat = values.ravel()
+    picks = {"positive": top_k(flat, n), "negative": top_k(-flat, n)}
+
+    # only the winning rows are pulled out of the logs
+    winners = np.unique(np.concatenate(list(picks.values())) // len(stats))
+    logs = data.player_rows(rows[winners]) if entity_type == "player" else data.team_logs.iloc[rows[winners]]
+    key = "PLAYER_ID" if entity_type == "player" else "TEAM_NAME"
+    avg_rows = avg.loc[logs[key]]
+    position = {row: i for i, row in enumerate(winners)}
+
+    board = {"type": entity_type, "stat": stat, "from": date_from, "to": date_to}
+    for direction, flat_positions in picks.items():
+        board[direction] = []
+        for flat_position in flat_positions:
+            i = position[flat_position // len(stats)]
+            stat_name = stats[flat_position % len(stats)]
+            log = logs.iloc[i]
+            name = log["PLAYER_NAME"] if entity_type == "player" else log["TEAM_NAME"]
+            entry = {
+                "type": entity_type,
+                "name": name,
+                "stat": f"{name} - {stat_name}",
+                "score": round(float(flat[flat_position]), 3),
+                "actual": logs[stat_name].tolist()[i],
+                "avg": round(avg_rows[stat_name].tolist()[i], 3),
+                "game_id": log["GAME_ID"],
+                "date": str(log["GAME_DATE"])[:10],
+                "matchup": log["MATCHUP"],
+            }
+            if entity_type == "player":
+                entry["player_id"] = int(log["PLAYER_ID"])
+                entry["team"] = log["TEAM_NAME"]
+            else:
+                entry["team_abbr"] = log["TEAM_ABBREVIATION"]
+            board[direction].append(entry)
+    return board
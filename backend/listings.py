@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+
+class Listing:
+    """A prebuilt list of game entries plus their YYYY-MM-DD dates for filtering."""
+
+    def __init__(self, entries: list, dates: np.ndarray):
+        self.entries = entries
+        self.dates = dates
+
+    def select(self, date_from=None, date_to=None, page=None, per_page=None):
+        # returns (entries, total matching before pagination)
+        if date_from or date_to:
+            keep = np.ones(len(self.dates), dtype=bool)
+            if date_from:
+                keep &= self.dates >= date_from
+            if date_to:
+                keep &= self.dates <= date_to
+            entries = [self.entries[i] for i in np.flatnonzero(keep)]
+        else:
+            entries = self.entries
+
+        total = len(entries)
+        if per_page:
+            start = (max(page or 1, 1) - 1) * per_page
+            entries = entries[start:start + per_page]
+        return entries, total
+
+
+def _listing(df: pd.DataFrame, columns: dict) -> Listing:
+    entries = df[list(columns)].rename(columns=columns).to_dict("records")
+    dates = df["GAME_DATE"].astype(str).str[:10].to_numpy(dtype=str)
+    return Listing(entries, dates)
+
+
+def build_game_listing(team_logs: pd.DataFrame) -> Listing:
+    # one entry per game, in the order team_logs is given (first row of each game wins)
+    unique_games = team_logs.drop_duplicates(subset=["GAME_ID"])
+    return _listing(unique_games, {"GAME_ID": "game_id", "GAME_DATE": "date", "MATCHUP": "matchup"})
+
+
+def build_team_listings(team_logs: pd.DataFrame, team_index: dict) -> dict:
+    # TEAM_ABBREVIATION -> Listing of that team's games with the opponent parsed from MATCHUP
+    logs = team_logs.assign(OPPONENT=team_logs["MATCHUP"].str.replace(r"^\S+ (?:vs\.|@) ", "", regex=True))
+    columns = {"GAME_ID": "game_id", "GAME_DATE": "date", "OPPONENT": "opponent"}
+    return {abbr: _listing(logs.iloc[rows], columns) for abbr, rows in team_index.items()}
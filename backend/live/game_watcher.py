@@ -1,11 +1,13 @@
-import time
+import asyncio
+import logging
 import os
-from nba_api.live.nba.endpoints import scoreboard
-from backend.compute_outliers import compute_outliers
-from backend.utils import save_json
-
-
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from backend.logs import configure_logging
 
+# The polling loop needs neither pandas nor nba_api: the scoring modules are
+# imported in the worker processes that use them, nba_api only when not mocking.
 USE_MOCK = True
 if USE_MOCK:
     from backend.live.mock_scoreboard import MockScoreBoard as ScoreBoard
@@ -14,44 +16,138 @@ else:
     ScoreBoard = scoreboard.ScoreBoard
 
 
+log = logging.getLogger(__name__)
+
 OUTLIER_SAVE_FOLDER = "backend/output"
-POLL_INTERVAL = 180  # seconds
+PROCESSED_LOG = Path(OUTLIER_SAVE_FOLDER) / "processed_games.txt"
+
+FAST_POLL_INTERVAL = 15     # seconds, a game is in its last period
+POLL_INTERVAL = 180         # seconds, games scheduled or in progress
+IDLE_POLL_INTERVAL = 1800   # seconds, nothing left to finish today
+MAX_WORKERS = 4
+MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 10       # seconds, doubled after every failed attempt
 
-def get_already_processed_game_ids():
-    if not os.path.exists(OUTLIER_SAVE_FOLDER):
-        os.makedirs(OUTLIER_SAVE_FOLDER)
+
+def load_processed_game_ids(path=PROCESSED_LOG):
+    if not os.path.exists(path):
         return set()
-    return {f.replace(".json", "") for f in os.listdir(OUTLIER_SAVE_FOLDER) if f.endswith(".json")}
+    with open(path) as f:
+        return {line.strip() for line in f if line.strip()}
 
-def get_finished_games():
-    try:
-        board = ScoreBoard()
-        games = board.get_dict()['scoreboard']['games']
-        return [g['gameId'].zfill(10) for g in games if g['gameStatus'] == 3]
-    except Exception as e:
-        print(f"[ERROR] Failed to fetch scoreboard: {e}")
-        return []
+def mark_processed(game_id, path=PROCESSED_LOG):
+    # append-only log, fsync'd so a crash never forgets a finished game
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(game_id + "\n")
+        f.flush()
+        os.fsync(f.fileno())
 
-def main():
-    print("Starting live scoreboard watcher...")
-    processed = get_already_processed_game_ids()
-    print(f"Already processed {len(processed)} games.")
+def get_scoreboard_games():
+    board = ScoreBoard()
+    return board.get_dict()['scoreboard']['games']
+
+def finished_game_ids(games):
+    return [g['gameId'].zfill(10) for g in games if g['gameStatus'] == 3]
+
+def next_poll_interval(games):
+    live = [g for g in games if g.get('gameStatus') == 2]
+    if any(g.get('period', 0) >= 4 for g in live):
+        return FAST_POLL_INTERVAL
+    if live or any(g.get('gameStatus') == 1 for g in games):
+        return POLL_INTERVAL
+    return IDLE_POLL_INTERVAL
+
+def process_game(game_id):
+    # runs in a worker process; the dataset is loaded once per worker
+    from backend.compute_outliers import compute_outliers
+    from backend.dataset import dataset_for_game
+    data = dataset_for_game(game_id)
+    # checked before computing: compute_outliers would save an empty result under the current fingerprint
+    if len(data.teams_in_game(game_id)) < 2:
+        raise RuntimeError(f"no box score rows for {game_id} yet")
+    compute_outliers(game_id, data)
+    return game_id
 
-    while True:
-        finished_games = get_finished_games()
-        new_games = [gid for gid in finished_games if gid not in processed]
+def _warm_worker():
+    from backend.dataset import get_dataset
+    get_dataset()
 
-        for game_id in new_games:
-            print(f"📡 New finished game: {game_id} — processing...")
+
+class GameWatcher:
+    def __init__(self, executor=None, max_workers=MAX_WORKERS, processed_path=PROCESSED_LOG):
+        self.executor = executor or ProcessPoolExecutor(max_workers, initializer=_warm_worker)
+        self.slots = asyncio.Semaphore(max_workers)
+        self.processed_path = processed_path
+        self.processed = load_processed_game_ids(processed_path)
+        self.in_flight = {}
+        self.failures = {}  # game_id -> (attempts, monotonic time of next retry)
+
+    def _due(self, game_id, now):
+        if game_id in self.processed or game_id in self.in_flight:
+            return False
+        attempts, retry_at = self.failures.get(game_id, (0, 0))
+        return attempts < MAX_ATTEMPTS and now >= retry_at
+
+    async def _run_game(self, game_id):
+        loop = asyncio.get_running_loop()
+        async with self.slots:
             try:
-                outlier_data = compute_outliers(game_id)
-                save_json(outlier_data)
-                processed.add(game_id)
-                print(f"✅ Saved outliers for game {game_id}")
+                await loop.run_in_executor(self.executor, process_game, game_id)
             except Exception as e:
-                print(f"[ERROR] Failed to process game {game_id}: {e}")
+                attempts = self.failures.get(game_id, (0, 0))[0] + 1
+                delay = RETRY_BASE_DELAY * 2 ** (attempts - 1)
+                self.failures[game_id] = (attempts, time.monotonic() + delay)
+                if attempts >= MAX_ATTEMPTS:
+                    log.error("giving up on game", extra={"game_id": game_id, "attempts": attempts, "error": str(e)})
+                else:
+                    log.warning("failed to process game, retrying",
+                                extra={"game_id": game_id, "attempts": attempts, "retry_in": delay, "error": str(e)})
+                return
+            finally:
+                self.in_flight.pop(game_id, None)
+
+        mark_processed(game_id, self.processed_path)
+        self.processed.add(game_id)
+        self.failures.pop(game_id, None)
+        log.info("saved outliers for game", extra={"game_id": game_id})
+
+    async def poll_once(self):
+        try:
+            games = await asyncio.to_thread(get_scoreboard_games)
+        except Exception:
+            log.exception("failed to fetch scoreboard")
+            return POLL_INTERVAL
 
-        time.sleep(POLL_INTERVAL)
+        now = time.monotonic()
+        for game_id in finished_game_ids(games):
+            if self._due(game_id, now):
+                log.info("new finished game, processing", extra={"game_id": game_id})
+                self.in_flight[game_id] = asyncio.create_task(self._run_game(game_id))
+
+        interval = next_poll_interval(games)
+        retries = [retry_at - now for attempts, retry_at in self.failures.values() if attempts < MAX_ATTEMPTS]
+        if retries:
+            interval = min(interval, max(1, min(retries)))
+        return interval
+
+    async def drain(self):
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight.values())
+
+    async def run(self):
+        log.info("starting live scoreboard watcher", extra={"already_processed": len(self.processed)})
+        try:
+            while True:
+                interval = await self.poll_once()
+                await asyncio.sleep(interval)
+        finally:
+            await self.drain()
+            self.executor.shutdown()
+
+def main():
+    configure_logging()
+    asyncio.run(GameWatcher().run())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
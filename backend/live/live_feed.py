@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.live.live_outliers import LiveGame
+
+log = logging.getLogger(__name__)
+
+USE_MOCK = True
+if USE_MOCK:
+    from backend.live.mock_boxscore import MockBoxScore as BoxScore
+else:
+    from nba_api.live.nba.endpoints.boxscore import BoxScore
+
+LIVE_POLL_INTERVAL = 10    # seconds between box score polls of every watched game
+LIVE_FETCH_WORKERS = 8     # box scores fetched concurrently per poll
+KEEPALIVE_INTERVAL = 15    # seconds of silence before an SSE comment line is sent
+MAX_POLL_FAILURES = 3      # failed polls in a row before a game's streams get an error and end
+
+
+def fetch_boxscore(game_id):
+    return BoxScore(game_id).get_dict()
+
+
+class LiveHub:
+    """Polls the box score of every game someone is streaming and fans updates out.
+
+    One background thread serves all watched games, so ten clients on the
+    same game cost one poll and one incremental rescore per interval.
+    """
+
+    def __init__(self, fetch=fetch_boxscore, interval=LIVE_POLL_INTERVAL):
+        self.fetch = fetch
+        self.interval = interval
+        self.games = {}        # game_id -> LiveGame
+        self.watchers = {}     # game_id -> open streams
+        self.failures = {}     # game_id -> failed polls in a row
+        self.updated = threading.Condition()
+        self.pool = ThreadPoolExecutor(LIVE_FETCH_WORKERS)
+        self.thread = None
+
+    def _poll_game(self, game_id):
+        try:
+            box = self.fetch(game_id)
+            game = self.games.get(game_id) or self.games.setdefault(game_id, LiveGame(game_id))
+            rescored = game.update(box)
+        except Exception:
+            log.exception("live update failed", extra={"game_id": game_id})
+            self.failures[game_id] = self.failures.get(game_id, 0) + 1
+            return 0
+        self.failures.pop(game_id, None)
+        return rescored
+
+    def start_game(self, game_id) -> bool:
+        """Fetches a game once before its first stream opens; False if the feed can't serve it."""
+        if game_id in self.games:
+            return True
+        try:
+            game = LiveGame(game_id)
+            game.update(self.fetch(game_id))
+        except Exception as e:
+            log.warning("no live box score", extra={"game_id": game_id, "error": repr(e)})
+            return False
+        with self.updated:
+            self.games.setdefault(game_id, game)
+        return True
+
+    def poll_once(self):
+        with self.updated:
+            game_ids = [g for g, n in self.watchers.items() if n > 0]
+        rescored = list(self.pool.map(self._poll_game, game_ids))
+        with self.updated:
+            self.updated.notify_all()
+        return dict(zip(game_ids, rescored))
+
+    def _run(self):
+        while True:
+            with self.updated:
+                if not any(self.watchers.values()):
+                    self.thread = None
+                    return
+            self.poll_once()
+            time.sleep(self.interval)
+
+    def subscribe(self, game_id):
+        with self.updated:
+            self.watchers[game_id] = self.watchers.get(game_id, 0) + 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self, game_id):
+        with self.updated:
+            self.watchers[game_id] -= 1
+            if not self.watchers[game_id]:
+                del self.watchers[game_id]
+                self.games.pop(game_id, None)
+                self.failures.pop(game_id, None)
+
+    def stream(self, game_id):
+        """Server-Sent Events for one game: an `outliers` event per new version until the final.
+
+        Ends with an `error` event once MAX_POLL_FAILURES polls in a row fail.
+        """
+        self.subscribe(game_id)
+        sent = 0
+        try:
+            while True:
+                with self.updated:
+                    self.updated.wait_for(lambda: self._version(game_id) > sent or self._failing(game_id),
+                                          timeout=KEEPALIVE_INTERVAL)
+                    game = self.games.get(game_id)
+                    payload = game.payload if game and game.version > sent else None
+                    failing = self._failing(game_id)
+                if payload is None and failing:
+                    yield f"event: error\ndata: {json.dumps({'game_id': game_id, 'error': 'Live updates failed'})}\n\n"
+                    return
+                if payload is None:
+                    yield ": keepalive\n\n"
+                    continue
+                sent = payload["version"]
+                yield f"event: outliers\nid: {sent}\ndata: {json.dumps(payload)}\n\n"
+                if payload["status"] == 3:
+                    return
+        finally:
+            self.unsubscribe(game_id)
+
+    def _failing(self, game_id):
+        return self.failures.get(game_id, 0) >= MAX_POLL_FAILURES
+
+    def _version(self, game_id):
+        game = self.games.get(game_id)
+        return game.version if game else 0
+
+
+hub = LiveHub()
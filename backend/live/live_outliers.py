@@ -0,0 +1,131 @@
+import pandas as pd
+from backend.config import N_BARS
+from backend.dataset import Dataset, dataset_for_game
+from backend.advanced_stats import add_all_adv
+from backend.scoring import compute_score_matrix, compute_team_diff_scores, rank_scores
+from backend.compute_outliers import team_score_items, player_score_items, outlier_payload
+
+# live boxscore statistics key -> game log column
+LIVE_STATS = {
+    "fieldGoalsMade": "FGM", "fieldGoalsAttempted": "FGA", "fieldGoalsPercentage": "FG_PCT",
+    "threePointersMade": "FG3M", "threePointersAttempted": "FG3A", "threePointersPercentage": "FG3_PCT",
+    "freeThrowsMade": "FTM", "freeThrowsAttempted": "FTA", "freeThrowsPercentage": "FT_PCT",
+    "reboundsOffensive": "OREB", "reboundsDefensive": "DREB", "reboundsTotal": "REB",
+    "assists": "AST", "turnovers": "TOV", "steals": "STL", "blocks": "BLK",
+    "blocksReceived": "BLKA", "foulsPersonal": "PF", "foulsDrawn": "PFD", "points": "PTS",
+}
+# team lines count team turnovers too, like TOV in team_game_logs.csv
+TEAM_LIVE_STATS = {**LIVE_STATS, "turnoversTotal": "TOV"}
+TEAM_LIVE_STATS.pop("turnovers")
+
+LOG_COLUMNS = list(LIVE_STATS.values())
+
+
+def _stat_row(statistics: dict, mapping: dict) -> dict:
+    return {column: statistics.get(key) for key, column in mapping.items()}
+
+
+def boxscore_rows(box: dict):
+    """(team rows, player rows) shaped like the game logs from a live BoxScore dict."""
+    game = box["game"]
+    teams, players = [], []
+    for side in ("homeTeam", "awayTeam"):
+        team = game[side]
+        team_name = f"{team['teamCity']} {team['teamName']}"
+        teams.append({
+            "TEAM_NAME": team_name,
+            "TEAM_ABBREVIATION": team["teamTricode"],
+            **_stat_row(team["statistics"], TEAM_LIVE_STATS),
+        })
+        for player in team.get("players", []):
+            if player.get("played", "1") != "1":
+                continue
+            players.append({
+                "PLAYER_ID": player["personId"],
+                "PLAYER_NAME": player["name"],
+                "TEAM_NAME": team_name,
+                **_stat_row(player["statistics"], LIVE_STATS),
+            })
+    return pd.DataFrame(teams), pd.DataFrame(players, columns=["PLAYER_ID", "PLAYER_NAME", "TEAM_NAME"] + LOG_COLUMNS)
+
+
+class LiveGame:
+    """Outliers of one in-progress game, rescored from box score deltas.
+
+    update() diffs each team and player line against the previous snapshot
+    and runs the scoring only on lines that changed; unchanged lines keep
+    their score entries. Ranking the merged entries is cheap, so it is
+    redone whenever anything changed.
+    """
+
+    def __init__(self, game_id: str, data: Dataset = None):
+        self.game_id = game_id
+        self.data = data or dataset_for_game(game_id)
+        self.lines = {}     # ("team", name) / ("player", id) -> tuple of stat values last scored
+        self.entries = {}   # same keys -> {"<name> - <stat>": score info}
+        self.teams = pd.DataFrame()
+        self.status = None
+        self.version = 0
+        self.payload = None
+
+    def _changed(self, rows: pd.DataFrame, kind: str, key: str) -> pd.DataFrame:
+        changed = []
+        for i, (entity, line) in enumerate(zip(rows[key].tolist(), rows[LOG_COLUMNS].itertuples(index=False))):
+            if self.lines.get((kind, entity)) != tuple(line):
+                self.lines[(kind, entity)] = tuple(line)
+                changed.append(i)
+        return rows.iloc[changed].reset_index(drop=True)
+
+    def _rescore_teams(self, rows: pd.DataFrame):
+        avg_rows = self.data.team_avg.reindex(rows["TEAM_NAME"])
+        matrix = compute_score_matrix(rows, avg_rows)
+        for i, name in enumerate(rows["TEAM_NAME"].tolist()):
+            one = slice(i, i + 1)
+            self.entries[("team", name)] = team_score_items(rows.iloc[one], avg_rows.iloc[one], matrix.iloc[one])
+
+    def _rescore_players(self, rows: pd.DataFrame):
+        rows = add_all_adv(rows)
+        avg_rows = self.data.player_avg.reindex(rows["PLAYER_ID"])
+        matrix = compute_score_matrix(rows, avg_rows)
+        for i, player_id in enumerate(rows["PLAYER_ID"].tolist()):
+            one = slice(i, i + 1)
+            self.entries[("player", player_id)] = player_score_items(rows.iloc[one], avg_rows.iloc[one], matrix.iloc[one])
+
+    def update(self, box: dict) -> int:
+        """Apply a new box score snapshot; returns how many lines were rescored."""
+        game = box["game"]
+        team_rows, player_rows = boxscore_rows(box)
+        changed_teams = self._changed(team_rows, "team", "TEAM_NAME")
+        changed_players = self._changed(player_rows, "player", "PLAYER_ID")
+        status = (game.get("gameStatus"), game.get("period"), game.get("gameClock"))
+
+        rescored = len(changed_teams) + len(changed_players)
+        if not rescored and status == self.status:
+            return 0
+
+        if len(changed_teams):
+            self._rescore_teams(changed_teams)
+            self.teams = team_rows
+        if len(changed_players):
+            self._rescore_players(changed_players)
+        self.status = status
+
+        merged = {}
+        for key in sorted(self.entries, key=lambda k: k[0] != "team"):
+            merged.update(self.entries[key])
+        if len(self.teams) == 2:
+            merged.update(compute_team_diff_scores(self.teams.iloc[0], self.teams.iloc[1], self.data.league_diffs))
+        pos, neg = rank_scores(merged, N_BARS)
+
+        self.version += 1
+        self.payload = {
+            "game_id": self.game_id,
+            "version": self.version,
+            "status": game.get("gameStatus"),
+            "period": game.get("period"),
+            "clock": game.get("gameClock"),
+            "teams": self.teams["TEAM_ABBREVIATION"].tolist(),
+            "score": {row["TEAM_ABBREVIATION"]: row["PTS"] for row in self.teams.to_dict("records")},
+            "outliers": [outlier_payload(pos, neg)],
+        }
+        return rescored
@@ -0,0 +1,67 @@
+import math
+from backend.dataset import dataset_for_game
+from backend.live.live_outliers import LIVE_STATS, TEAM_LIVE_STATS
+
+MOCK_STEPS = 12  # snapshots per game, three per quarter
+
+PERCENTAGES = {"FG_PCT": ("FGM", "FGA"), "FG3_PCT": ("FG3M", "FG3A"), "FT_PCT": ("FTM", "FTA")}
+
+
+def _statistics(row: dict, mapping: dict, fraction: float) -> dict:
+    # counting stats scaled to how far into the game we are, percentages recomputed from them
+    line = {}
+    for column in set(mapping.values()):
+        if column not in PERCENTAGES:
+            value = row.get(column)
+            line[column] = 0 if value != value or value is None else math.floor(value * fraction)
+    for column, (made, attempted) in PERCENTAGES.items():
+        line[column] = round(line[made] / line[attempted], 3) if line[attempted] else 0.0
+    return {key: line[column] for key, column in mapping.items()}
+
+
+class MockBoxScore:
+    """Replays a finished game from the logs as a live BoxScore, a bit further on every call."""
+
+    progress = {}  # game_id -> snapshots served so far, shared like the real feed's clock
+
+    def __init__(self, game_id):
+        self.game_id = str(game_id).zfill(10)
+
+    def get_dict(self):
+        data = dataset_for_game(self.game_id)
+        step = min(MockBoxScore.progress.get(self.game_id, 0) + 1, MOCK_STEPS)
+        MockBoxScore.progress[self.game_id] = step
+        fraction = step / MOCK_STEPS
+
+        teams = data.teams_in_game(self.game_id).to_dict("records")
+        players = data.players_in_game(self.game_id).to_dict("records")
+        sides = {}
+        for side, team in zip(("homeTeam", "awayTeam"), teams):
+            city, _, name = team["TEAM_NAME"].rpartition(" ")
+            sides[side] = {
+                "teamId": team.get("TEAM_ID"),
+                "teamName": name,
+                "teamCity": city,
+                "teamTricode": team["TEAM_ABBREVIATION"],
+                "score": math.floor(team["PTS"] * fraction),
+                "statistics": _statistics(team, TEAM_LIVE_STATS, fraction),
+                "players": [
+                    {
+                        "personId": p["PLAYER_ID"],
+                        "name": p["PLAYER_NAME"],
+                        "played": "1",
+                        "statistics": _statistics(p, LIVE_STATS, fraction),
+                    }
+                    for p in players if p["TEAM_NAME"] == team["TEAM_NAME"]
+                ],
+            }
+
+        return {
+            "game": {
+                "gameId": self.game_id,
+                "gameStatus": 3 if step == MOCK_STEPS else 2,
+                "period": min(4, math.ceil(step * 4 / MOCK_STEPS)),
+                "gameClock": "PT00M00.00S" if step % 3 == 0 else "PT06M00.00S",
+                **sides,
+            }
+        }
@@ -0,0 +1,24 @@
+import threading
+from cachetools import LRUCache
+
+
+class LockedLRU:
+    """An LRUCache that request threads can share.
+
+    cachetools caches aren't thread-safe: even a get() moves the key in the
+    LRU order, so concurrent lookups can corrupt it. Every cache read by
+    more than one request goes through here, with a lock around each call.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._cache.get(key, default)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._cache[key] = value
@@ -0,0 +1,38 @@
+import json
+import logging
+import os
+import sys
+import time
+
+# One JSON object per log line: time, level, logger, event plus any fields passed
+# with extra={...}, e.g. log.info("saved outliers", extra={"game_id": game_id}).
+# LOG_LEVEL sets the level (default INFO).
+
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level=None):
+    # called by entry points (server, watcher); library modules only use getLogger
+    root = logging.getLogger()
+    root.setLevel(level or os.environ.get("LOG_LEVEL", "INFO").upper())
+    if any(isinstance(h.formatter, JsonFormatter) for h in root.handlers):
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter())
+    root.addHandler(handler)
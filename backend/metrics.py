@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# In-process counters and histograms rendered in the Prometheus text format on
+# /metrics. Each gunicorn worker keeps its own numbers; scrape every worker or
+# aggregate with sum() in the queries.
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_registry = []
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.label_names = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}  # label values -> [count per bucket..., +Inf count, sum]
+        self.lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        with self.lock:
+            series = self.series.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, series in sorted(self.series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = _labels(self.label_names, key, [f'le="{bound}"'])
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                inf = _labels(self.label_names, key, ['le="+Inf"'])
+                lines.append(f"{self.name}_bucket{inf} {series[-2]}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {series[-1]}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series[-2]}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("outlier_stage_seconds", "Time spent in each stage of building outliers.", ["stage"])
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Flask request latency.", ["route", "method"])
+REQUESTS = Counter("http_requests_total", "Flask responses by route and status.", ["route", "method", "status"])
+CACHE_LOOKUPS = Counter("outlier_cache_lookups_total", "Outlier results served per cache tier.", ["tier"])
+
+
+@contextmanager
+def timed(stage: str):
+    # records the wrapped block under outlier_stage_seconds{stage=...}
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,169 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from backend.config import DATA_DIR, STATS_TO_TRACK
+from backend.advanced_stats import add_all_adv
+
+# Count, mean and variance of every tracked stat per player and per team, for
+# the zscore scoring mode (scoring.zscore_matrix):
+#   python -m backend.moments
+# streams data/*_game_logs.csv in MOMENT_CHUNK_ROWS-row chunks, so the logs never
+# have to fit in memory, and writes data/player_moments.npz / team_moments.npz.
+
+MOMENT_CHUNK_ROWS = 100_000
+MOMENT_KEYS = {"player_game_logs": "PLAYER_ID", "team_game_logs": "TEAM_NAME"}
+MOMENT_FILES = {"player_game_logs": "player_moments.npz", "team_game_logs": "team_moments.npz"}
+# raw columns the derived stats (TS_PCT, AST/TOV) are computed from
+DERIVED_INPUTS = ["FGA", "FTA", "PTS", "AST", "TOV"]
+
+
+class MomentTable:
+    """Per-key count, mean and M2 (sum of squared deviations) of each stat.
+
+    Plain arrays of keys x stats. update() folds in a chunk of rows by
+    computing the chunk's per-key moments with bincount and merging them
+    with the running ones (Chan et al.'s pairwise form of Welford's
+    update), so a chunk costs a few array passes whatever its size.
+    NaN values are skipped per stat.
+    """
+
+    def __init__(self, stats=STATS_TO_TRACK):
+        self.stats = list(stats)
+        self.keys = []
+        self.positions = {}
+        self.count = np.zeros((0, len(self.stats)))
+        self.mean = np.zeros((0, len(self.stats)))
+        self.m2 = np.zeros((0, len(self.stats)))
+
+    def _rows_for(self, keys) -> np.ndarray:
+        new = [k for k in keys if k not in self.positions]
+        if new:
+            for k in new:
+                self.positions[k] = len(self.keys)
+                self.keys.append(k)
+            grow = np.zeros((len(new), len(self.stats)))
+            self.count = np.vstack([self.count, grow])
+            self.mean = np.vstack([self.mean, grow])
+            self.m2 = np.vstack([self.m2, grow])
+        return np.array([self.positions[k] for k in keys], dtype=np.int64)
+
+    def update(self, keys, values: np.ndarray):
+        # values: rows x stats, aligned with keys
+        codes, unique = pd.factorize(pd.Series(keys))
+        rows = self._rows_for(unique.tolist())
+        groups = len(unique)
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+
+        for j in range(len(self.stats)):
+            n_b = np.bincount(codes, weights=valid[:, j], minlength=groups)
+            seen = n_b > 0
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean_b = np.bincount(codes, weights=filled[:, j], minlength=groups) / n_b
+            deviation = np.where(valid[:, j], values[:, j] - mean_b[codes], 0.0)
+            m2_b = np.bincount(codes, weights=deviation ** 2, minlength=groups)
+
+            n_a, mean_a, m2_a = self.count[rows, j], self.mean[rows, j], self.m2[rows, j]
+            n = n_a + n_b
+            with np.errstate(invalid="ignore", divide="ignore"):
+                delta = mean_b - mean_a
+                self.mean[rows, j] = np.where(seen, mean_a + delta * n_b / n, mean_a)
+                self.m2[rows, j] = np.where(seen, m2_a + m2_b + delta ** 2 * n_a * n_b / n, m2_a)
+            self.count[rows, j] = n
+
+    def update_frame(self, chunk: pd.DataFrame, key: str):
+        chunk = add_all_adv(chunk.copy()) if set(DERIVED_INPUTS) <= set(chunk.columns) else chunk
+        values = np.column_stack([
+            pd.to_numeric(chunk[stat], errors="coerce").to_numpy(dtype=float) if stat in chunk.columns
+            else np.full(len(chunk), np.nan)
+            for stat in self.stats
+        ])
+        self.update(chunk[key].to_numpy(), values)
+
+    def variance(self, ddof: int = 1) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def frames(self, key: str):
+        # (means, sample standard deviations) as DataFrames indexed by key
+        index = pd.Index(self.keys, name=key)
+        means = pd.DataFrame(np.where(self.count > 0, self.mean, np.nan), index=index, columns=self.stats)
+        stds = pd.DataFrame(np.sqrt(self.variance()), index=index, columns=self.stats)
+        return means, stds
+
+    def save(self, path, source=None):
+        np.savez(path, keys=np.asarray(self.keys), stats=np.asarray(self.stats), count=self.count,
+                 mean=self.mean, m2=self.m2, source=np.asarray(source if source is not None else [-1, -1]))
+
+    @classmethod
+    def load(cls, path) -> "MomentTable":
+        with np.load(path) as f:
+            table = cls(f["stats"].tolist())
+            table.keys = f["keys"].tolist()
+            table.count, table.mean, table.m2 = f["count"], f["mean"], f["m2"]
+        table.positions = {k: i for i, k in enumerate(table.keys)}
+        return table
+
+
+def stream_moments(path, key: str, stats=STATS_TO_TRACK, chunksize=MOMENT_CHUNK_ROWS) -> MomentTable:
+    """MomentTable of a logs CSV, read chunk by chunk and only the columns needed."""
+    wanted = {key, *stats, *DERIVED_INPUTS}
+    table = MomentTable(stats)
+    for chunk in pd.read_csv(path, usecols=lambda c: c in wanted, chunksize=chunksize):
+        table.update_frame(chunk, key)
+    return table
+
+
+def frame_moments(logs: pd.DataFrame, key: str, stats=STATS_TO_TRACK, chunksize=MOMENT_CHUNK_ROWS) -> MomentTable:
+    # same as stream_moments for logs already in memory
+    table = MomentTable(stats)
+    for start in range(0, len(logs), chunksize):
+        table.update_frame(logs.iloc[start:start + chunksize], key)
+    return table
+
+
+def _csv_source(name: str, signature) -> list:
+    # [mtime_ns, size] of <name>.csv in a data_signature(), what a saved table was streamed from
+    for entry in signature:
+        if entry[0] == f"{name}.csv":
+            return [entry[1] if entry[1] is not None else -1, entry[2] if entry[2] is not None else -1]
+    return [-1, -1]
+
+
+def load_moments(name: str, logs: pd.DataFrame, data_dir=DATA_DIR, signature=()) -> MomentTable:
+    """Saved moments for a logs table if streamed from the current CSV, else computed from `logs`."""
+    path = data_dir / MOMENT_FILES[name]
+    if path.exists():
+        with np.load(path) as f:
+            source = f["source"].tolist()
+        if source == _csv_source(name, signature) and source != [-1, -1]:
+            return MomentTable.load(path)
+    return frame_moments(logs, MOMENT_KEYS[name])
+
+
+def write_moments(data_dir=DATA_DIR, chunksize=MOMENT_CHUNK_ROWS) -> dict:
+    """Streams both logs CSVs in data_dir and saves their moment tables; returns rows folded per table."""
+    from backend.dataset import data_signature  # imported here: dataset imports this module
+
+    signature = data_signature(data_dir)
+    folded = {}
+    for name, key in MOMENT_KEYS.items():
+        table = stream_moments(data_dir / f"{name}.csv", key, chunksize=chunksize)
+        table.save(data_dir / MOMENT_FILES[name], _csv_source(name, signature))
+        folded[name] = int(table.count.max(axis=1).sum()) if len(table.keys) else 0
+    return folded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the game logs into per-entity moment tables.")
+    parser.add_argument("--chunksize", type=int, default=MOMENT_CHUNK_ROWS)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    folded = write_moments(chunksize=args.chunksize)
+    print(f"✅ Saved moments for {folded['player_game_logs']} player rows and {folded['team_game_logs']} "
+          f"team rows in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import json
+import logging
+import os
+import time
+import threading
+from multiprocessing import Pool
+import pandas as pd
+from backend.config import OUTLIER_STORE
+from backend.dataset import Dataset, dataset_for_game, get_dataset
+from backend.compute_outliers import build_outliers
+
+log = logging.getLogger(__name__)
+
+STORE_COLUMNS = ["game_id", "game_date", "teams", "winner", "fingerprint", "result"]
+
+
+def select_game_ids(data: Dataset, date_from=None, date_to=None, team=None) -> list:
+    # GAME_IDs in team_game_logs, optionally limited to a team and an inclusive YYYY-MM-DD range
+    logs = data.team_games(team) if team else data.team_logs
+    dates = logs["GAME_DATE"].astype(str).str[:10]
+    keep = pd.Series(True, index=logs.index)
+    if date_from:
+        keep &= dates >= date_from
+    if date_to:
+        keep &= dates <= date_to
+    return sorted(logs.loc[keep, "GAME_ID"].unique())
+
+
+def _store_row(game_id: str, data: Dataset) -> dict:
+    game_out = build_outliers(game_id, data)
+    teams = data.teams_in_game(game_id)
+    return {
+        "game_id": game_id,
+        "game_date": str(teams["GAME_DATE"].iloc[0])[:10] if len(teams) else None,
+        "teams": ",".join(game_out["teams"]),
+        "winner": game_out.get("winner"),
+        "fingerprint": data.fingerprint,
+        "result": json.dumps(game_out),
+    }
+
+
+def _worker_init(season=None):
+    get_dataset(season)  # already loaded when forked from the parent, otherwise loads once per worker
+
+
+def _worker_rows(game_ids: list) -> list:
+    data = dataset_for_game(game_ids[0])  # chunks never span seasons
+    rows = []
+    for game_id in game_ids:
+        try:
+            rows.append(_store_row(game_id, data))
+        except Exception:
+            log.exception("failed to process game", extra={"game_id": game_id})
+    return rows
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def write_store(rows: list, path=OUTLIER_STORE):
+    # upsert rows by game_id and atomically replace the parquet file
+    new = pd.DataFrame(rows, columns=STORE_COLUMNS)
+    if os.path.exists(path):
+        old = pd.read_parquet(path, columns=STORE_COLUMNS)
+        new = pd.concat([old[~old["game_id"].isin(new["game_id"])], new], ignore_index=True)
+    new = new.sort_values("game_id", kind="stable").reset_index(drop=True)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    new.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return new
+
+
+def build_store(date_from=None, date_to=None, team=None, processes=None, path=OUTLIER_STORE, season=None) -> int:
+    data = get_dataset(season)
+    game_ids = select_game_ids(data, date_from, date_to, team)
+    if not game_ids:
+        print("No games matched.")
+        return 0
+
+    start = time.perf_counter()
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        rows = _worker_rows(game_ids)
+    else:
+        chunk_size = max(1, len(game_ids) // (processes * 4))
+        with Pool(processes, initializer=_worker_init, initargs=(season,)) as pool:
+            rows = [row for part in pool.imap(_worker_rows, _chunks(game_ids, chunk_size)) for row in part]
+
+    write_store(rows, path)
+    print(f"✅ Stored outliers for {len(rows)} games in {time.perf_counter() - start:.2f}s -> {path}")
+    return len(rows)
+
+
+_store = {}
+_store_signature = None
+_store_lock = threading.Lock()
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+
+def get_stored_result(game_id: str, fingerprint: str = None, path=OUTLIER_STORE):
+    """Stored result JSON text for game_id, or None if it isn't in the store.
+
+    With a fingerprint, rows built from other data or scoring rules count
+    as missing. The parquet file is read once and re-read only when it is
+    rewritten.
+    """
+    global _store, _store_signature
+    signature = (str(path), _file_signature(path))
+    if signature != _store_signature:
+        with _store_lock:
+            if signature != _store_signature:
+                if signature[1] is None:
+                    _store = {}
+                else:
+                    table = pd.read_parquet(path, columns=["game_id", "fingerprint", "result"])
+                    _store = dict(zip(table["game_id"], zip(table["fingerprint"], table["result"])))
+                _store_signature = signature
+
+    stored = _store.get(str(game_id))
+    if stored is None or (fingerprint is not None and stored[0] != fingerprint):
+        return None
+    return stored[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute outliers for every game into the parquet store.")
+    parser.add_argument("--from", dest="date_from", help="first game date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="last game date, YYYY-MM-DD")
+    parser.add_argument("--team", help="team abbreviation, e.g. BOS")
+    parser.add_argument("--processes", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--season", help="season partition, e.g. 2023-24 (default: the newest)")
+    args = parser.parse_args()
+    build_store(args.date_from, args.date_to, args.team, args.processes, season=args.season)
+
+
+if __name__ == "__main__":
+    main()
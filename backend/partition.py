@@ -0,0 +1,61 @@
+import argparse
+import os
+import pandas as pd
+from backend.config import DATA_DIR, SEASONS_DIR
+from backend.compute_averages import compute_team_averages, compute_player_averages, compute_league_differentials
+from backend.ingest import ingest_table
+from backend.moments import write_moments
+
+# Splits the flat game logs in DATA_DIR into one directory per SEASON_YEAR:
+#   python -m backend.partition
+# writes data/seasons/<season>/ with that season's logs, averages, league
+# differentials, their parquet copies and moment tables. Once partitions exist
+# the server loads seasons lazily, one Dataset per season (backend/dataset.py).
+
+
+def _write_csv(df: pd.DataFrame, path, index: bool):
+    tmp = f"{path}.tmp"
+    df.to_csv(tmp, index=index)
+    os.replace(tmp, path)
+
+
+def write_season(season: str, team_logs: pd.DataFrame, player_logs: pd.DataFrame, seasons_dir=SEASONS_DIR):
+    season_dir = seasons_dir / season
+    season_dir.mkdir(parents=True, exist_ok=True)
+    _write_csv(team_logs, season_dir / "team_game_logs.csv", False)
+    _write_csv(player_logs, season_dir / "player_game_logs.csv", False)
+    _write_csv(compute_team_averages(team_logs), season_dir / "team_averages.csv", True)
+    _write_csv(compute_player_averages(player_logs), season_dir / "player_averages.csv", True)
+    _write_csv(compute_league_differentials(team_logs), season_dir / "league_differentials.csv", False)
+    for name in ("team_game_logs", "player_game_logs", "team_averages", "player_averages", "league_differentials"):
+        ingest_table(name, season_dir)
+    write_moments(season_dir)
+    return season_dir
+
+
+def partition_seasons(data_dir=DATA_DIR, seasons_dir=SEASONS_DIR, seasons=None) -> list:
+    """Writes a partition per SEASON_YEAR in the flat logs (or only `seasons`); returns the seasons written."""
+    team_logs = pd.read_csv(data_dir / "team_game_logs.csv", dtype={"GAME_ID": str})
+    player_logs = pd.read_csv(data_dir / "player_game_logs.csv", dtype={"GAME_ID": str})
+    player_groups = dict(tuple(player_logs.groupby("SEASON_YEAR", sort=False)))
+
+    written = []
+    for season, team_rows in team_logs.groupby("SEASON_YEAR"):
+        if seasons and season not in seasons:
+            continue
+        player_rows = player_groups.get(season, player_logs.iloc[:0])
+        write_season(season, team_rows.reset_index(drop=True), player_rows.reset_index(drop=True), seasons_dir)
+        written.append(season)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split the flat game logs into per-season partitions.")
+    parser.add_argument("--seasons", nargs="+", help="only these seasons, e.g. 2024-25 (default: all)")
+    args = parser.parse_args()
+    for season in partition_seasons(seasons=args.seasons):
+        print(f"✅ Wrote {SEASONS_DIR / season}")
+
+
+if __name__ == "__main__":
+    main()
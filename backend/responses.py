@@ -0,0 +1,50 @@
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+from flask import Response, request
+from backend.locked_cache import LockedLRU
+
+GZIP_MIN_BYTES = 1024  # smaller bodies aren't worth compressing
+
+# etag -> (raw body, gzipped body)
+_bodies = LockedLRU(maxsize=512)
+
+
+def make_etag(*parts) -> str:
+    return hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+
+
+def conditional_json(etag: str, last_modified: float, build, headers=None) -> Response:
+    """JSON response that supports If-None-Match / If-Modified-Since and gzip.
+
+    `build` is only called when the client copy is stale and the body isn't
+    already cached under `etag`, so the etag must change whenever the
+    payload would.
+    """
+    modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+
+    if request.if_none_match.contains(etag) or (
+        not request.if_none_match and request.if_modified_since and request.if_modified_since >= modified
+    ):
+        response = Response(status=304)
+    else:
+        cached = _bodies.get(etag)
+        if cached is None:
+            raw = json.dumps(build()).encode()
+            cached = (raw, gzip.compress(raw) if len(raw) >= GZIP_MIN_BYTES else None)
+            _bodies[etag] = cached
+
+        raw, zipped = cached
+        if zipped is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+            response = Response(zipped, mimetype="application/json")
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = Response(raw, mimetype="application/json")
+
+    response.set_etag(etag)
+    response.last_modified = modified
+    response.headers["Vary"] = "Accept-Encoding"
+    for name, value in (headers or {}).items():
+        response.headers[name] = value
+    return response
@@ -0,0 +1,249 @@
+import argparse
+import os
+import pandas as pd
+from backend.config import DATA_DIR, STATS_TO_AVERAGE, TEAM_DIFF_STATS_TO_TRACK
+from backend.compute_averages import paired_game_diffs
+
+STATE_FILE = DATA_DIR / "running_averages.pkl"
+COUNT_SUFFIX = "__n"
+CSV_CHUNK_ROWS = 100_000  # log rows parsed at a time by update_averages
+FOLD_WINDOW_DAYS = 7      # how far behind the newest game date late rows are still folded
+
+
+def _normalize(rows: pd.DataFrame) -> pd.DataFrame:
+    rows = rows.copy()
+    rows["GAME_ID"] = rows["GAME_ID"].astype(str).str.zfill(10)
+    rows["GAME_DATE"] = pd.to_datetime(rows["GAME_DATE"])
+    return rows
+
+
+class FoldedRows:
+    """The (GAME_ID, key) pairs folded in the last FOLD_WINDOW_DAYS before the newest GAME_DATE.
+
+    A row is new unless its pair is in that set, so games that finish out
+    of GAME_ID order, or whose rows come in two batches, are still folded.
+    Dates that fall out of the window are pruned, so the state holds about
+    a week of games no matter how many have been folded. A row dated
+    before the window counts as already folded.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.newest = None
+        self.pairs = {}  # GAME_DATE -> {(GAME_ID, key)}
+
+    def new_rows(self, rows: pd.DataFrame) -> pd.DataFrame:
+        # `rows` as returned by _normalize()
+        if self.newest is None:
+            return rows
+        rows = rows[rows["GAME_DATE"] >= self.newest - pd.Timedelta(days=FOLD_WINDOW_DAYS)]
+        seen = pd.Series([(game_id, key) in self.pairs.get(date, ())
+                          for date, game_id, key in zip(rows["GAME_DATE"], rows["GAME_ID"], rows[self.key])],
+                         index=rows.index, dtype=bool)
+        return rows[~seen]
+
+    def add(self, rows: pd.DataFrame):
+        # call with the rows new_rows() returned once they are folded
+        if rows.empty:
+            return
+        for date, game_id, key in zip(rows["GAME_DATE"], rows["GAME_ID"], rows[self.key]):
+            self.pairs.setdefault(date, set()).add((game_id, key))
+        self.newest = max(self.pairs)
+        cutoff = self.newest - pd.Timedelta(days=FOLD_WINDOW_DAYS)
+        self.pairs = {date: pairs for date, pairs in self.pairs.items() if date >= cutoff}
+
+
+class RunningAverages:
+    """Per-entity running sums and non-null counts of STATS_TO_AVERAGE.
+
+    fold() adds only rows its FoldedRows hasn't seen, touching the new
+    rows plus the small per-key totals table, so finished games can be
+    folded in as they arrive. means() matches compute_averages.py's
+    groupby().mean().round(2); averages_before() gives strictly-prior-game
+    averages for any set of rows from cumulative per-date sums.
+    """
+
+    def __init__(self, key: str, stats=STATS_TO_AVERAGE, name_col=None):
+        self.key = key
+        self.stats = list(stats)
+        self.name_col = name_col
+        self.totals = pd.DataFrame()
+        self.names = {}
+        self.folded = FoldedRows(key)
+        self._daily_parts = []
+        self._cumulative = None
+
+    def fold(self, rows: pd.DataFrame) -> int:
+        rows = self.folded.new_rows(_normalize(rows))
+        if rows.empty:
+            return 0
+        self.folded.add(rows)
+
+        grouped = rows.groupby(self.key)[self.stats]
+        delta = pd.concat([grouped.sum(), grouped.count().add_suffix(COUNT_SUFFIX)], axis=1)
+        self.totals = delta if self.totals.empty else self.totals.add(delta, fill_value=0)
+
+        if self.name_col:
+            for key, name in rows.groupby(self.key)[self.name_col].first().items():
+                self.names.setdefault(key, name)
+
+        daily = rows.groupby([self.key, "GAME_DATE"])[self.stats]
+        self._daily_parts.append(pd.concat([daily.sum(), daily.count().add_suffix(COUNT_SUFFIX)], axis=1))
+        self._cumulative = None
+        return len(rows)
+
+    def _means(self, sums: pd.DataFrame) -> pd.DataFrame:
+        counts = sums[[s + COUNT_SUFFIX for s in self.stats]].to_numpy()
+        means = sums[self.stats] / counts
+        return means.where(counts > 0).round(2)
+
+    def means(self) -> pd.DataFrame:
+        averages = self._means(self.totals.sort_index())
+        averages.index.name = self.key
+        if self.name_col:
+            averages.insert(0, self.name_col, averages.index.map(self.names))
+        return averages
+
+    def _cumulative_table(self) -> pd.DataFrame:
+        # per key, sums/counts of all games up to and including each GAME_DATE
+        if self._cumulative is None:
+            daily = pd.concat(self._daily_parts).groupby(level=[0, 1]).sum().sort_index()
+            self._daily_parts = [daily]
+            cumulative = daily.groupby(level=0).cumsum().reset_index()
+            self._cumulative = cumulative.sort_values("GAME_DATE", kind="stable")
+        return self._cumulative
+
+    def averages_before(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """Averages from each row's key's games dated strictly before that row's GAME_DATE.
+
+        An as-of-date view over everything folded, so rows need not be games
+        of that key (see as_of()). For the key's own games it agrees with
+        baselines.prior_game_baselines(kind="prior") within a season: a team
+        or player plays at most once per date, so excluding the whole date
+        and breaking same-date ties by GAME_ID pick the same earlier games.
+        The prior baseline additionally restarts every SEASON_YEAR.
+        """
+        left = pd.DataFrame({
+            self.key: rows[self.key].to_numpy(),
+            "GAME_DATE": pd.to_datetime(rows["GAME_DATE"]).to_numpy(),
+            "_pos": range(len(rows)),
+        }).sort_values("GAME_DATE", kind="stable")
+
+        merged = pd.merge_asof(left, self._cumulative_table(), on="GAME_DATE", by=self.key,
+                               allow_exact_matches=False)
+        merged = merged.sort_values("_pos")
+        averages = self._means(merged.fillna({s + COUNT_SUFFIX: 0 for s in self.stats}))
+        averages.index = rows.index
+        return averages
+
+    def as_of(self, date) -> pd.DataFrame:
+        """means() as it would have been before `date` (games on that date excluded)."""
+        keys = self.totals.index
+        averages = self.averages_before(pd.DataFrame({self.key: keys, "GAME_DATE": date}))
+        averages.index = keys
+        return averages.dropna(how="all")
+
+
+class RunningDifferentials:
+    """Running league average of |team1 - team2| per TEAM_DIFF_STATS_TO_TRACK stat.
+
+    A game counts once both of its team rows have been folded; a lone row
+    waits in `pending` for its opponent. Rows are deduplicated with
+    FoldedRows, like RunningAverages.
+    """
+
+    def __init__(self, stats=TEAM_DIFF_STATS_TO_TRACK):
+        self.stats = list(stats)
+        self.sums = {stat: 0.0 for stat in self.stats}
+        self.counts = {stat: 0 for stat in self.stats}
+        self.pending = pd.DataFrame()
+        self.folded = FoldedRows("TEAM_NAME")
+
+    def fold(self, team_rows: pd.DataFrame) -> int:
+        new = self.folded.new_rows(_normalize(team_rows))
+        self.folded.add(new)
+        rows = pd.concat([self.pending, new]).drop_duplicates(subset=["GAME_ID", "TEAM_NAME"])
+
+        sizes = rows.groupby("GAME_ID")["GAME_ID"].transform("size")
+        self.pending = rows[sizes < 2]
+        ready = rows[sizes >= 2]
+
+        diffs = paired_game_diffs(ready, self.stats)
+        for stat in diffs.columns:
+            self.sums[stat] += diffs[stat].sum()
+            self.counts[stat] += int(diffs[stat].count())
+        return len(diffs)
+
+    def means(self) -> pd.DataFrame:
+        avg_diffs = {"STAT": [], "AVG_DIFF": []}
+        for stat in self.stats:
+            if self.counts[stat]:
+                avg_diffs["STAT"].append(stat)
+                avg_diffs["AVG_DIFF"].append(round(self.sums[stat] / self.counts[stat], 4))
+        return pd.DataFrame(avg_diffs)
+
+
+class AveragesEngine:
+    """Team, player and differential running averages folded from the game logs together."""
+
+    def __init__(self):
+        self.teams = RunningAverages("TEAM_NAME")
+        self.players = RunningAverages("PLAYER_ID", name_col="PLAYER_NAME")
+        self.diffs = RunningDifferentials()
+
+    def fold(self, team_rows: pd.DataFrame = None, player_rows: pd.DataFrame = None) -> int:
+        folded = 0
+        if team_rows is not None and not team_rows.empty:
+            folded += self.teams.fold(team_rows)
+            self.diffs.fold(team_rows)
+        if player_rows is not None and not player_rows.empty:
+            folded += self.players.fold(player_rows)
+        return folded
+
+    def write_csvs(self, data_dir=DATA_DIR):
+        self.teams.means().to_csv(data_dir / "team_averages.csv", index=True)
+        self.players.means().to_csv(data_dir / "player_averages.csv", index=True)
+        self.diffs.means().to_csv(data_dir / "league_differentials.csv", index=False)
+
+    def save(self, path=STATE_FILE):
+        tmp = f"{path}.tmp"
+        pd.to_pickle(self, tmp)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path=STATE_FILE) -> "AveragesEngine":
+        if os.path.exists(path):
+            return pd.read_pickle(path)
+        return AveragesEngine()
+
+
+def unfolded_rows(path, folded: FoldedRows, chunksize=CSV_CHUNK_ROWS) -> pd.DataFrame:
+    # rows of a logs CSV not folded yet, parsed a chunk at a time so only those are kept in memory
+    chunks = [folded.new_rows(_normalize(chunk)) for chunk in pd.read_csv(path, chunksize=chunksize)]
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def update_averages(state_path=STATE_FILE, data_dir=DATA_DIR) -> int:
+    """Fold any new rows of the game log CSVs into the saved state and rewrite the averages CSVs."""
+    engine = AveragesEngine.load(state_path)
+    team_rows = unfolded_rows(data_dir / "team_game_logs.csv", engine.teams.folded)
+    player_rows = unfolded_rows(data_dir / "player_game_logs.csv", engine.players.folded)
+    folded = engine.fold(team_rows, player_rows)
+    if folded:
+        engine.write_csvs(data_dir)
+    engine.save(state_path)
+    return folded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally update season averages from the game logs.")
+    parser.add_argument("--rebuild", action="store_true", help="discard saved running sums and start over")
+    args = parser.parse_args()
+    if args.rebuild and os.path.exists(STATE_FILE):
+        os.remove(STATE_FILE)
+    folded = update_averages()
+    print(f"✅ Folded {folded} new rows into season averages")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pandas as pd
+import numpy as np
 import math
-from backend.config import STAT_RULES, STATS_TO_TRACK
+from backend.config import STAT_RULES, STATS_TO_TRACK, ZSCORE_THRESHOLD
 
 def percent_diff(actual, avg, stat_name, entity_type="player"):
 
@@ -49,11 +50,138 @@ def compute_scores(row: pd.Series, avg_row: pd.Series) -> dict:
         scores[stat] = adjusted_weight * diff_score
     return scores
 
-def compute_team_diff_scores(team1: pd.Series, team2: pd.Series, league_diffs: pd.DataFrame) -> dict:
+def _stat_values(df: pd.DataFrame, stat: str, default=np.nan) -> np.ndarray:
+    # mirrors row.get(stat, default): a missing column behaves like the default
+    if stat not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    col = df[stat]
+    if not pd.api.types.is_numeric_dtype(col):
+        col = pd.to_numeric(col, errors="coerce")
+    return col.to_numpy(dtype=float)
+
+class ScoreComponents:
+    """Everything compute_scores derives from a row before STAT_RULES is consulted.
+
+    2D arrays of rows x STATS_TO_TRACK: `keep` is the fixed sample-size
+    gate (minimum FGA/FG3A, tiny values), `abs_diff` |actual - avg|,
+    `ratio` (actual - avg) / avg (NaN where avg is 0) and `scale`
+    sqrt(avg + 1). apply_rules() turns them into scores for any rules set.
+    """
+
+    def __init__(self, keep, abs_diff, ratio, scale, index):
+        self.keep = keep
+        self.abs_diff = abs_diff
+        self.ratio = ratio
+        self.scale = scale
+        self.index = index
+
+    def take(self, rows) -> "ScoreComponents":
+        return ScoreComponents(self.keep[rows], self.abs_diff[rows], self.ratio[rows], self.scale[rows], self.index[rows])
+
+
+def score_components(rows: pd.DataFrame, avg_rows: pd.DataFrame) -> ScoreComponents:
+    # `avg_rows` must be aligned with `rows` position-for-position
+    fga = _stat_values(rows, "FGA", default=0)
+    fg3a = _stat_values(rows, "FG3A", default=0)
+    shape = (len(rows), len(STATS_TO_TRACK))
+    keep = np.zeros(shape, dtype=bool)
+    abs_diff, ratio, scale = np.empty(shape), np.empty(shape), np.empty(shape)
+
+    for j, stat in enumerate(STATS_TO_TRACK):
+        x = _stat_values(rows, stat)
+        mu = _stat_values(avg_rows, stat)
+        kept = ~np.isnan(x) & ~np.isnan(mu)
+
+        if stat == "FG3_PCT":
+            kept &= ~(fg3a < 5)
+
+        if stat in ["TS_PCT","FG3_PCT"]:
+            kept &= ~(fga < 5)                  #minimum 5 FGA
+        else:
+            kept &= ~((np.abs(x) < 3) | (mu < 1))
+
+        keep[:, j] = kept
+        abs_diff[:, j] = np.abs(x - mu)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio[:, j] = np.where(mu != 0, (x - mu) / mu, np.nan)
+            scale[:, j] = np.sqrt(mu + 1)
+
+    return ScoreComponents(keep, abs_diff, ratio, scale, rows.index)
+
+
+def apply_rules(components: ScoreComponents, rules=STAT_RULES, entity_type="player") -> pd.DataFrame:
+    """Scores from cached components under `rules`, same layout as compute_score_matrix.
+
+    Only thresholds, minimum differences and weights are applied here, so
+    trying another rules set is a handful of array operations.
+    """
+    listed = np.array([stat in rules for stat in STATS_TO_TRACK])
+    threshold = np.array([rules.get(stat, {}).get(f"{entity_type}_threshold", 0.2) for stat in STATS_TO_TRACK])
+    min_diff = np.array([rules.get(stat, {}).get("min_diff", 1) for stat in STATS_TO_TRACK])
+    base_weight = np.array([rules.get(stat, {}).get("weight", 1.0) for stat in STATS_TO_TRACK])
+
+    ratio = components.ratio
+    with np.errstate(invalid="ignore"):
+        passed = listed & ~np.isnan(ratio) & ~(components.abs_diff < min_diff) & ~(np.abs(ratio) < threshold)
+        score = np.where(passed, np.clip(ratio, -10, 10), 0.0)
+        scores = np.where(components.keep, base_weight * components.scale * score, np.nan)
+
+    return pd.DataFrame(scores, index=components.index, columns=STATS_TO_TRACK)
+
+
+def compute_score_matrix(rows: pd.DataFrame, avg_rows: pd.DataFrame, entity_type="player") -> pd.DataFrame:
+    """Vectorized compute_scores for every row of `rows` at once.
+
+    `avg_rows` must be aligned with `rows` position-for-position (e.g.
+    player_avg.loc[rows["PLAYER_ID"]]). Returns one column per stat in
+    STATS_TO_TRACK, indexed like `rows`, with NaN wherever compute_scores
+    would have left the stat out of its dict. A whole season can be scored
+    in one call, e.g. with player_avg.reindex(player_logs["PLAYER_ID"]).
+    """
+    return apply_rules(score_components(rows, avg_rows), STAT_RULES, entity_type)
+
+def zscore_matrix(rows: pd.DataFrame, means: pd.DataFrame, stds: pd.DataFrame, rules=STAT_RULES) -> pd.DataFrame:
+    """Scores in units of the entity's own spread instead of percent of its average.
+
+    `means`/`stds` are per-entity moments (backend/moments.py) aligned with
+    `rows` position-for-position. A stat counts once |x - mean| / std
+    reaches ZSCORE_THRESHOLD (or the stat's "z_threshold"), so no
+    per-stat percent thresholds or minimum differences are needed; the
+    sample-size gate and weights are the same as compute_score_matrix.
+    """
+    keep = score_components(rows, means).keep
+    listed = np.array([stat in rules for stat in STATS_TO_TRACK])
+    threshold = np.array([rules.get(stat, {}).get("z_threshold", ZSCORE_THRESHOLD) for stat in STATS_TO_TRACK])
+    base_weight = np.array([rules.get(stat, {}).get("weight", 1.0) for stat in STATS_TO_TRACK])
+
+    x = np.column_stack([_stat_values(rows, stat) for stat in STATS_TO_TRACK])
+    mu = np.column_stack([_stat_values(means, stat) for stat in STATS_TO_TRACK])
+    sd = np.column_stack([_stat_values(stds, stat) for stat in STATS_TO_TRACK])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(sd > 0, (x - mu) / sd, np.nan)
+        passed = listed & ~np.isnan(z) & ~(np.abs(z) < threshold)
+        score = np.where(passed, np.clip(z, -10, 10), 0.0)
+    scores = np.where(keep, base_weight * score, np.nan)
+
+    return pd.DataFrame(scores, index=rows.index, columns=STATS_TO_TRACK)
+
+def scored_entries(rows: pd.DataFrame, avg_rows: pd.DataFrame, matrix: pd.DataFrame):
+    # (row position, stat, score, actual, avg) for every stat compute_scores would keep,
+    # in row-then-STATS_TO_TRACK order; values come back as plain Python scalars
+    values = matrix.to_numpy()
+    actual = {stat: rows[stat].tolist() for stat in matrix.columns if stat in rows.columns}
+    avg = {stat: avg_rows[stat].tolist() for stat in matrix.columns if stat in avg_rows.columns}
+
+    for i, j in zip(*np.nonzero(~np.isnan(values))):
+        stat = matrix.columns[j]
+        yield int(i), stat, float(values[i, j]), actual[stat][i], avg[stat][i]
+
+def compute_team_diff_scores(team1: pd.Series, team2: pd.Series, league_diffs: pd.DataFrame,
+                             stat_rules=STAT_RULES) -> dict:
     diff_scores = {}
 
-    for stat in STAT_RULES:
-        rules = STAT_RULES[stat]
+    for stat in stat_rules:
+        rules = stat_rules[stat]
         if "team_diff_threshold" not in rules:
             continue
 
@@ -88,6 +216,24 @@ def compute_team_diff_scores(team1: pd.Series, team2: pd.Series, league_diffs: p
 
     return diff_scores
 
+def team_diff_score_matrix(first: pd.DataFrame, second: pd.DataFrame, league_diffs: pd.DataFrame,
+                           stat_rules=STAT_RULES) -> pd.DataFrame:
+    """compute_team_diff_scores for many games at once: row i pairs first.iloc[i] with second.iloc[i].
+
+    One column per stat with a team_diff rule; stats under their threshold
+    (or with a missing value) score 0 instead of being left out.
+    """
+    stats = [stat for stat in stat_rules if "team_diff_threshold" in stat_rules[stat]]
+    scores = {}
+    for stat in stats:
+        rules = stat_rules[stat]
+        actual_diff = np.abs(first[stat].to_numpy(float) - second[stat].to_numpy(float))
+        diff_from_avg = actual_diff - league_diffs.at[stat, "AVG_DIFF"]
+        with np.errstate(invalid="ignore"):
+            kept = np.abs(diff_from_avg) >= rules["team_diff_threshold"]
+        scores[stat] = np.where(kept, np.round(diff_from_avg * rules["team_diff_weight"], 3), 0.0)
+    return pd.DataFrame(scores, columns=stats)
+
 def rank_scores(scores: dict, n: int):
     sorted_items=sorted(scores.items(), key=lambda x: x[1]["score"])
     neg = sorted_items[:n]
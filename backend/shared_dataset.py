@@ -0,0 +1,206 @@
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from backend.config import DATA_DIR, SHARED_DIR
+from backend.dataset import Dataset, build_key_index, generation_signature
+
+# A generation is a directory of .npy files plus manifest.json. Numeric columns are
+# stored as one 2D array per dtype and text columns as categorical codes, so every
+# gunicorn worker np.load()s them with mmap_mode="r" and shares the page cache
+# instead of holding its own copy. `python -m backend.shared_dataset` publishes a
+# new generation and swaps the CURRENT pointer atomically; workers started with
+# USE_SHARED_DATASET=1 pick it up on their next reload check.
+
+KEEP_GENERATIONS = 3
+
+
+def _write_table(gen_dir, name: str, df: pd.DataFrame) -> dict:
+    spec = {"rows": len(df), "columns": list(df.columns), "blocks": [], "text": []}
+
+    numeric = [c for c in df.columns if df[c].dtype.kind in "iufb"]
+    for dtype in sorted({df[c].dtype.str for c in numeric}):
+        columns = [c for c in numeric if df[c].dtype.str == dtype]
+        file = f"{name}.{len(spec['blocks'])}.npy"
+        np.save(gen_dir / file, np.ascontiguousarray(df[columns].to_numpy(dtype=dtype)))
+        spec["blocks"].append({"file": file, "columns": columns})
+
+    for column in df.columns:
+        if column in numeric:
+            continue
+        values = pd.Categorical(df[column])
+        file = f"{name}.{len(spec['blocks']) + len(spec['text'])}.codes.npy"
+        np.save(gen_dir / file, values.codes)
+        spec["text"].append({
+            "file": file,
+            "column": column,
+            "categorical": isinstance(df[column].dtype, pd.CategoricalDtype),
+            "categories": [str(c) for c in values.categories],
+        })
+    return spec
+
+
+def publish_generation(data: Dataset = None, shared_dir=SHARED_DIR) -> str:
+    data = data or Dataset()
+    generation = f"{time.strftime('%Y%m%dT%H%M%S')}-{data.fingerprint}"
+    gen_dir = shared_dir / generation
+    gen_dir.mkdir(parents=True, exist_ok=True)
+
+    tables = {
+        "team_logs": data.team_logs,
+        "player_logs": data.player_logs,
+        "team_avg": data.team_avg.reset_index(),
+        "player_avg": data.player_avg.reset_index(),
+        "league_diffs": data.league_diffs.reset_index(),
+        "team_score_matrix": data.team_score_matrix,
+        "player_score_matrix": data.player_score_matrix,
+    }
+    manifest = {
+        "fingerprint": data.fingerprint,
+        "signature": data.signature,
+        "last_modified": data.last_modified,
+        "tables": {name: _write_table(gen_dir, name, df) for name, df in tables.items()},
+    }
+
+    np.save(gen_dir / "team_file_order.npy", data.team_file_order)
+    game_ids = list(data.player_game_index)
+    bounds = np.array([(rows.start, rows.stop) for rows in data.player_game_index.values()], dtype=np.int64)
+    np.save(gen_dir / "player_game_bounds.npy", bounds.reshape(-1, 2))
+    manifest["player_game_ids"] = game_ids
+
+    with open(gen_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f)
+
+    pointer = shared_dir / "CURRENT"
+    tmp = f"{pointer}.tmp"
+    with open(tmp, "w") as f:
+        f.write(generation)
+    os.replace(tmp, pointer)  # the generation swap: readers see the old or the new name, never half
+
+    _prune(shared_dir, keep=generation)
+    return generation
+
+
+def _prune(shared_dir, keep: str):
+    # old generations stay usable by workers that still map them until they unmap (POSIX)
+    generations = sorted(p for p in shared_dir.iterdir() if p.is_dir())
+    for path in generations[:-KEEP_GENERATIONS]:
+        if path.name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class SharedTable:
+    """Read-only view of one table of a generation, backed by memory-mapped arrays."""
+
+    def __init__(self, gen_dir, spec: dict):
+        self.spec = spec
+        self.blocks = [(np.load(gen_dir / b["file"], mmap_mode="r"), b["columns"]) for b in spec["blocks"]]
+        self.text = [(np.load(gen_dir / t["file"], mmap_mode="r"), t) for t in spec["text"]]
+
+    def frame(self, rows=slice(None)) -> pd.DataFrame:
+        # copies only the requested rows into an ordinary DataFrame
+        parts = {}
+        for array, columns in self.blocks:
+            block = array[rows]
+            for j, column in enumerate(columns):
+                parts[column] = block[:, j]
+        for codes, t in self.text:
+            values = pd.Categorical.from_codes(codes[rows], categories=t["categories"])
+            parts[t["column"]] = values if t["categorical"] else np.asarray(values, dtype=object)
+        index = pd.RangeIndex(self.spec["rows"])[rows]
+        return pd.DataFrame(parts, columns=self.spec["columns"], index=index)
+
+    def view(self) -> pd.DataFrame:
+        # every row without copying: numeric columns are views of the mapped blocks and
+        # text columns categoricals over the mapped codes (frame() makes them object)
+        parts = {}
+        for array, columns in self.blocks:
+            for j, column in enumerate(columns):
+                parts[column] = array[:, j]
+        for codes, t in self.text:
+            parts[t["column"]] = pd.Categorical.from_codes(codes, categories=t["categories"], validate=False)
+        return pd.DataFrame(parts, columns=self.spec["columns"], copy=False)
+
+    def column(self, name: str) -> np.ndarray:
+        # one numeric column as a strided view of its mapped block
+        for array, columns in self.blocks:
+            if name in columns:
+                return array[:, columns.index(name)]
+        raise KeyError(name)
+
+    def matrix(self) -> pd.DataFrame:
+        # single-dtype tables (score matrices) wrap the mapped array without copying
+        array, columns = self.blocks[0]
+        return pd.DataFrame(array, columns=columns, copy=False)
+
+
+class SharedDataset(Dataset):
+    """Dataset attached to a published generation instead of built from DATA_DIR.
+
+    Player logs and both score matrices stay memory-mapped; only the small
+    team/averages tables and the indexes are materialized per worker.
+    """
+
+    def __init__(self, generation: str, shared_dir=SHARED_DIR):
+        gen_dir = shared_dir / generation
+        with open(gen_dir / "manifest.json") as f:
+            manifest = json.load(f)
+        tables = {name: SharedTable(gen_dir, spec) for name, spec in manifest["tables"].items()}
+
+        self.generation = generation
+        self.source_signature = generation
+        self.data_dir = DATA_DIR  # generations are published from it; moments are read from there
+        self.signature = manifest["signature"]
+        self.fingerprint = manifest["fingerprint"]
+        self.last_modified = manifest["last_modified"]
+        self.loaded_at = time.time()
+
+        self.team_logs = tables["team_logs"].frame()
+        self.team_avg = tables["team_avg"].frame().set_index("TEAM_NAME")
+        self.player_avg = tables["player_avg"].frame().set_index("PLAYER_ID")
+        self.league_diffs = tables["league_diffs"].frame().set_index("STAT")
+        self.team_score_matrix = tables["team_score_matrix"].matrix()
+        self.player_score_matrix = tables["player_score_matrix"].matrix()
+        self._player_logs = tables["player_logs"]
+        self._derived = {}
+
+        self.team_file_order = np.load(gen_dir / "team_file_order.npy")
+        bounds = np.load(gen_dir / "player_game_bounds.npy")
+        self.player_game_index = {
+            game_id: slice(int(start), int(stop))
+            for game_id, (start, stop) in zip(manifest["player_game_ids"], bounds)
+        }
+        self.player_index = build_key_index(self._player_logs.column("PLAYER_ID"))
+        self._index_team_logs()
+
+    @property
+    def player_logs(self) -> pd.DataFrame:
+        # season-wide scoring (baselines, components, moments) reads whole columns of
+        # the mapped table; the serving path only ever needs players_in_game
+        return self._player_logs.view()
+
+    def players_in_game(self, game_id) -> pd.DataFrame:
+        rows = self.player_game_index.get(str(game_id), slice(0, 0))
+        return self._player_logs.frame(rows)
+
+    def player_rows(self, positions) -> pd.DataFrame:
+        return self._player_logs.frame(positions)
+
+
+def attach_current_generation(shared_dir=SHARED_DIR) -> SharedDataset:
+    generation = generation_signature(shared_dir)
+    if generation is None:
+        raise FileNotFoundError(f"No shared dataset published in {shared_dir}; run python -m backend.shared_dataset")
+    return SharedDataset(generation, shared_dir)
+
+
+def main():
+    start = time.perf_counter()
+    generation = publish_generation()
+    print(f"✅ Published shared dataset generation {generation} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import numpy as np
+from backend.config import MAX_LOADED_SEASONS
+from backend.dataset import Dataset
+from backend.locked_cache import LockedLRU
+from backend.scoring import team_diff_score_matrix
+
+# "Which other games looked like this one?" Every game becomes one vector:
+# the winner's team scores, the loser's team scores and the team-vs-team
+# differential scores (the team parts of compute_outliers, 0 where a stat
+# wasn't an outlier). Games are compared by cosine similarity.
+
+SEARCH_BLOCK_ROWS = 65536  # index rows multiplied against the query at a time
+
+# Dataset fingerprint -> SimilarityIndex
+_indexes = LockedLRU(maxsize=MAX_LOADED_SEASONS)
+# data_dir -> index of its newest Dataset, which the next generation's index starts from
+_latest = LockedLRU(maxsize=MAX_LOADED_SEASONS + 1)
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def top_k_cosine(unit: np.ndarray, query: np.ndarray, k: int, exclude=None, block=SEARCH_BLOCK_ROWS):
+    """(positions, similarities) of the k rows of `unit` closest to `query`, best first.
+
+    Rows are scored a block at a time and only each block's top k are kept,
+    so memory stays bounded however many seasons are indexed.
+    """
+    best_pos = np.empty(0, dtype=np.int64)
+    best_sim = np.empty(0, dtype=unit.dtype)
+    for start in range(0, len(unit), block):
+        sims = unit[start:start + block] @ query
+        if exclude is not None and start <= exclude < start + len(sims):
+            sims[exclude - start] = -np.inf
+        take = min(k, len(sims))
+        part = np.argpartition(-sims, take - 1)[:take]
+        best_pos = np.concatenate([best_pos, part + start])
+        best_sim = np.concatenate([best_sim, sims[part]])
+        if len(best_pos) > k:
+            keep = np.argpartition(-best_sim, k - 1)[:k]
+            best_pos, best_sim = best_pos[keep], best_sim[keep]
+
+    valid = np.isfinite(best_sim)
+    best_pos, best_sim = best_pos[valid], best_sim[valid]
+    order = np.lexsort((best_pos, -best_sim))  # ties: earlier games first
+    return best_pos[order], best_sim[order]
+
+
+class SimilarityIndex:
+    """Unit-normalized game vectors keyed by GAME_ID.
+
+    update() upserts games: known ones are overwritten in place, new ones
+    appended to a buffer that doubles when full, so adding a night's games
+    only normalizes those rows.
+    """
+
+    def __init__(self, dims: int):
+        self.unit = np.zeros((0, dims), dtype=np.float32)
+        self.size = 0
+        self.game_ids = []
+        self.positions = {}
+
+    def update(self, game_ids, vectors: np.ndarray):
+        unit = _unit_rows(np.asarray(vectors, dtype=np.float32))
+        positions = np.array([self.positions.get(g, -1) for g in game_ids], dtype=np.int64)
+        new = np.flatnonzero(positions < 0)
+        if len(new):
+            needed = self.size + len(new)
+            if needed > len(self.unit):
+                grown = np.zeros((max(64, needed, 2 * len(self.unit)), self.unit.shape[1]), dtype=np.float32)
+                grown[:self.size] = self.unit[:self.size]
+                self.unit = grown
+            positions[new] = np.arange(self.size, needed)
+            for i in new.tolist():
+                self.positions[game_ids[i]] = self.size
+                self.game_ids.append(game_ids[i])
+                self.size += 1
+        self.unit[positions] = unit
+
+    def copy(self) -> "SimilarityIndex":
+        index = SimilarityIndex(self.unit.shape[1])
+        index.unit = self.unit[:self.size].copy()
+        index.size = self.size
+        index.game_ids = list(self.game_ids)
+        index.positions = dict(self.positions)
+        return index
+
+    def stale(self, game_ids, vectors: np.ndarray) -> np.ndarray:
+        # mask of the games that are new or whose vector changed since they were indexed
+        unit = _unit_rows(np.asarray(vectors, dtype=np.float32))
+        positions = np.array([self.positions.get(g, -1) for g in game_ids], dtype=np.int64)
+        known = positions >= 0
+        mask = ~known
+        mask[known] = np.any(self.unit[positions[known]] != unit[known], axis=1)
+        return mask
+
+    def query(self, game_id: str, k: int) -> list:
+        # [(game_id, cosine similarity)], best first, without game_id itself
+        pos = self.positions[game_id]
+        positions, sims = top_k_cosine(self.unit[:self.size], self.unit[pos], k, exclude=pos)
+        return [(self.game_ids[p], float(s)) for p, s in zip(positions, sims)]
+
+
+def game_vectors(data: Dataset):
+    """(game_ids, vectors) for every game with both team rows, built with array operations."""
+    logs = data.team_logs
+    game_ids, starts, counts = np.unique(logs["GAME_ID"].to_numpy(), return_index=True, return_counts=True)
+    paired = counts == 2
+    game_ids, first = game_ids[paired], starts[paired]
+    second = first + 1
+
+    # winner first, so a blowout win lines up with other blowout wins
+    pts = logs["PTS"].to_numpy()
+    swap = pts[second] > pts[first]
+    win, lose = np.where(swap, second, first), np.where(swap, first, second)
+
+    scores = np.nan_to_num(data.team_score_matrix.to_numpy(dtype=np.float64))
+    diffs = team_diff_score_matrix(logs.iloc[win], logs.iloc[lose], data.league_diffs).to_numpy()
+    return game_ids.astype(str).tolist(), np.hstack([scores[win], scores[lose], diffs])
+
+
+def similarity_index(data: Dataset) -> SimilarityIndex:
+    """The index for a Dataset generation, built on first use and shared by every request.
+
+    A new generation of the same data_dir starts from a copy of the previous
+    generation's index and only upserts the games that are new or changed;
+    it's rebuilt from scratch when games have disappeared.
+    """
+    source = str(data.data_dir)
+    index = _indexes.get(data.fingerprint)
+    previous = _latest.get(source)
+    if index is None:
+        game_ids, vectors = game_vectors(data)
+        if previous is not None and previous.positions.keys() <= set(game_ids):
+            index = previous.copy()
+            stale = index.stale(game_ids, vectors)
+            index.update([game_ids[i] for i in np.flatnonzero(stale)], vectors[stale])
+        else:
+            index = SimilarityIndex(vectors.shape[1])
+            index.update(game_ids, vectors)
+        _indexes[data.fingerprint] = index
+        _latest[source] = index
+    return index
+
+
+def describe_game(game_id: str, data: Dataset) -> dict:
+    # date, teams (winner first) and final score, like the /api/outliers header
+    teams = data.teams_in_game(game_id).sort_values("PTS", ascending=False, kind="stable")
+    abbrs = teams["TEAM_ABBREVIATION"].tolist()
+    return {
+        "game_id": game_id,
+        "date": str(teams["GAME_DATE"].iloc[0])[:10],
+        "teams": abbrs,
+        "final_score": dict(zip(abbrs, (int(p) for p in teams["PTS"]))),
+    }
+
+
+def similar_games(game_id: str, data: Dataset, k: int) -> dict:
+    game_id = str(game_id).zfill(10)
+    matches = similarity_index(data).query(game_id, k)
+    return {
+        **describe_game(game_id, data),
+        "similar": [{**describe_game(g, data), "similarity": round(s, 4)} for g, s in matches],
+    }
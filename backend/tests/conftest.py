@@ -0,0 +1,18 @@
+import pytest
+import backend.cache as cache
+import backend.compute_outliers as compute_outliers
+import backend.dataset as dataset
+from backend.locked_cache import LockedLRU
+from backend.benchmarks.synthetic import write_data_dir
+
+@pytest.fixture
+def synthetic_data(tmp_path, monkeypatch):
+    """get_dataset()/dataset_for_game() serve a one-season synthetic DATA_DIR; results are written under tmp_path."""
+    data_dir = write_data_dir(tmp_path, seasons=1)
+    slot = dataset.DatasetSlot(lambda: dataset.Dataset(data_dir), lambda: dataset.data_signature(data_dir), str(data_dir))
+    monkeypatch.setattr(dataset, "_default", slot)
+    monkeypatch.setattr(dataset, "available_seasons", lambda: [])
+    monkeypatch.setattr(compute_outliers, "OUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(cache, "OUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(cache, "_hot", LockedLRU(maxsize=cache._hot.maxsize))
+    return slot.get()
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+from backend.advanced_stats import add_all_adv
+
+def test_vectorized_adv_matches_row_formulas():
+    rng = np.random.default_rng(3)
+    n = 2000
+    df = pd.DataFrame({
+        "PLAYER_NAME": ["x"] * n,
+        "PTS": rng.integers(0, 60, n),
+        "FGA": rng.integers(0, 30, n),
+        "FTA": rng.integers(0, 20, n),
+        "AST": rng.integers(0, 15, n),
+        "TOV": rng.integers(0, 6, n),
+    })
+    df = add_all_adv(df)
+
+    for row in df.to_dict("records"):
+        shots = row["FGA"] + 0.44 * row["FTA"]
+        ts = round(row["PTS"] / (2 * shots), 2) if shots > 0 else 0
+        ast_tov = row["AST"] / row["TOV"] if row["TOV"] > 0 else 0
+        assert row["TS_PCT"] == ts, f"TS_PCT mismatch for {row}"
+        assert row["AST/TOV"] == ast_tov, f"AST/TOV mismatch for {row}"
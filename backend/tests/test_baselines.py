@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from backend.baselines import prior_game_baselines
+from backend.running_averages import RunningAverages
+
+def _logs():
+    # rows deliberately out of date order and interleaved between two players
+    return pd.DataFrame({
+        "PLAYER_ID": [1, 2, 1, 1, 2, 1],
+        "GAME_ID": [3, 1, 1, 2, 2, 4],
+        "GAME_DATE": ["2025-01-03", "2025-01-01", "2025-01-01", "2025-01-02", "2025-01-02", "2025-01-04"],
+        "PTS": [30, 5, 10, 20, 15, 40],
+        "AST": [1, 2, np.nan, 3, 4, 5],
+    })
+
+def test_prior_uses_only_earlier_games():
+    prior = prior_game_baselines(_logs(), "PLAYER_ID", "prior", stats=["PTS", "AST"])
+    assert prior.loc[0, "PTS"] == 15.0, "Game 3 should average games 1 and 2"
+    assert prior.loc[5, "PTS"] == 20.0, "Game 4 should average games 1-3"
+    assert prior.loc[0, "AST"] == 3.0, "Missing values should not count as games"
+    assert np.isnan(prior.loc[2, "PTS"]), "A player's first game has no baseline"
+
+def test_last_n_and_ewm_match_pandas_per_group():
+    logs = _logs()
+    last_two = prior_game_baselines(logs, "PLAYER_ID", "last_n", stats=["PTS"], window=2)
+    assert last_two.loc[5, "PTS"] == 25.0, "last_n should only see the previous two games"
+
+    ewm = prior_game_baselines(logs, "PLAYER_ID", "ewm", stats=["PTS"], span=3)
+    player = logs[logs["PLAYER_ID"] == 1].sort_values("GAME_DATE")
+    expected = player["PTS"].shift(1).ewm(span=3, ignore_na=True).mean().round(2)
+    assert np.allclose(ewm.loc[player.index, "PTS"], expected, equal_nan=True), "ewm should match pandas on one player"
+
+def test_prior_matches_running_averages_within_a_season():
+    logs = _logs()
+    running = RunningAverages("PLAYER_ID", stats=["PTS", "AST"])
+    running.fold(logs)
+    prior = prior_game_baselines(logs, "PLAYER_ID", "prior", stats=["PTS", "AST"])
+    assert prior.equals(running.averages_before(logs)), "Both strictly-prior averages should agree"
@@ -0,0 +1,58 @@
+import json
+from functools import partial
+import backend.cache as cache
+import backend.outlier_store as outlier_store
+from backend.config import STAT_RULES
+from backend.dataset import Dataset
+from backend.locked_cache import LockedLRU
+from backend.metrics import CACHE_LOOKUPS
+
+def _tier(game_id, data):
+    # the tier get_outliers_json served a lookup from, read off the metrics counter
+    before = dict(CACHE_LOOKUPS.values)
+    text = cache.get_outliers_json(game_id, data)
+    tiers = [key[0] for key, value in CACHE_LOOKUPS.values.items() if value != before.get(key, 0)]
+    assert len(tiers) == 1
+    return tiers[0], json.loads(text)
+
+def _use_store(tmp_path, monkeypatch):
+    store = tmp_path / "output" / "outliers.parquet"
+    monkeypatch.setattr(cache, "get_stored_result", partial(outlier_store.get_stored_result, path=store))
+    return store
+
+def _clear_memory(monkeypatch):
+    monkeypatch.setattr(cache, "_hot", LockedLRU(maxsize=cache._hot.maxsize))
+
+def test_tiers_are_tried_in_order(synthetic_data, tmp_path, monkeypatch):
+    store = _use_store(tmp_path, monkeypatch)
+    data = synthetic_data
+    game_id = data.team_logs["GAME_ID"].iloc[0]
+
+    tier, computed = _tier(game_id, data)
+    assert tier == "compute" and computed["teams"], "Nothing saved yet, so the result is computed"
+    assert _tier(game_id, data) == ("memory", computed), "The next lookup is served from memory"
+
+    _clear_memory(monkeypatch)
+    assert _tier(game_id, data) == ("file", computed), "Without memory, the saved JSON file is read"
+
+    outlier_store.write_store([outlier_store._store_row(game_id, data)], store)
+    _clear_memory(monkeypatch)
+    assert _tier(game_id, data) == ("store", computed), "The parquet store is tried before the JSON file"
+
+def test_new_rules_or_data_miss_saved_results(synthetic_data, tmp_path, monkeypatch):
+    store = _use_store(tmp_path, monkeypatch)
+    data = synthetic_data
+    game_id = data.team_logs["GAME_ID"].iloc[0]
+    cache.get_outliers_json(game_id, data)
+    outlier_store.write_store([outlier_store._store_row(game_id, data)], store)
+
+    monkeypatch.setitem(STAT_RULES["PTS"], "weight", 2.0)
+    rescored = Dataset(data.data_dir)
+    assert rescored.fingerprint != data.fingerprint, "Changed STAT_RULES change the fingerprint"
+    assert _tier(game_id, rescored)[0] == "compute", "Results saved under the old rules are not served"
+
+    averages = data.data_dir / "team_averages.csv"
+    averages.write_text(averages.read_text() + "\n")
+    reloaded = Dataset(data.data_dir)
+    assert reloaded.fingerprint != rescored.fingerprint, "Rewritten data files change the fingerprint"
+    assert _tier(game_id, reloaded)[0] == "compute", "Results saved from the old files are not served"
@@ -0,0 +1,15 @@
+import pandas as pd
+from backend.compute_averages import compute_league_differentials
+
+def test_league_differentials_skip_incomplete_games_and_missing_values():
+    logs = pd.DataFrame({
+        "GAME_ID": [1, 1, 2, 2, 3, 4, 4],
+        "AST": [20, 25, 22, 30, 40, 18, 21],
+        "OREB": [10, 12, None, 9, 5, 8, 8],
+    })
+    diffs = compute_league_differentials(logs).set_index("STAT")["AVG_DIFF"]
+
+    assert diffs["AST"] == round((5 + 8 + 3) / 3, 4), "Game 3 has one team and must be skipped"
+    assert diffs["OREB"] == 1.0, "Games with a missing value are skipped for that stat only"
+    assert "FG3M" not in diffs.index, "Stats absent from the logs are left out"
+    assert logs["GAME_ID"].tolist()[0] == 1, "Input logs must not be modified"
@@ -0,0 +1,53 @@
+import time
+import numpy as np
+import pandas as pd
+import backend.dataset as dataset
+from backend.benchmarks.synthetic import write_data_dir
+from backend.dataset import sort_by_game, build_game_index, build_team_index, build_key_index
+
+def _logs():
+    return pd.DataFrame({
+        "GAME_ID": ["0022400003", "0022400001", "0022400003", "0022400002", "0022400001", "0022400002"],
+        "TEAM_ABBREVIATION": ["BOS", "BOS", "NYK", "NYK", "MIA", "BOS"],
+    })
+
+def test_game_index_slices_match_mask():
+    logs = sort_by_game(_logs()).reset_index(drop=True)
+    index = build_game_index(logs)
+    for gid in logs["GAME_ID"].unique():
+        by_index = logs.iloc[index[gid]]
+        by_mask = logs[logs["GAME_ID"] == gid]
+        assert by_index.equals(by_mask), f"Index lookup differs from mask scan for {gid}"
+
+def test_team_index_keeps_file_order():
+    raw = _logs()
+    logs = sort_by_game(raw)
+    file_order = logs.index.to_numpy()
+    logs = logs.reset_index(drop=True)
+    index = build_team_index(logs, file_order)
+    bos = logs.iloc[index["BOS"]]["GAME_ID"].tolist()
+    assert bos == raw[raw["TEAM_ABBREVIATION"] == "BOS"]["GAME_ID"].tolist(), "Team games out of file order"
+    assert build_game_index(logs.iloc[0:0]) == {}, "Empty logs should give empty index"
+
+def test_key_index_lists_rows_in_order():
+    index = build_key_index(np.array([7, 3, 7, 7, 3]))
+    assert index[7].tolist() == [0, 2, 3], "Positions should follow row order"
+    assert index[3].tolist() == [1, 4], "Every key should get its own positions"
+
+def test_rewritten_data_dir_is_reloaded_in_the_background(synthetic_data, tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset, "RELOAD_CHECK_INTERVAL", 0)
+    old = dataset.get_dataset()
+    assert old is synthetic_data
+    old_team_logs = old.team_logs.copy()
+
+    write_data_dir(tmp_path, seasons=1, seed=1)  # rewrites the fixture's DATA_DIR in place
+    deadline = time.monotonic() + 30
+    while dataset.get_dataset() is old and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    new = dataset.get_dataset()
+    assert new is not old, "The slot should swap in a fresh Dataset after the files change"
+    assert new.fingerprint != old.fingerprint, "A reload from new files gets a new fingerprint"
+    pd.testing.assert_frame_equal(new.team_logs, dataset.Dataset(old.data_dir).team_logs)
+    assert not new.team_logs["PTS"].equals(old_team_logs["PTS"]), "The reloaded copy holds the rewritten rows"
+    pd.testing.assert_frame_equal(old.team_logs, old_team_logs, obj="Readers of the old copy keep its rows")
@@ -11,4 +11,4 @@ def test_player_game_logs_exists():
     assert os.path.exists("data/player_game_logs.csv"), "Player game logs file missing"
     df = pd.read_csv("data/player_game_logs.csv")
     assert not df.empty, "Player game logs CSV is empty"
-    assert "PLAYER_NAME" in df.columns, "Expected column missing in player logs"
\ No newline at end of file
+    assert "PLAYER_NAME" in df.columns, "Expected column missing in player logs"
@@ -0,0 +1,42 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from backend.live import game_watcher as gw
+
+def test_poll_interval_adapts_to_game_state():
+    assert gw.next_poll_interval([{"gameStatus": 2, "period": 4}]) == gw.FAST_POLL_INTERVAL
+    assert gw.next_poll_interval([{"gameStatus": 2, "period": 1}, {"gameStatus": 3}]) == gw.POLL_INTERVAL
+    assert gw.next_poll_interval([{"gameStatus": 3}]) == gw.IDLE_POLL_INTERVAL
+
+def test_watcher_persists_processed_games_and_retries(tmp_path, monkeypatch):
+    calls = []
+    def flaky_process_game(game_id):
+        calls.append(game_id)
+        if len(calls) == 1:
+            raise RuntimeError("box score not ingested yet")
+        return game_id
+
+    monkeypatch.setattr(gw, "process_game", flaky_process_game)
+    monkeypatch.setattr(gw, "RETRY_BASE_DELAY", 0)
+    log = tmp_path / "processed_games.txt"
+
+    async def run():
+        watcher = gw.GameWatcher(executor=ThreadPoolExecutor(2), processed_path=log)
+        for _ in range(3):
+            await watcher.poll_once()
+            await watcher.drain()
+        return watcher
+
+    watcher = asyncio.run(run())
+    assert calls == ["0022401044", "0022401044"], "A failed game is retried after its backoff, then not again once processed"
+    assert gw.load_processed_game_ids(log) == {"0022401044"}, "Processed IDs should be persisted"
+    assert "0022401044" in watcher.processed
+
+def test_games_missing_from_the_logs_are_not_saved(synthetic_data, tmp_path):
+    with pytest.raises(RuntimeError):
+        gw.process_game("0022409999")
+    assert not (tmp_path / "output" / "0022409999.json").exists(), "No empty result is saved for a missing game"
+
+    game_id = synthetic_data.team_logs["GAME_ID"].iloc[0]
+    assert gw.process_game(game_id) == game_id
+    assert (tmp_path / "output" / f"{game_id}.json").exists()
@@ -0,0 +1,15 @@
+from backend.benchmarks.synthetic import write_data_dir
+from backend.dataset import Dataset
+from backend.history import build_player_history, build_team_history
+
+def _order(history):
+    return [(game["date"], game["game_id"]) for game in history["games"]]
+
+def test_histories_run_oldest_first(tmp_path):
+    data = Dataset(write_data_dir(tmp_path, seasons=1))
+    player = build_player_history(int(data.player_logs["PLAYER_ID"].iloc[0]), data)
+    team = build_team_history(data.team_logs["TEAM_ABBREVIATION"].iloc[0], data)
+
+    assert len(player["games"]) > 1 and len(team["games"]) > 1
+    assert _order(player) == sorted(_order(player)), "Player games should run oldest first"
+    assert _order(team) == sorted(_order(team)), "Team games should run oldest first"
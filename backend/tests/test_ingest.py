@@ -0,0 +1,26 @@
+import pandas as pd
+import pyarrow as pa
+from backend.ingest import to_arrow
+
+def test_team_logs_schema_is_typed_and_projected():
+    df = pd.DataFrame({
+        "TEAM_ABBREVIATION": ["BOS", "NYK"],
+        "TEAM_NAME": ["Boston Celtics", "New York Knicks"],
+        "GAME_ID": [22401044, 22401044],
+        "GAME_DATE": ["2025-03-30T00:00:00"] * 2,
+        "PTS": [112, 98],
+        "TOV": [12.0, 15.0],
+        "FG_PCT": [0.534, 0.41],
+        "PTS_RANK": [3, 20],
+    })
+    table = to_arrow("team_game_logs", df)
+    schema = table.schema
+
+    assert "PTS_RANK" not in schema.names, "Rank columns should be dropped"
+    assert schema.field("PTS").type == pa.int16(), "Integral counting stats should be int16"
+    assert schema.field("TOV").type == pa.float64(), "Float source columns keep their values"
+    assert pa.types.is_dictionary(schema.field("TEAM_NAME").type), "Names should be categorical"
+    assert table.column("GAME_ID").to_pylist() == ["0022401044"] * 2, "GAME_ID should be stored padded"
+
+    back = table.to_pandas()
+    assert back["FG_PCT"].tolist() == [0.534, 0.41], "Fractional stats must round-trip exactly"
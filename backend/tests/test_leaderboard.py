@@ -0,0 +1,20 @@
+import numpy as np
+from backend.leaderboard import top_k
+
+def test_top_k_matches_full_sort():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=500)
+    values[rng.random(500) < 0.3] = np.nan
+    values[rng.random(500) < 0.2] = 0.0
+
+    picked = values[top_k(values, 7)]
+    expected = np.sort(values[values > 0])[::-1][:7]
+    assert np.array_equal(picked, expected), "top_k should return the 7 largest positive scores in order"
+
+    worst = values[top_k(-values, 7)]
+    assert np.array_equal(worst, np.sort(values[values < 0])[:7]), "top_k on negated scores gives the lowest"
+
+def test_top_k_skips_zero_and_nan():
+    values = np.array([np.nan, 0.0, 2.0, 0.0])
+    assert top_k(values, 3).tolist() == [2], "Only positive scores count as outliers"
+    assert top_k(np.array([]), 5).size == 0, "Empty input gives no positions"
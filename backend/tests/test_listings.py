@@ -0,0 +1,27 @@
+import pandas as pd
+from backend.listings import build_game_listing, build_team_listings
+
+def _logs():
+    return pd.DataFrame({
+        "GAME_ID": ["0022400003", "0022400003", "0022400002", "0022400002", "0022400001", "0022400001"],
+        "GAME_DATE": ["2025-01-03T00:00:00", "2025-01-03T00:00:00", "2025-01-02T00:00:00",
+                      "2025-01-02T00:00:00", "2025-01-01T00:00:00", "2025-01-01T00:00:00"],
+        "TEAM_ABBREVIATION": ["BOS", "NYK", "BOS", "MIA", "NYK", "BOS"],
+        "MATCHUP": ["BOS vs. NYK", "NYK @ BOS", "BOS @ MIA", "MIA vs. BOS", "NYK vs. BOS", "BOS @ NYK"],
+    })
+
+def test_game_listing_filters_and_paginates():
+    listing = build_game_listing(_logs())
+    games, total = listing.select()
+    assert [g["game_id"] for g in games] == ["0022400003", "0022400002", "0022400001"], "One entry per game in order"
+    assert games[0]["matchup"] == "BOS vs. NYK", "First row of each game should be used"
+
+    games, total = listing.select(date_from="2025-01-02", per_page=1, page=2)
+    assert total == 2, "Date filter should apply before pagination"
+    assert [g["game_id"] for g in games] == ["0022400002"], "Second page of one"
+
+def test_team_listing_parses_opponent():
+    logs = _logs()
+    index = logs.groupby("TEAM_ABBREVIATION").indices
+    bos, _ = build_team_listings(logs, index)["BOS"].select()
+    assert [g["opponent"] for g in bos] == ["NYK", "MIA", "NYK"], "Opponent should come from MATCHUP"
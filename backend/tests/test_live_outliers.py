@@ -0,0 +1,56 @@
+import copy
+from types import SimpleNamespace
+import pandas as pd
+from backend.advanced_stats import add_all_adv
+from backend.live.live_feed import LiveHub
+from backend.live.live_outliers import LiveGame, LIVE_STATS
+
+def _line(pts, ast, reb):
+    stats = {key: 0 for key in LIVE_STATS}
+    stats.update({"points": pts, "assists": ast, "reboundsDefensive": reb, "fieldGoalsAttempted": 10,
+                  "fieldGoalsMade": 5, "fieldGoalsPercentage": 0.5, "turnovers": 1, "turnoversTotal": 1})
+    return stats
+
+def _box(star_pts):
+    def team(city, name, abbr, pid, pts):
+        return {"teamCity": city, "teamName": name, "teamTricode": abbr, "statistics": _line(pts, 20, 30),
+                "players": [{"personId": pid, "name": f"P{pid}", "statistics": _line(pts, 4, 5)}]}
+    return {"game": {"gameStatus": 2, "period": 3, "gameClock": "PT05M00.00S",
+                     "homeTeam": team("Home", "Team", "HOM", 1, star_pts),
+                     "awayTeam": team("Away", "Team", "AWY", 2, 10)}}
+
+def _data():
+    stats = ["PTS", "AST", "DREB", "FGA", "FGM", "FG_PCT", "TOV", "FTA"]
+    avg = {"PTS": 10.0, "AST": 4.0, "DREB": 5.0, "FGA": 10.0, "FGM": 5.0, "FG_PCT": 0.5, "TOV": 1.0, "FTA": 0.0}
+    team_avg = pd.DataFrame([avg, avg], index=pd.Index(["Home Team", "Away Team"], name="TEAM_NAME"))[stats]
+    player_avg = add_all_adv(pd.DataFrame([avg, avg], index=pd.Index([1, 2], name="PLAYER_ID"))[stats])
+    diff_stats = ["OREB", "DREB", "FG_PCT", "FG3_PCT", "FG3M"]
+    league_diffs = pd.DataFrame({"AVG_DIFF": [5.0] * 5}, index=pd.Index(diff_stats, name="STAT"))
+    return SimpleNamespace(team_avg=team_avg, player_avg=player_avg, league_diffs=league_diffs)
+
+def test_only_changed_lines_are_rescored():
+    game = LiveGame("0022400001", _data())
+    assert game.update(_box(12)) == 4, "First snapshot scores every line"
+    assert game.update(_box(12)) == 0, "An identical snapshot rescores nothing"
+
+    box = _box(30)
+    box["game"]["awayTeam"] = copy.deepcopy(_box(12)["game"]["awayTeam"])
+    assert game.update(box) == 2, "Only the home team line and its scorer changed"
+
+    fresh = LiveGame("0022400001", _data())
+    fresh.update(box)
+    assert game.payload["outliers"] == fresh.payload["outliers"], "Incremental result should match a full rescore"
+    positive = [entry["stat"] for entry in game.payload["outliers"][0]["positive"]]
+    assert "P1 - PTS" in positive, "The new 30-point line should show up as an outlier"
+
+def test_hub_rejects_unknown_games_and_ends_failing_streams(synthetic_data):
+    hub = LiveHub(interval=0.01)
+    assert not hub.start_game("0022409999"), "A game the feed doesn't know is rejected upfront"
+    assert hub.start_game(synthetic_data.team_logs["GAME_ID"].iloc[0]), "A known game starts"
+
+    def broken_fetch(game_id):
+        raise KeyError("homeTeam")
+    hub = LiveHub(fetch=broken_fetch, interval=0.01)
+    frames = list(hub.stream("0022400001"))
+    assert frames[-1].startswith("event: error"), "Repeated poll failures end the stream with an error"
+    assert hub.watchers == {}, "The ended stream unregisters its watcher"
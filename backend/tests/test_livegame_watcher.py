@@ -1,9 +1,6 @@
 import time
 import os
 from pathlib import Path
-from nba_api.live.nba.endpoints import scoreboard
-from backend.compute_outliers import compute_outliers
-from backend.utils import save_json
 
 
 
@@ -34,6 +31,8 @@ def get_finished_games():
         return []
 
 def main():
+    from backend.compute_outliers import compute_outliers
+    from backend.utils import save_json
     game_id = "0022401044"  # Replace with any valid past game ID you have
     print(f"Testing single game: {game_id}")
     output_path = Path("backend/output") / f"{game_id}.json"
@@ -45,4 +44,4 @@ def main():
         print(f"[ERROR] {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
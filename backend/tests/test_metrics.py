@@ -0,0 +1,29 @@
+import json
+import logging
+from backend.logs import JsonFormatter
+from backend.metrics import Histogram, STAGE_SECONDS, render, timed
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("test_seconds", "Test histogram.", ["stage"], buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        hist.observe(value, stage="load")
+    lines = hist.render()
+
+    assert 'test_seconds_bucket{stage="load",le="0.1"} 1' in lines, "0.05 falls in the first bucket"
+    assert 'test_seconds_bucket{stage="load",le="1"} 2' in lines, "Buckets count every value at or below them"
+    assert 'test_seconds_bucket{stage="load",le="+Inf"} 3' in lines, "+Inf counts every observation"
+    assert 'test_seconds_sum{stage="load"} 5.55' in lines
+    assert 'test_seconds_count{stage="load"} 3' in lines
+
+def test_timed_records_stage():
+    with timed("unit_test_stage"):
+        pass
+    assert STAGE_SECONDS.series[("unit_test_stage",)][-2] == 1, "One observation per timed block"
+    assert 'outlier_stage_seconds_count{stage="unit_test_stage"} 1' in render()
+
+def test_json_formatter_keeps_extra_fields():
+    record = logging.LogRecord("backend.test", logging.INFO, __file__, 1, "saved outliers", (), None)
+    record.game_id = "0022401044"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["event"] == "saved outliers" and entry["level"] == "info"
+    assert entry["game_id"] == "0022401044", "extra= fields become top-level keys"
@@ -0,0 +1,35 @@
+import numpy as np
+from backend.advanced_stats import add_all_adv
+from backend.benchmarks.synthetic import write_data_dir
+from backend.compute_outliers import build_outliers
+from backend.config import STAT_RULES, STATS_TO_TRACK
+from backend.dataset import Dataset
+from backend.moments import MomentTable, stream_moments, write_moments
+
+def test_streamed_moments_match_pandas(tmp_path):
+    data_dir = write_data_dir(tmp_path, seasons=1)
+    table = stream_moments(data_dir / "player_game_logs.csv", "PLAYER_ID", chunksize=997)
+    means, stds = table.frames("PLAYER_ID")
+
+    logs = add_all_adv(Dataset(data_dir).player_logs.copy())
+    grouped = logs.groupby("PLAYER_ID")[STATS_TO_TRACK]
+    expected_means = grouped.mean().reindex(means.index)
+    expected_stds = grouped.std().reindex(stds.index)
+    assert np.allclose(means, expected_means, equal_nan=True), "Chunked means match a one-shot groupby"
+    assert np.allclose(stds, expected_stds, equal_nan=True), "Chunked variances match a one-shot groupby"
+
+def test_moments_round_trip_and_score(tmp_path):
+    data_dir = write_data_dir(tmp_path, seasons=1)
+    write_moments(data_dir, chunksize=500)
+    saved = MomentTable.load(data_dir / "team_moments.npz")
+
+    data = Dataset(data_dir)
+    computed = data.moments("team")
+    assert saved.keys == computed.keys and np.allclose(saved.m2, computed.m2), "Streamed and in-memory moments agree"
+
+    game_id = data.team_logs["GAME_ID"].iloc[0]
+    result = build_outliers(game_id, data, baseline="zscore")
+    assert result["outliers"][0]["positive"] or result["outliers"][0]["negative"], "Games score against z-scores"
+    scores = data.score_matrix("player", "zscore").to_numpy()
+    max_weight = max(rules.get("weight", 1.0) for rules in STAT_RULES.values())
+    assert np.nanmax(np.abs(scores)) <= 10 * max_weight, "Scores are clipped z-scores times the stat weight"
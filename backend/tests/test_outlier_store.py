@@ -0,0 +1,18 @@
+import json
+import pandas as pd
+from backend.outlier_store import write_store, get_stored_result
+
+def _row(game_id, winner):
+    return {"game_id": game_id, "game_date": "2025-01-01", "teams": "BOS,NYK",
+            "winner": winner, "fingerprint": "abc", "result": json.dumps({"game_id": game_id, "winner": winner})}
+
+def test_write_store_upserts_by_game_id(tmp_path):
+    path = tmp_path / "outliers.parquet"
+    write_store([_row("0022400001", "BOS"), _row("0022400002", "NYK")], path)
+    write_store([_row("0022400002", "BOS")], path)
+
+    table = pd.read_parquet(path)
+    assert table["game_id"].tolist() == ["0022400001", "0022400002"], "Upsert should keep one row per game"
+    assert json.loads(get_stored_result("0022400002", "abc", path))["winner"] == "BOS", "Rewritten game should be served"
+    assert get_stored_result("0022400003", path=path) is None, "Unknown games are not in the store"
+    assert get_stored_result("0022400001", "other", path) is None, "Stale fingerprints should miss"
@@ -0,0 +1,33 @@
+import json
+from backend.benchmarks.synthetic import write_data_dir
+from backend.cache import iter_outliers_ndjson
+from backend.compute_outliers import build_outliers
+from backend.dataset import Dataset, dataset_for_game, list_seasons, season_from_game_id
+from backend.partition import partition_seasons
+
+def test_season_from_game_id():
+    assert season_from_game_id("0022401044") == "2024-25"
+    assert season_from_game_id(29900001) == "1999-00", "Unpadded IDs and pre-2000 seasons"
+    assert season_from_game_id("0042300401") == "2023-24", "Playoff IDs carry the season too"
+
+def test_partitions_hold_one_season_each(tmp_path):
+    data_dir = write_data_dir(tmp_path, seasons=2)
+    seasons_dir = data_dir / "seasons"
+    assert partition_seasons(data_dir, seasons_dir) == ["2023-24", "2024-25"]
+    assert list_seasons(seasons_dir) == ["2023-24", "2024-25"]
+
+    data = Dataset(seasons_dir / "2023-24")
+    game_ids = data.team_logs["GAME_ID"].unique()
+    assert {season_from_game_id(g) for g in game_ids} == {"2023-24"}, "A partition only loads its own season"
+    assert set(data.player_logs["GAME_ID"]) == set(game_ids), "Player rows follow their games"
+
+    result = build_outliers(game_ids[0], data)
+    assert len(result["teams"]) == 2 and result["outliers"][0]["positive"], "Games score from their partition"
+
+def test_malformed_game_ids_become_error_lines(synthetic_data):
+    game_id = synthetic_data.team_logs["GAME_ID"].iloc[0]
+    assert dataset_for_game("abcdefghij") is synthetic_data, "Malformed IDs fall back to the newest season"
+
+    lines = [json.loads(line) for line in iter_outliers_ndjson(["abcdefghij", game_id])]
+    assert lines[0] == {"game_id": "abcdefghij", "error": "Unknown game"}, "A bad ID gets an error line"
+    assert lines[1]["game_id"] == game_id and lines[1]["teams"], "The stream goes on after a bad ID"
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from backend.benchmarks.synthetic import write_data_dir
+from backend.compute_averages import compute_team_averages
+from backend.running_averages import RunningAverages, RunningDifferentials, update_averages
+
+def _logs():
+    return pd.DataFrame({
+        "GAME_ID": [1, 1, 2, 2, 3, 3],
+        "GAME_DATE": ["2025-01-01", "2025-01-01", "2025-01-02", "2025-01-02", "2025-01-03", "2025-01-03"],
+        "TEAM_NAME": ["A", "B", "A", "C", "B", "C"],
+        "PTS": [100, 90, 110, 120, 95, None],
+        "AST": [20, 25, 22, 30, 18, 21],
+    })
+
+def test_incremental_folds_match_full_groupby():
+    logs = _logs()
+    running = RunningAverages("TEAM_NAME", stats=["PTS", "AST"])
+    running.fold(logs.iloc[:2])
+    running.fold(logs.iloc[2:])
+    assert running.fold(logs) == 0, "Already folded rows should be ignored"
+
+    expected = logs.groupby("TEAM_NAME")[["PTS", "AST"]].mean().round(2)
+    assert running.means().equals(expected), "Running means should match a full recompute"
+
+def test_averages_before_excludes_same_and_later_games():
+    running = RunningAverages("TEAM_NAME", stats=["PTS", "AST"])
+    running.fold(_logs())
+    before = running.as_of("2025-01-02")
+    assert before.loc["A", "PTS"] == 100, "Only games before the date should count"
+    assert "C" not in before.index, "Teams without earlier games have no as-of average"
+
+def test_same_date_games_fold_in_any_order():
+    logs = pd.DataFrame({
+        "GAME_ID": ["0022400101", "0022400101", "0022400100", "0022400100"],
+        "GAME_DATE": ["2025-01-05"] * 4,
+        "TEAM_NAME": ["A", "B", "C", "D"],
+        "PTS": [100, 90, 110, 120],
+        "AST": [20, 25, 22, 30],
+    })
+    running = RunningAverages("TEAM_NAME", stats=["PTS", "AST"])
+    diffs = RunningDifferentials(stats=["PTS", "AST"])
+    for game in (logs.iloc[:2], logs.iloc[2:]):  # the higher GAME_ID finishes first
+        running.fold(game)
+        diffs.fold(game)
+
+    assert running.fold(logs) == 0, "Both games are folded once"
+    assert list(running.means().index) == ["A", "B", "C", "D"], "The lower-ID game still reaches the averages"
+    assert diffs.counts["PTS"] == 2, "Both games are paired for the differentials"
+
+def test_differentials_wait_for_both_teams():
+    diffs = RunningDifferentials(stats=["PTS", "AST"])
+    logs = _logs()
+    diffs.fold(logs.iloc[:3])
+    assert diffs.counts["PTS"] == 1, "Game 2 only has one team folded so far"
+    diffs.fold(logs.iloc[3:])
+    means = diffs.means().set_index("STAT")["AVG_DIFF"]
+    assert means["PTS"] == 10.0, "Game 3 has a missing PTS and is skipped for that stat"
+    assert means["AST"] == round((5 + 8 + 3) / 3, 4)
+
+def test_update_averages_folds_only_new_rows(tmp_path):
+    data_dir = write_data_dir(tmp_path, seasons=1)
+    team_logs = pd.read_csv(data_dir / "team_game_logs.csv")
+    newest = team_logs["GAME_ID"].max()
+    team_logs[team_logs["GAME_ID"] != newest].to_csv(data_dir / "team_game_logs.csv", index=False)
+
+    state = tmp_path / "state.pkl"
+    assert update_averages(state, data_dir) > 0
+    assert update_averages(state, data_dir) == 0, "A rerun without new rows folds nothing"
+
+    team_logs.to_csv(data_dir / "team_game_logs.csv", index=False)
+    assert update_averages(state, data_dir) == 2, "Only the new game's two team rows are folded"
+    expected = compute_team_averages(team_logs)
+    written = pd.read_csv(data_dir / "team_averages.csv", index_col="TEAM_NAME")
+    assert np.allclose(written[expected.columns], expected, equal_nan=True), "Incremental averages match a recompute"
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.config import STATS_TO_TRACK
+from backend.scoring import compute_scores, compute_score_matrix, score_components, apply_rules
+from backend.whatif import merge_rules
+
+def _random_frame(rng, n):
+    df = pd.DataFrame({stat: rng.integers(0, 30, n).astype(float) for stat in STATS_TO_TRACK})
+    for stat in ["FG_PCT", "FG3_PCT", "FT_PCT", "TS_PCT"]:
+        df[stat] = rng.uniform(0, 1, n).round(3)
+    df["FGA"] = rng.integers(0, 25, n)
+    df["FG3A"] = rng.integers(0, 12, n)
+    df.loc[rng.random(n) < 0.1, "FG3_PCT"] = np.nan
+    return df
+
+def test_score_matrix_matches_compute_scores():
+    rng = np.random.default_rng(7)
+    rows = _random_frame(rng, 300)
+    avgs = _random_frame(rng, 300).drop(columns=["FGA", "FG3A"])
+    avgs.loc[rng.random(300) < 0.05, "PTS"] = 0  # zero-average branch of percent_diff
+
+    matrix = compute_score_matrix(rows, avgs)
+
+    for i in range(len(rows)):
+        expected = compute_scores(rows.iloc[i], avgs.iloc[i])
+        got = matrix.iloc[i].dropna().to_dict()
+        assert got.keys() == expected.keys(), f"Row {i} kept different stats"
+        for stat, score in expected.items():
+            assert got[stat] == score, f"Row {i} {stat}: {got[stat]} != {score}"
+
+def test_apply_rules_rescores_cached_components():
+    rng = np.random.default_rng(11)
+    rows, avgs = _random_frame(rng, 200), _random_frame(rng, 200)
+    components = score_components(rows, avgs)
+
+    base = apply_rules(components)
+    assert base.equals(compute_score_matrix(rows, avgs)), "Default rules should reproduce compute_score_matrix"
+
+    doubled = apply_rules(components, merge_rules({"PTS": {"weight": 1.6}}))
+    assert np.allclose(doubled["PTS"], 2 * base["PTS"], equal_nan=True), "Doubling a weight doubles its scores"
+    assert doubled.drop(columns="PTS").equals(base.drop(columns="PTS")), "Other stats are untouched"
+
+def test_merge_rules_rejects_unknown_input():
+    with pytest.raises(ValueError):
+        merge_rules({"NOT_A_STAT": {"weight": 1}})
+    with pytest.raises(ValueError):
+        merge_rules({"PTS": {"weight": "heavy"}})
+    with pytest.raises(ValueError):
+        merge_rules({"PTS": {"team_threshold": 100}})  # team lines use player_threshold
+    with pytest.raises(ValueError):
+        merge_rules("junk")
+    for no_op in ({}, None, {"PTS": {}}):
+        with pytest.raises(ValueError):
+            merge_rules(no_op)
+    for value in (float("nan"), float("inf"), -float("inf")):
+        with pytest.raises(ValueError):
+            merge_rules({"PTS": {"weight": value}})
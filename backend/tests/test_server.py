@@ -0,0 +1,89 @@
+import gzip
+import json
+import server
+
+def _lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def test_outliers_batch_streams_one_line_per_game(synthetic_data, monkeypatch):
+    client = server.app.test_client()
+    game_ids = synthetic_data.team_logs["GAME_ID"].unique()[:2].tolist()
+
+    lines = _lines(client.post("/api/outliers/batch", json={"game_ids": game_ids + ["0022409999"]}))
+    assert [line["game_id"] for line in lines] == game_ids + ["0022409999"], "One line per game, in order"
+    assert lines[0]["teams"] and lines[1]["teams"], "Known games get their outliers"
+    assert lines[2] == {"game_id": "0022409999", "error": "Unknown game"}, "Unknown games get an error line"
+
+    for bad in ("0022401044", 22401044, [22401044]):
+        response = client.post("/api/outliers/batch", json={"game_ids": bad})
+        assert response.status_code == 400, f"game_ids={bad!r} should be rejected"
+    assert client.post("/api/outliers/batch", json=game_ids).status_code == 400, "A bare list body is rejected"
+
+    monkeypatch.setattr(server, "MAX_BATCH_GAMES", 1)
+    assert client.post("/api/outliers/batch", json={"game_ids": game_ids}).status_code == 400, "Batch size is capped"
+
+def test_outliers_batch_selects_a_teams_games(synthetic_data):
+    client = server.app.test_client()
+    team = synthetic_data.team_logs.iloc[0]
+    dates = synthetic_data.team_games(team["TEAM_ABBREVIATION"])["GAME_DATE"].astype(str).str[:10].sort_values()
+    date_from, date_to = dates.iloc[2], dates.iloc[5]
+
+    body = {"team": team["TEAM_ABBREVIATION"], "from": date_from, "to": date_to}
+    lines = _lines(client.post("/api/outliers/batch", json=body))
+    assert len(lines) == 4, "Only the team's games inside the date range are scored"
+    assert all(team["TEAM_ABBREVIATION"] in line["teams"] for line in lines), "Every game is one of the team's"
+
+def test_whatif_rejects_malformed_bodies(synthetic_data):
+    client = server.app.test_client()
+    game_id = synthetic_data.team_logs["GAME_ID"].iloc[0]
+    bad_bodies = [
+        [1, 2],
+        {"game_id": game_id, "rules": {}},
+        {"rules": {"FG3M": {"team_diff_threshold": 1, "team_diff_weight": 2}}},
+        {"rules": {"PTS": {"weight": 1}}, "n": None},
+    ]
+    for body in bad_bodies:
+        assert client.post("/api/whatif", json=body).status_code == 400, f"{body!r} should be rejected"
+    response = client.post("/api/whatif", data='{"rules": {"PTS": {"weight": NaN}}}', content_type="application/json")
+    assert response.status_code == 400, "Non-finite rule values are rejected"
+    assert client.post("/api/whatif", json={"game_id": game_id, "rules": {"PTS": {"weight": 1}}}).status_code == 200
+
+def test_leaderboard_validates_its_arguments(synthetic_data, monkeypatch):
+    client = server.app.test_client()
+    for query in ("n=0", "n=-1", "n=abc", "from=garbage", "to=2024-13-40", "type=coach", "stat=XYZ"):
+        response = client.get(f"/api/leaderboard?{query}")
+        assert response.status_code == 400, f"?{query} should be rejected"
+        assert "error" in response.get_json()
+
+    board = client.get("/api/leaderboard?n=3&from=2000-01-01").get_json()
+    assert 0 < len(board["positive"]) <= 3 and len(board["negative"]) <= 3, "n caps each side of the board"
+
+    monkeypatch.setattr(server, "MAX_LEADERBOARD_SIZE", 2)
+    board = client.get("/api/leaderboard?n=50").get_json()
+    assert len(board["positive"]) <= 2 and len(board["negative"]) <= 2, "n is clamped to MAX_LEADERBOARD_SIZE"
+
+def test_games_listing_rejects_non_positive_pages(synthetic_data):
+    client = server.app.test_client()
+    for query in ("page=0", "per_page=0", "per_page=-5", "page=two", "from=01/02/2025"):
+        assert client.get(f"/api/games?{query}").status_code == 400, f"?{query} should be rejected"
+
+    response = client.get("/api/games?page=2&per_page=3")
+    assert response.status_code == 200 and len(response.get_json()) == 3, "Valid pages still work"
+    assert int(response.headers["X-Total-Count"]) > 3
+
+def test_conditional_json_revalidates_and_compresses(synthetic_data):
+    client = server.app.test_client()
+    response = client.get("/api/games")
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+    assert response.status_code == 200 and etag and "Content-Encoding" not in response.headers
+
+    assert client.get("/api/games", headers={"If-None-Match": etag}).status_code == 304, "Matching ETag is a 304"
+    assert client.get("/api/games", headers={"If-Modified-Since": last_modified}).status_code == 304, \
+        "Unchanged since Last-Modified is a 304"
+    stale = client.get("/api/games", headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified})
+    assert stale.status_code == 200, "If-None-Match takes precedence over If-Modified-Since"
+    assert client.get("/api/games?per_page=5").headers["ETag"] != etag, "Each query gets its own ETag"
+
+    zipped = client.get("/api/games", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip" and zipped.headers["Vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(zipped.get_data())) == response.get_json(), "gzip body is the same JSON"
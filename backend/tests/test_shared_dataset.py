@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from backend.benchmarks.synthetic import write_data_dir
+from backend.dataset import Dataset, generation_signature
+from backend.shared_dataset import (KEEP_GENERATIONS, SharedTable, _prune, _write_table, attach_current_generation,
+                                    publish_generation)
+
+def test_shared_table_round_trips_rows(tmp_path):
+    df = pd.DataFrame({
+        "PLAYER_ID": [1, 2, 3],
+        "PLAYER_NAME": ["A", "B", None],
+        "TEAM_ABBREVIATION": pd.Categorical(["BOS", "NYK", "BOS"]),
+        "PTS": [10, 20, 30],
+        "FG_PCT": [0.5, np.nan, 0.25],
+    })
+    table = SharedTable(tmp_path, _write_table(tmp_path, "logs", df))
+    assert isinstance(table.blocks[0][0], np.memmap), "Numeric blocks should be memory-mapped"
+    pd.testing.assert_frame_equal(table.frame(), df, check_dtype=False)
+    pd.testing.assert_frame_equal(table.frame(slice(1, 3)), df.iloc[1:3], check_dtype=False)
+
+def test_published_generation_matches_the_dataset(tmp_path):
+    data = Dataset(write_data_dir(tmp_path, seasons=1))
+    shared_dir = tmp_path / "shared"
+    generation = publish_generation(data, shared_dir)
+    assert generation_signature(shared_dir) == generation, "CURRENT names the generation just published"
+
+    shared = attach_current_generation(shared_dir)
+    assert shared.fingerprint == data.fingerprint and shared.source_signature == generation
+    game_id = data.team_logs["GAME_ID"].iloc[0]
+    pd.testing.assert_frame_equal(shared.players_in_game(game_id), data.players_in_game(game_id), check_dtype=False)
+    pd.testing.assert_frame_equal(shared.player_score_matrix, data.player_score_matrix, check_dtype=False)
+
+    logs = shared.player_logs
+    assert np.shares_memory(logs["PTS"].to_numpy(), shared._player_logs.column("PTS")), "player_logs maps, not copies"
+    pd.testing.assert_frame_equal(shared.score_matrix("player", "prior"), data.score_matrix("player", "prior"))
+
+def test_workers_follow_the_current_pointer(tmp_path):
+    shared_dir = tmp_path / "shared"
+    first = publish_generation(Dataset(write_data_dir(tmp_path / "a", seasons=1)), shared_dir)
+    second = publish_generation(Dataset(write_data_dir(tmp_path / "b", seasons=1, seed=1)), shared_dir)
+    assert first != second and generation_signature(shared_dir) == second, "Publishing swaps CURRENT to the new generation"
+    assert not (shared_dir / "CURRENT.tmp").exists(), "The pointer is replaced, not left half-written"
+    assert attach_current_generation(shared_dir).generation == second, "Workers attach whatever CURRENT names"
+    assert (shared_dir / first).is_dir(), "The previous generation stays for workers still mapping it"
+
+def test_prune_keeps_the_newest_generations(tmp_path):
+    names = [f"2024010{i}T000000-abc" for i in range(1, 7)]
+    for name in names:
+        (tmp_path / name).mkdir()
+    (tmp_path / "CURRENT").write_text(names[0])
+
+    _prune(tmp_path, keep=names[0])
+    left = sorted(p.name for p in tmp_path.iterdir() if p.is_dir())
+    assert left == [names[0]] + names[-KEEP_GENERATIONS:], "Old generations go, except the one being kept"
+    assert (tmp_path / "CURRENT").exists(), "Only generation directories are pruned"
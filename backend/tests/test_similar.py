@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+from backend.benchmarks.synthetic import write_data_dir
+from backend.dataset import Dataset
+from backend.similar import SimilarityIndex, game_vectors, similarity_index, top_k_cosine
+
+def test_blocked_search_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(1000, 12)).astype(np.float32)
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    positions, sims = top_k_cosine(unit, unit[7], 10, exclude=7, block=64)
+    expected = np.argsort(-(unit @ unit[7]), kind="stable")[1:11]
+    assert positions.tolist() == expected.tolist(), "Blocked top-k should match a full sort"
+    assert np.all(np.diff(sims) <= 0), "Best matches come first"
+    assert 7 not in positions, "The query game is never its own match"
+
+def test_index_update_overwrites_and_appends():
+    index = SimilarityIndex(dims=2)
+    index.update(["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+    index.update(["b", "c"], np.array([[1.0, 0.1], [0.0, 0.0]]))
+
+    assert index.size == 3 and index.game_ids == ["a", "b", "c"], "Known games are updated in place"
+    game_id, similarity = index.query("a", 1)[0]
+    assert game_id == "b" and similarity > 0.99, "Updated vector is the one searched"
+    assert index.query("c", 5)[-1][1] == 0, "Games without outliers have zero similarity"
+
+def test_new_generation_upserts_only_new_games(tmp_path, monkeypatch):
+    data_dir = write_data_dir(tmp_path, seasons=1)
+    team_logs = pd.read_csv(data_dir / "team_game_logs.csv", dtype={"GAME_ID": str})
+    newest = team_logs["GAME_ID"].iloc[0]
+    team_logs[team_logs["GAME_ID"] != newest].to_csv(data_dir / "team_game_logs.csv", index=False)
+    before = similarity_index(Dataset(data_dir))
+
+    team_logs.to_csv(data_dir / "team_game_logs.csv", index=False)
+    upserted = []
+    update = SimilarityIndex.update
+    def recording_update(self, game_ids, vectors):
+        upserted.append(list(game_ids))
+        update(self, game_ids, vectors)
+    monkeypatch.setattr(SimilarityIndex, "update", recording_update)
+    data = Dataset(data_dir)
+    after = similarity_index(data)
+
+    assert upserted == [[newest]], "Only the added game is upserted into the next generation's index"
+    assert newest not in before.positions and after.size == before.size + 1, "The previous index is left as it was"
+    fresh = SimilarityIndex(after.unit.shape[1])
+    update(fresh, *game_vectors(data))
+    assert after.query(newest, 5) == fresh.query(newest, 5), "The upserted index answers like a full rebuild"
@@ -0,0 +1,13 @@
+from backend.benchmarks.synthetic import synthetic_logs, GAMES_PER_TEAM, TEAMS
+
+def test_synthetic_logs_are_consistent():
+    team_logs, player_logs = synthetic_logs(seasons=2, seed=1)
+
+    assert len(team_logs) == 2 * TEAMS * GAMES_PER_TEAM, "Every team plays a full season each year"
+    assert (team_logs.groupby("GAME_ID").size() == 2).all(), "Every game has exactly two team rows"
+    assert set(team_logs.groupby("GAME_ID")["WL"].apply("".join)) <= {"WL", "LW"}, "Every game has one winner"
+
+    player_pts = player_logs.groupby(["GAME_ID", "TEAM_NAME"])["PTS"].sum()
+    team_pts = team_logs.set_index(["GAME_ID", "TEAM_NAME"])["PTS"].reindex(player_pts.index)
+    assert ((team_pts - player_pts).between(0, 1)).all(), "Team points are the players' points (plus a tie-breaker)"
+    assert player_logs["SEASON_YEAR"].nunique() == 2, "Both seasons are generated"
@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+import pandas as pd
+from backend.fetch_game_data import StatsClient, update_game_logs
+
+TEAM_HEADERS = ["SEASON_YEAR", "TEAM_ID", "TEAM_NAME", "GAME_ID", "GAME_DATE", "PTS"]
+PLAYER_HEADERS = ["SEASON_YEAR", "PLAYER_ID", "PLAYER_NAME", "GAME_ID", "GAME_DATE", "PTS"]
+
+def _stand_in_server(team_rows, player_rows):
+    # serves the two gamelogs endpoints from memory and records every query
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+            seen.append((url.path, query))
+            headers, rows = (TEAM_HEADERS, team_rows) if url.path.endswith("teamgamelogs") else (PLAYER_HEADERS, player_rows)
+            if query["DateFrom"]:
+                month, day, year = query["DateFrom"].split("/")
+                rows = [r for r in rows if r[4][:10] >= f"{year}-{month}-{day}"]
+            body = json.dumps({"resultSets": [{"name": "GameLogs", "headers": headers, "rowSet": rows}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, seen
+
+def test_update_game_logs_is_incremental_and_cached(tmp_path):
+    team_rows = [
+        ["2024-25", 1, "A", "0022400001", "2024-10-22T00:00:00", 100],
+        ["2024-25", 2, "B", "0022400001", "2024-10-22T00:00:00", 90],
+    ]
+    player_rows = [["2024-25", 7, "P", "0022400001", "2024-10-22T00:00:00", 20]]
+    server, seen = _stand_in_server(team_rows, player_rows)
+    base_url = f"http://127.0.0.1:{server.server_port}/stats"
+    try:
+        client = StatsClient(base_url, tmp_path / "cache", min_interval=0)
+        added = update_game_logs(["2024-25"], ["Regular Season"], client, data_dir=tmp_path)
+        assert added == {"team_game_logs": 2, "player_game_logs": 1}
+        assert all(query["DateFrom"] == "" for _, query in seen), "Nothing stored yet, so no date filter"
+
+        sent = len(seen)
+        for table in ("team_game_logs", "player_game_logs"):
+            (tmp_path / f"{table}.csv").unlink()
+        assert update_game_logs(["2024-25"], ["Regular Season"], client, data_dir=tmp_path) == added
+        assert len(seen) == sent, "Repeating a request is served from the on-disk cache"
+
+        team_rows.append(["2024-25", 1, "A", "0022400002", "2024-10-24T00:00:00", 110])
+        client = StatsClient(base_url, tmp_path / "cache", min_interval=0)
+        added = update_game_logs(["2024-25"], ["Regular Season"], client, data_dir=tmp_path)
+        assert added["team_game_logs"] == 1, "Only the new game is added, re-fetched rows replace old ones"
+        assert seen[-1][1]["DateFrom"] == "10/22/2024", "Requests start at the newest stored game date"
+    finally:
+        server.shutdown()
+
+    logs = pd.read_csv(tmp_path / "team_game_logs.csv", dtype={"GAME_ID": str})
+    assert logs["GAME_ID"].tolist() == ["0022400002", "0022400001", "0022400001"], "Newest games first, IDs kept padded"
+
+def test_expired_open_season_responses_are_pruned(tmp_path):
+    server, seen = _stand_in_server([], [])
+    base_url = f"http://127.0.0.1:{server.server_port}/stats"
+    try:
+        client = StatsClient(base_url, tmp_path / "cache", min_interval=0)
+        client.get("teamgamelogs", {"DateFrom": "10/22/2024"}, max_age=60)
+        client.get("teamgamelogs", {"DateFrom": "", "Season": "2023-24"})
+        stale = time.time() - 3600
+        for path in (tmp_path / "cache").iterdir():
+            os.utime(path, (stale, stale))
+
+        client.get("teamgamelogs", {"DateFrom": "10/24/2024"}, max_age=60)
+    finally:
+        server.shutdown()
+
+    names = sorted(path.name for path in (tmp_path / "cache").iterdir())
+    assert not client.cache_path("teamgamelogs", {"DateFrom": "10/22/2024"}, expiring=True).exists(), \
+        "Writing a new open-season response prunes the expired ones"
+    assert client.cache_path("teamgamelogs", {"DateFrom": "", "Season": "2023-24"}).exists(), \
+        "Finished-season responses are never pruned"
+    assert len(names) == 2, f"Only the fresh and the finished-season responses are left: {names}"
@@ -1,9 +1,29 @@
-import json, pandas as pd
+import json, os, pandas as pd
+import pyarrow.parquet as pq
 from backend.config import DATA_DIR
 
 def load_csv(name: str) -> pd.DataFrame:
     return pd.read_csv(DATA_DIR / name)
 
+def load_table(name: str, columns=None, data_dir=DATA_DIR) -> pd.DataFrame:
+    # typed parquet copy from backend/ingest.py when it's at least as new as the CSV,
+    # otherwise the CSV; either way only `columns` (those that exist) are read
+    csv_path = data_dir / f"{name}.csv"
+    parquet_path = data_dir / f"{name}.parquet"
+
+    if parquet_path.exists() and (not csv_path.exists()
+                                  or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        if columns is not None:
+            available = set(pq.read_schema(parquet_path).names)
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(parquet_path, columns=columns)
+
+    if columns is not None:
+        wanted = set(columns)
+        return pd.read_csv(csv_path, usecols=lambda c: c in wanted)
+    return pd.read_csv(csv_path)
+
 def save_json(payload: dict, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     with open(path, "w") as f:
-        json.dump(payload, f, indent=2)
\ No newline at end of file
+        json.dump(payload, f, indent=2)
@@ -0,0 +1,85 @@
+import argparse
+import copy
+import json
+import math
+from backend.config import STAT_RULES, STATS_TO_TRACK, TEAM_DIFF_STATS_TO_TRACK, N_BARS
+from backend.dataset import Dataset, dataset_for_game, get_dataset
+from backend.compute_outliers import build_outliers
+from backend.leaderboard import build_leaderboard
+
+# Try other STAT_RULES without editing config.py or recomputing anything:
+#   python -m backend.whatif rules.json --game 0022401044
+#   python -m backend.whatif rules.json --type player --from 2025-01-01 --to 2025-01-31
+# rules.json only lists what changes, e.g. {"PTS": {"weight": 1.0}, "FG3M": {"min_diff": 2}}.
+
+# no team_threshold: team lines are scored with player_threshold, as in compute_scores
+RULE_KEYS = {
+    "player_threshold", "min_diff", "weight",
+    "team_diff_threshold", "team_diff_weight",
+}
+
+
+def merge_rules(overrides: dict) -> dict:
+    """STAT_RULES with `overrides` applied per stat; raises ValueError on anything unknown or empty."""
+    if not isinstance(overrides, dict):
+        raise ValueError("rules must be an object of per-stat overrides")
+    if not overrides:
+        raise ValueError("rules must override at least one stat")
+    rules = copy.deepcopy(STAT_RULES)
+    for stat, changes in overrides.items():
+        if stat not in STATS_TO_TRACK:
+            raise ValueError(f"Unknown stat {stat}")
+        if not isinstance(changes, dict) or not changes:
+            raise ValueError(f"Rules for {stat} must be a non-empty object")
+        for key, value in changes.items():
+            if key not in RULE_KEYS:
+                raise ValueError(f"Unknown rule {key} for {stat}")
+            if key.startswith("team_diff") and stat not in TEAM_DIFF_STATS_TO_TRACK:
+                raise ValueError(f"No league differential for {stat}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"{stat}.{key} must be a finite number")
+        merged = rules.setdefault(stat, {})
+        merged.update(changes)
+        if ("team_diff_threshold" in merged) != ("team_diff_weight" in merged):
+            raise ValueError(f"{stat} needs both team_diff_threshold and team_diff_weight")
+    return rules
+
+
+def whatif_game(game_id: str, overrides: dict, data: Dataset = None) -> dict:
+    # one game's outliers re-ranked under the changed rules, same shape as /api/outliers
+    rules = merge_rules(overrides)
+    return build_outliers(str(game_id), data or dataset_for_game(game_id), rules=rules)
+
+
+def whatif_leaderboard(overrides: dict, entity_type="player", stat=None, date_from=None, date_to=None,
+                       n=N_BARS, data: Dataset = None) -> dict:
+    # the season (or date range) leaderboard under the changed rules
+    rules = merge_rules(overrides)
+    if any(key.startswith("team_diff") for changes in overrides.values() for key in changes):
+        raise ValueError("team_diff_* rules only change game outliers, not leaderboards")
+    return build_leaderboard(entity_type, stat, date_from, date_to, n, data or get_dataset(), rules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-rank outliers under alternative STAT_RULES.")
+    parser.add_argument("rules", help="JSON file of per-stat rule overrides")
+    parser.add_argument("--game", help="game ID; omit for a leaderboard over --from/--to")
+    parser.add_argument("--type", default="player", choices=["player", "team"])
+    parser.add_argument("--stat", choices=STATS_TO_TRACK)
+    parser.add_argument("--from", dest="date_from")
+    parser.add_argument("--to", dest="date_to")
+    parser.add_argument("-n", type=int, default=N_BARS)
+    args = parser.parse_args()
+
+    with open(args.rules) as f:
+        overrides = json.load(f)
+
+    if args.game:
+        result = whatif_game(args.game, overrides)
+    else:
+        result = whatif_leaderboard(overrides, args.type, args.stat, args.date_from, args.date_to, args.n)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,277 @@
-import pandas as pd
-
 # server.py
-from flask import Flask, jsonify, send_from_directory
-from backend.compute_outliers import compute_outliers
+import cProfile
+import io
+import pstats
+import time
+from datetime import date
+from flask import (Flask, Response, abort, g, jsonify, make_response, request, send_from_directory,
+                   stream_with_context)
+from backend.config import (BASELINES, ENABLE_PROFILING, MAX_BATCH_GAMES, MAX_LEADERBOARD_SIZE,
+                            MAX_SIMILAR_GAMES, N_BARS, PROFILE_TOP_N, STATS_TO_TRACK)
+from backend.logs import configure_logging
+from backend.metrics import REQUEST_SECONDS, REQUESTS, render as render_metrics
+from backend.responses import conditional_json, make_etag
+
+# The data modules (and with them pandas/numpy/pyarrow) are imported inside the
+# routes that use them, so a worker boots and serves / and /metrics without
+# them; the first data request pays the import. See backend/benchmarks/startup.py.
 
 app = Flask(
     __name__,
     static_folder="frontend",
     static_url_path="",
     )
+configure_logging()
+
+
+@app.before_request
+def start_timer():
+    g.start = time.perf_counter()
+    if ENABLE_PROFILING and request.headers.get("X-Profile") == "1":
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request(response):
+    # route templates, not raw paths, so label cardinality stays bounded
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    REQUEST_SECONDS.observe(time.perf_counter() - g.start, route=route, method=request.method)
+    REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+    return Response(report.getvalue(), mimetype="text/plain")
+
+
+@app.route("/metrics")
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
 
 @app.route("/")
 def serve_home(): 
     return send_from_directory("frontend","index.html")
 
 
-@app.route("/api/games")
-def get_available_games():
-    team_logs = pd.read_csv("data/team_game_logs.csv")
-    team_logs["GAME_ID"] = team_logs["GAME_ID"].astype(str).str.zfill(10)
+def requested_dataset(season=None):
+    # ?season=2023-24 picks a season partition, the newest season otherwise
+    from backend.dataset import get_dataset
+    try:
+        return get_dataset(season or request.args.get("season"))
+    except KeyError as e:
+        abort(make_response(jsonify({"error": e.args[0]}), 404))
 
-    # Drop duplicates to get one row per game
-    unique_games = team_logs.drop_duplicates(subset=["GAME_ID"])
 
-    # Create list of game options
-    games = []
-    for _, row in unique_games.iterrows():
-        games.append({
-            "game_id": row["GAME_ID"],
-            "date": row["GAME_DATE"],
-            "matchup": row["MATCHUP"]
-        })
+def bad_request(message):
+    abort(make_response(jsonify({"error": message}), 400))
 
-    return jsonify(games)
+
+def date_range_args():
+    # ?from=YYYY-MM-DD&to=YYYY-MM-DD, both optional; anything else is a 400
+    dates = request.args.get("from"), request.args.get("to")
+    for value in dates:
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                bad_request(f"Dates must be YYYY-MM-DD, got {value}")
+    return dates
+
+
+def positive_int_arg(name, default=None):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        bad_request(f"{name} must be a positive integer")
+    return number
+
+
+def listing_response(data, listing):
+    # ?from=YYYY-MM-DD&to=YYYY-MM-DD&page=N&per_page=M, all optional
+    date_from, date_to = date_range_args()
+    page, per_page = positive_int_arg("page"), positive_int_arg("per_page")
+
+    games, total = listing.select(date_from, date_to, page, per_page)
+    etag = make_etag(data.fingerprint, request.path, date_from, date_to, page, per_page)
+    return conditional_json(etag, data.last_modified, lambda: games, headers={"X-Total-Count": str(total)})
+
+
+@app.route("/api/seasons")
+def seasons():
+    # empty when DATA_DIR holds a single flat set of tables
+    from backend.dataset import available_seasons
+    return jsonify(available_seasons())
+
+
+@app.route("/api/games")
+def get_available_games():
+    data = requested_dataset()
+    return listing_response(data, data.game_listing)
 
 
 @app.route('/api/games/<team_abbr>')
 def get_games_for_team(team_abbr):
-    game_logs = pd.read_csv("data/team_game_logs.csv")
-    game_logs["GAME_ID"] = game_logs["GAME_ID"].astype(str).str.zfill(10)
-    team_games = game_logs[game_logs["TEAM_ABBREVIATION"] == team_abbr]
+    data = requested_dataset()
+    listing = data.team_listings.get(team_abbr)
 
-    if team_games.empty:
+    if listing is None:
         return jsonify({"error": "No games found for team"}), 404
 
-    results = []
-    for _, row in team_games.iterrows():
-        opponent = row["MATCHUP"].replace(team_abbr + " vs. ", "").replace(team_abbr + " @ ", "")
-        results.append({
-            "game_id": row["GAME_ID"],
-            "date": row["GAME_DATE"],
-            "opponent": opponent
-        })
+    return listing_response(data, listing)
+
+
+@app.route("/api/players/<int:player_id>/outliers")
+def player_outlier_history(player_id):
+    from backend.history import build_player_history
+    data = requested_dataset()
+    if player_id not in data.player_index:
+        return jsonify({"error": "No games found for player"}), 404
+
+    etag = make_etag(data.fingerprint, request.path)
+    return conditional_json(etag, data.last_modified, lambda: build_player_history(player_id, data))
+
+
+@app.route("/api/teams/<team_abbr>/outliers")
+def team_outlier_history(team_abbr):
+    from backend.history import build_team_history
+    data = requested_dataset()
+    if team_abbr not in data.team_index:
+        return jsonify({"error": "No games found for team"}), 404
+
+    etag = make_etag(data.fingerprint, request.path)
+    return conditional_json(etag, data.last_modified, lambda: build_team_history(team_abbr, data))
+
+
+@app.route("/api/leaderboard")
+def leaderboard():
+    # ?type=player|team&stat=REB&from=YYYY-MM-DD&to=YYYY-MM-DD&n=N, all optional
+    from backend.leaderboard import build_leaderboard
+    args = request.args
+    entity_type = args.get("type", "player")
+    stat = args.get("stat") or None
+    date_from, date_to = date_range_args()
+    n = min(positive_int_arg("n", N_BARS), MAX_LEADERBOARD_SIZE)
 
-    return jsonify(results)
+    if entity_type not in ("player", "team"):
+        return jsonify({"error": "type must be player or team"}), 400
+    if stat is not None and stat not in STATS_TO_TRACK:
+        return jsonify({"error": f"Unknown stat {stat}"}), 400
 
+    data = requested_dataset()
+    etag = make_etag(data.fingerprint, request.path, entity_type, stat, date_from, date_to, n)
+    return conditional_json(etag, data.last_modified,
+                            lambda: build_leaderboard(entity_type, stat, date_from, date_to, n, data))
 
 
 @app.route("/api/outliers/<game_id>")
 def outliers(game_id):
+    # ?baseline=season|prior|last_n|ewm|zscore, see backend/baselines.py
+    baseline = request.args.get("baseline", "season")
+    if baseline not in BASELINES:
+        return jsonify({"error": f"baseline must be one of {', '.join(BASELINES)}"}), 400
+    from backend.cache import get_outliers_json
     try:
-        result = compute_outliers(game_id)
-        return jsonify(result)
+        return Response(get_outliers_json(game_id, baseline=baseline), mimetype="application/json")
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/similar/<game_id>")
+def similar(game_id):
+    # ?k=N games whose team and differential outliers look most like this one's
+    from backend.dataset import dataset_for_game
+    from backend.similar import similar_games
+    game_id = str(game_id).zfill(10)
+    k = max(1, min(request.args.get("k", N_BARS, type=int), MAX_SIMILAR_GAMES))
+    data = dataset_for_game(game_id)
+    if len(data.teams_in_game(game_id)) != 2:
+        return jsonify({"error": "Unknown game"}), 404
+
+    etag = make_etag(data.fingerprint, request.path, k)
+    return conditional_json(etag, data.last_modified, lambda: similar_games(game_id, data, k))
+
+@app.route("/api/outliers/batch", methods=["GET", "POST"])
+def outliers_batch():
+    # POST {"game_ids": [...]}, or GET ?ids=a,b,c or ?team=BOS&from=YYYY-MM-DD&to=YYYY-MM-DD
+    from backend.cache import iter_outliers_ndjson
+    body = request.get_json(silent=True)
+    if body is None:
+        body = {}  # GET, or a POST without a JSON body
+    elif not isinstance(body, dict):
+        return jsonify({"error": "Body must be a JSON object"}), 400
+    args = request.args
+    game_ids = body.get("game_ids")
+    if game_ids is not None and not (isinstance(game_ids, list) and all(isinstance(g, str) for g in game_ids)):
+        return jsonify({"error": "game_ids must be a list of strings"}), 400
+    game_ids = game_ids or [g for g in args.get("ids", "").split(",") if g]
+
+    team = body.get("team") or args.get("team")
+    if not game_ids and team:
+        listing = requested_dataset(body.get("season")).team_listings.get(team)
+        if listing is None:
+            return jsonify({"error": "No games found for team"}), 404
+        games, _ = listing.select(body.get("from") or args.get("from"), body.get("to") or args.get("to"))
+        game_ids = [g["game_id"] for g in games]
+
+    if not game_ids:
+        return jsonify({"error": "Pass game_ids, ids or team"}), 400
+    if len(game_ids) > MAX_BATCH_GAMES:
+        return jsonify({"error": f"At most {MAX_BATCH_GAMES} games per batch"}), 400
+
+    return Response(stream_with_context(iter_outliers_ndjson(game_ids)), mimetype="application/x-ndjson")
+
+@app.route("/api/whatif", methods=["POST"])
+def whatif():
+    # {"rules": {"PTS": {"weight": 1.0}}, "game_id": "..."} for one game, or
+    # {"rules": ..., "type": "player", "stat": ..., "from": ..., "to": ..., "n": ..., "season": ...} for a leaderboard
+    from backend.dataset import dataset_for_game
+    from backend.whatif import whatif_game, whatif_leaderboard
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"error": "Body must be a JSON object"}), 400
+    try:
+        if body.get("game_id"):
+            game_id = str(body["game_id"]).zfill(10)
+            data = dataset_for_game(game_id)
+            if game_id not in data.team_game_index:
+                return jsonify({"error": "Unknown game"}), 404
+            return jsonify(whatif_game(game_id, body.get("rules"), data))
+
+        entity_type = body.get("type", "player")
+        if entity_type not in ("player", "team"):
+            return jsonify({"error": "type must be player or team"}), 400
+        stat = body.get("stat")
+        if stat is not None and stat not in STATS_TO_TRACK:
+            return jsonify({"error": f"Unknown stat {stat}"}), 400
+        n = body.get("n", N_BARS)
+        if isinstance(n, bool) or not isinstance(n, int):
+            raise ValueError("n must be an integer")
+        n = min(n, MAX_LEADERBOARD_SIZE)
+        data = requested_dataset(body.get("season"))
+        return jsonify(whatif_leaderboard(body.get("rules"), entity_type, stat,
+                                          body.get("from"), body.get("to"), n, data))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@app.route("/api/live/<game_id>/stream")
+def live_outliers(game_id):
+    # Server-Sent Events; imported here so the live feed only starts when someone watches
+    from backend.live.live_feed import hub
+    game_id = str(game_id).zfill(10)
+    if not hub.start_game(game_id):
+        return jsonify({"error": "Unknown game"}), 404
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(hub.stream(game_id)), mimetype="text/event-stream", headers=headers)
+
 if __name__ == "__main__":
     import os
     app.run(host='0.0.0.0', port=int(os.environ.get("PORT", 5000)))
\ No newline at end of file